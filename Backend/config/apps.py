@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+class ConfigConfig(AppConfig):
+    name = "config"
+
+    def ready(self):
+        from config import signals  # noqa: F401
+        from config.search import ensure_search_indexes
+
+        post_migrate.connect(ensure_search_indexes, dispatch_uid='config.ensure_search_indexes')
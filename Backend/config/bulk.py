@@ -0,0 +1,92 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+
+@dataclass
+class BulkResult:
+    """
+    Outcome of a bulk write: the written items and the errors of rejected ones.
+
+    Each error is {'index': <position in the request>, 'errors': {field: [messages]}}.
+    """
+    items: list = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def add_error(self, index: int, errors: Union[ValidationError, Dict[str, Any]]) -> None:
+        if isinstance(errors, ValidationError):
+            errors = error_dict(errors)
+        self.errors.append({'index': index, 'errors': errors})
+
+
+def error_dict(error: ValidationError) -> Dict[str, List[str]]:
+    """Field -> messages mapping of a ValidationError, using 'detail' for non-field errors."""
+    if hasattr(error, 'error_dict'):
+        return error.message_dict
+    return {'detail': error.messages}
+
+
+def read_bulk_body(request) -> Any:
+    """
+    Parse the JSON body of a bulk request.
+
+    Bulk imports are far larger than DATA_UPLOAD_MAX_MEMORY_SIZE allows for
+    regular requests, so the body is read directly and checked against
+    BULK_MAX_BODY_SIZE instead.
+
+    Raises:
+        ValidationError: If the body is larger than BULK_MAX_BODY_SIZE
+        json.JSONDecodeError: If the body is not valid JSON
+    """
+    if int(request.META.get('CONTENT_LENGTH') or 0) > settings.BULK_MAX_BODY_SIZE:
+        raise ValidationError({'detail': f'Request body exceeds {settings.BULK_MAX_BODY_SIZE} bytes.'})
+    return json.loads(request.read(settings.BULK_MAX_BODY_SIZE + 1) or b'null')
+
+
+def check_bulk_size(items: Any) -> Sequence:
+    """
+    Validate the item list of a bulk request.
+
+    Raises:
+        ValidationError: If items is not a non-empty list of at most BULK_MAX_ITEMS entries
+    """
+    if not isinstance(items, list) or not items:
+        raise ValidationError({'items': 'Expected a non-empty list of items.'})
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise ValidationError({'items': f'At most {settings.BULK_MAX_ITEMS} items per request.'})
+    return items
+
+
+def validate_items(items: Sequence, validate: Callable[[dict], dict]) -> Tuple[list, List[int], List[Dict[str, Any]]]:
+    """
+    Run request-level validation over each item of a bulk request.
+
+    Returns:
+        (validated items, their positions in the request, errors of the rejected items)
+    """
+    valid_items, positions, errors = [], [], []
+    for index, item in enumerate(items):
+        try:
+            if not isinstance(item, dict):
+                raise ValidationError('Each item must be an object.')
+            valid_items.append(validate(item))
+            positions.append(index)
+        except ValidationError as e:
+            errors.append({'index': index, 'errors': error_dict(e)})
+        except (AttributeError, TypeError):
+            errors.append({'index': index, 'errors': {'detail': ['Invalid field types.']}})
+    return valid_items, positions, errors
+
+
+def merge_errors(errors: List[Dict[str, Any]], result: BulkResult, positions: List[int]) -> List[Dict[str, Any]]:
+    """Add the service errors of result (indexed into the validated items) to errors, by request position."""
+    errors = errors + [{**error, 'index': positions[error['index']]} for error in result.errors]
+    errors.sort(key=lambda error: error['index'])
+    return errors
@@ -0,0 +1,33 @@
+from typing import Any, Dict
+
+from django.db import connections
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Connection pool counters of this process, keyed by database alias.
+
+    Only aliases using config.db.postgresql with OPTIONS['pool'] appear, and
+    only once their pool has been opened.
+    """
+    stats = {}
+    for alias in connections:
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is not None and not pool.closed:
+            stats[alias] = pool.get_stats()
+    return stats
+
+
+def close_pools() -> None:
+    """
+    Close every connection pool of this process.
+
+    The pool's worker threads do not survive fork(), so a pre-fork server
+    must call this in the master before starting workers; each worker then
+    opens its own pool on first use.
+    """
+    connections.close_all()
+    for alias in connections:
+        close_pool = getattr(connections[alias], 'close_pool', None)
+        if close_pool is not None:
+            close_pool()
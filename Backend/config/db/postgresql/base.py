@@ -0,0 +1,111 @@
+"""
+PostgreSQL backend with optional psycopg connection pooling.
+
+Backport of the `OPTIONS["pool"]` support Django 5.1 added to its own
+backend. Set OPTIONS["pool"] to True or to a dict of
+psycopg_pool.ConnectionPool arguments (min_size, max_size, timeout,
+max_idle, max_lifetime, ...). Without it this backend behaves exactly like
+django.db.backends.postgresql.
+
+Each process keeps one pool per database alias, shared by its threads.
+Django still "closes" its connection at the end of every request
+(CONN_MAX_AGE must be 0); with a pool that returns the connection instead
+of disconnecting. CONN_HEALTH_CHECKS makes the pool check a connection
+before handing it out.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+from django.utils.asyncio import async_unsafe
+
+from .creation import DatabaseCreation
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+    _connection_pools = {}
+
+    @property
+    def pool(self):
+        pool_options = self.settings_dict["OPTIONS"].get("pool")
+        if self.alias == NO_DB_ALIAS or not pool_options:
+            return None
+
+        pool = self._connection_pools.get(self.alias)
+        if pool is not None and pool.kwargs.get("dbname") != self.settings_dict["NAME"]:
+            # NAME changed since the pool was built (the test runner swaps in the test database)
+            self.close_pool()
+            pool = None
+
+        if pool is None:
+            if not is_psycopg3:
+                raise ImproperlyConfigured("Connection pooling requires psycopg 3.")
+            if self.settings_dict["CONN_MAX_AGE"] != 0:
+                raise ImproperlyConfigured(
+                    "Pooling doesn't support persistent connections; set CONN_MAX_AGE to 0."
+                )
+            try:
+                from psycopg_pool import ConnectionPool
+            except ImportError as err:
+                raise ImproperlyConfigured(
+                    "Error loading psycopg_pool module.\nDid you install psycopg[pool]?"
+                ) from err
+
+            connect_kwargs = self.get_connection_params()
+            # Django sets the connection's autocommit mode itself after checkout
+            connect_kwargs["autocommit"] = True
+            pool = ConnectionPool(
+                kwargs=connect_kwargs,
+                open=False,  # opened on first use, in the process that uses it
+                check=ConnectionPool.check_connection if self.settings_dict["CONN_HEALTH_CHECKS"] else None,
+                name=self.alias,
+                **({} if pool_options is True else pool_options),
+            )
+            # Threads racing to build the pool: the first one wins, the others' pools are never opened
+            pool = self._connection_pools.setdefault(self.alias, pool)
+
+        return pool
+
+    def close_pool(self):
+        pool = self._connection_pools.pop(self.alias, None)
+        if pool is not None:
+            pool.close()
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop("pool", None)
+        return conn_params
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+
+        options = self.settings_dict["OPTIONS"]
+        try:
+            self.isolation_level = base.IsolationLevel(
+                options.get("isolation_level", base.IsolationLevel.READ_COMMITTED)
+            )
+        except ValueError:
+            raise ImproperlyConfigured(
+                f"Invalid transaction isolation level {options['isolation_level']} "
+                f"specified. Use one of the psycopg.IsolationLevel values."
+            )
+        pool.open()
+        connection = pool.getconn()
+        if "isolation_level" in options:
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        pool = getattr(self.connection, "_pool", None)
+        if pool is not None:
+            with self.wrap_database_errors:
+                # Return the connection to the pool that lent it, then forget it
+                pool.putconn(self.connection)
+                self.connection = None
+            return
+        return super()._close()
@@ -0,0 +1,152 @@
+"""
+Primary/replica database routing.
+
+Everything reads from and writes to the primary ('default') unless the code
+runs inside replica_reads(): the services wrap their list, search and
+statistics reads with it, and GraphQL query operations execute inside it.
+Those reads go to one of settings.DATABASE_REPLICAS, chosen once per request.
+
+Read-your-writes: the first write in a request pins the rest of it to the
+primary, and ReplicaRoutingMiddleware keeps the same client pinned for
+DATABASE_REPLICA_STICKY_SECONDS afterwards (a cookie), which should exceed
+the replicas' usual replication lag.
+
+Models of PRIMARY_ONLY_APPS always use the primary and writing them pins
+nothing: the database cache table holds the read cache's generations, which
+a lagging replica would serve stale, and filling it on a GET is not a write
+the client has to read back.
+"""
+
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+# Django's own tables ('django_cache' is DatabaseCache's) and server-side metadata
+PRIMARY_ONLY_APPS = frozenset({'django_cache', 'admin', 'auth', 'contenttypes', 'sessions', 'config'})
+
+
+@dataclass
+class RoutingState:
+    """Routing decisions of one request (or of one thread outside requests)."""
+
+    replica_depth: int = 0
+    pinned: bool = False
+    wrote: bool = False
+    replica: Optional[str] = None
+
+
+_state: ContextVar[Optional[RoutingState]] = ContextVar('db_routing_state', default=None)
+
+
+def _current() -> RoutingState:
+    state = _state.get()
+    if state is None:
+        state = RoutingState()
+        _state.set(state)
+    return state
+
+
+@contextmanager
+def request_routing(pinned: bool = False) -> Iterator[RoutingState]:
+    """Fresh routing state for one request; pinned sends all of its reads to the primary."""
+    token = _state.set(RoutingState(pinned=pinned))
+    try:
+        yield _state.get()
+    finally:
+        _state.reset(token)
+
+
+@contextmanager
+def replica_reads():
+    """
+    Let reads in this block go to a replica (unless the request is pinned).
+
+    Usable as a decorator. Querysets are routed when evaluated, so a lazy
+    result must be bound to its alias inside the block, e.g.
+    `queryset.using(queryset.db)`.
+    """
+    state = _current()
+    state.replica_depth += 1
+    try:
+        yield
+    finally:
+        state.replica_depth -= 1
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary inside this block, even within replica_reads()."""
+    state = _current()
+    depth, state.replica_depth = state.replica_depth, 0
+    try:
+        yield
+    finally:
+        state.replica_depth = depth
+
+
+def pin_primary() -> None:
+    """Send the remaining reads of the current request to the primary."""
+    _current().pinned = True
+
+
+class PrimaryReplicaRouter:
+    """Database router implementing the policy described in this module."""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return DEFAULT_DB_ALIAS
+        state = _state.get()
+        if state is None or not state.replica_depth or state.pinned or not settings.DATABASE_REPLICAS:
+            # Django then uses the database of a related instance, if any, or the primary
+            return None
+        if state.replica is None:
+            state.replica = random.choice(settings.DATABASE_REPLICAS)
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label not in PRIMARY_ONLY_APPS:
+            state = _current()
+            state.wrote = state.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the primary's rows, so objects from any of them may be related
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Give each request its own routing state and keep clients that just wrote
+    on the primary for DATABASE_REPLICA_STICKY_SECONDS.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_routing(pinned=self._pinned_until(request) > time.time()) as state:
+            response = self.get_response(request)
+        if state.wrote and settings.DATABASE_REPLICAS:
+            window = settings.DATABASE_REPLICA_STICKY_SECONDS
+            response.set_cookie(
+                settings.DATABASE_REPLICA_STICKY_COOKIE, f'{time.time() + window:.3f}',
+                max_age=window, httponly=True, samesite='Lax',
+            )
+        return response
+
+    @staticmethod
+    def _pinned_until(request) -> float:
+        try:
+            return float(request.COOKIES.get(settings.DATABASE_REPLICA_STICKY_COOKIE, 0))
+        except ValueError:
+            return 0.0
@@ -0,0 +1,84 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from graphql import DocumentNode, GraphQLError, GraphQLSchema, parse, validate
+
+
+def hash_query(query: str) -> str:
+    """Return the SHA-256 hex digest used to key documents."""
+    return hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+
+class DocumentCache:
+    """
+    Bounded LRU cache of parsed and validated GraphQL documents.
+
+    Entries are keyed by the SHA-256 of the query text and store either the
+    validated document or the errors parsing/validation produced, so invalid
+    queries are not re-validated either. Safe to share between threads.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self, schema: GraphQLSchema, query: str
+    ) -> Tuple[Optional[DocumentNode], Optional[List[GraphQLError]]]:
+        """
+        Return (document, None) for a valid query or (None, errors) otherwise.
+        """
+        key = hash_query(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = self._parse_and_validate(schema, query)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def _parse_and_validate(schema, query):
+        try:
+            document = parse(query)
+        except GraphQLError as error:
+            return None, [error]
+        errors = validate(schema, document)
+        if errors:
+            return None, errors
+        return document, None
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+document_cache = DocumentCache(settings.GRAPHQL_DOCUMENT_CACHE_SIZE)
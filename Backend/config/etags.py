@@ -0,0 +1,86 @@
+import hashlib
+from functools import wraps
+from typing import Callable, Iterable, Optional
+
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from config.read_cache import (
+    ALL_SCOPE,
+    ORGANIZATIONS_SCOPE,
+    generations_enabled,
+    get_generations,
+    organization_for_project,
+    organization_scope,
+    project_for_task,
+)
+from taskComment.models import TaskComment
+
+
+def generation_etag(request, scopes: Iterable[str]) -> str:
+    """
+    ETag of a GET response derived from its full path and the current
+    read-cache generations of the scopes it depends on.
+
+    Generations change on every write to the scope (see config.signals), so
+    the tag changes whenever the response could, without running the query.
+    """
+    generations = get_generations(scopes)
+    raw = f"{request.get_full_path()}|{'|'.join(map(str, generations))}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def conditional(etag_func: Callable):
+    """
+    View decorator answering If-None-Match with 304 from etag_func, and
+    asking clients to revalidate (rather than reuse) their cached copy.
+
+    Responses carry no ETag while the read cache is disabled: a deployment
+    whose workers do not share a cache turns both off, since each worker
+    would otherwise answer 304 from its own, possibly stale, generations.
+    """
+    def decorator(view):
+        conditional_view = cache_control(private=True, no_cache=True)(condition(etag_func=etag_func)(view))
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not generations_enabled():
+                return view(request, *args, **kwargs)
+            return conditional_view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def all_etag(request, *args, **kwargs) -> str:
+    """ETag for lists spanning every organization."""
+    return generation_etag(request, [ALL_SCOPE])
+
+
+def organizations_etag(request, *args, **kwargs) -> str:
+    """ETag for organization lists and lookups by slug."""
+    return generation_etag(request, [ORGANIZATIONS_SCOPE])
+
+
+def organization_etag(request, org_id: int) -> str:
+    return generation_etag(request, [organization_scope(org_id)])
+
+
+def project_etag(request, project_id: int) -> Optional[str]:
+    organization_id = organization_for_project(project_id)
+    if organization_id is None:
+        return None
+    return generation_etag(request, [organization_scope(organization_id)])
+
+
+def task_etag(request, task_id: int) -> Optional[str]:
+    project_id = project_for_task(task_id)
+    if project_id is None:
+        return None
+    return project_etag(request, project_id)
+
+
+def comment_etag(request, comment_id: int) -> Optional[str]:
+    task_id = TaskComment.objects.filter(pk=comment_id).values_list('task_id', flat=True).first()
+    if task_id is None:
+        return None
+    return task_etag(request, task_id)
@@ -0,0 +1,100 @@
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+
+from config.db import pool_stats
+from config.responses import json_dumps
+
+logger = logging.getLogger('graphql.metrics')
+
+POOL_METRICS = ('pool_size', 'pool_available', 'requests_waiting')
+
+
+class OperationMetrics:
+    """
+    Query count, database time and per-resolver wall time for one GraphQL operation.
+
+    Instances are installed as a database execute wrapper for the duration of
+    the operation, so every SQL statement is counted without DEBUG cursors.
+    """
+
+    def __init__(self, operation_name: Optional[str] = None):
+        self.operation_name = operation_name
+        self.query_count = 0
+        self.db_time = 0.0
+        self.resolvers: Dict[str, list] = {}
+        self._started = time.perf_counter()
+        self.duration = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.query_count += 1
+
+    def record_resolver(self, key: str, elapsed: float) -> None:
+        entry = self.resolvers.get(key)
+        if entry is None:
+            self.resolvers[key] = [1, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def finish(self) -> None:
+        self.duration = time.perf_counter() - self._started
+
+    def as_dict(self) -> Dict[str, Any]:
+        resolvers = sorted(self.resolvers.items(), key=lambda item: item[1][1], reverse=True)
+        data = {
+            'operation': self.operation_name or 'anonymous',
+            'duration_ms': round((self.duration or 0) * 1000, 3),
+            'query_count': self.query_count,
+            'db_time_ms': round(self.db_time * 1000, 3),
+            'resolvers': {
+                key: {'calls': calls, 'total_ms': round(total * 1000, 3)}
+                for key, (calls, total) in resolvers[:settings.GRAPHQL_METRICS_MAX_RESOLVERS]
+            },
+        }
+        pools = pool_stats()
+        if pools:
+            # Saturation of this process's connection pools when the operation finished
+            data['db_pools'] = {
+                alias: {key: stats.get(key, 0) for key in POOL_METRICS} for alias, stats in pools.items()
+            }
+        return data
+
+    def log(self) -> None:
+        logger.info(json_dumps(self.as_dict()).decode())
+
+
+def get_metrics(info) -> Optional[OperationMetrics]:
+    return getattr(info.context, '_graphql_metrics', None)
+
+
+class ResolverTimingMiddleware:
+    """
+    Graphene middleware that records wall time per Type.field resolver.
+
+    Resolvers are aggregated by field rather than by path, so the cost of
+    a list stays bounded by the number of distinct fields in the query.
+    """
+
+    def resolve(self, next, root, info, **kwargs):
+        metrics = get_metrics(info)
+        if metrics is None:
+            return next(root, info, **kwargs)
+
+        if metrics.operation_name is None and info.operation.name:
+            metrics.operation_name = info.operation.name.value
+
+        start = time.perf_counter()
+        try:
+            return next(root, info, **kwargs)
+        finally:
+            metrics.record_resolver(
+                f'{info.parent_type.name}.{info.field_name}', time.perf_counter() - start
+            )
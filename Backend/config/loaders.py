@@ -0,0 +1,117 @@
+from typing import Dict, Iterable
+
+from django.db.models import Count
+
+from task.models import Task
+from taskComment.models import TaskComment
+
+
+class CountLoader:
+    """
+    Per-request batching loader for aggregate counts keyed by a parent id.
+
+    Keys are collected as parent objects show up during a GraphQL execution
+    and resolved together with one grouped aggregate query the first time any
+    of them is loaded. Results are cached for the rest of the request.
+    """
+
+    def __init__(self, batch_fn, default):
+        self._batch_fn = batch_fn
+        self._default = default
+        self._pending = set()
+        self._cache = {}
+
+    def register(self, keys: Iterable[int]) -> None:
+        """
+        Queue keys so they are resolved in the next batch.
+        """
+        for key in keys:
+            if key not in self._cache:
+                self._pending.add(key)
+
+    def load(self, key: int):
+        """
+        Return the value for a key, resolving all queued keys if needed.
+        """
+        if key not in self._cache:
+            self._pending.add(key)
+            self._dispatch()
+        return self._cache[key]
+
+    def _dispatch(self) -> None:
+        keys = list(self._pending)
+        self._pending.clear()
+        results = self._batch_fn(keys)
+        for key in keys:
+            self._cache[key] = results.get(key, self._default)
+
+
+def batch_task_comment_counts(task_ids: list[int]) -> Dict[int, int]:
+    """
+    Count comments for many tasks in one query.
+    """
+    rows = (
+        TaskComment.objects.filter(task_id__in=task_ids)
+        .order_by()
+        .values('task_id')
+        .annotate(total=Count('id'))
+    )
+    return {row['task_id']: row['total'] for row in rows}
+
+
+class Loaders:
+    """Container for the loaders that live for the duration of one request."""
+
+    def __init__(self):
+        self.task_comment_counts = CountLoader(batch_task_comment_counts, 0)
+
+    def register_instances(self, instances) -> None:
+        """
+        Queue the ids of any tasks found in a resolver result.
+
+        Connection edges are unwrapped to their nodes. Comments queue the id
+        of their task, which is resolved later as a single object (e.g.
+        searchComments { ... node { task { commentCount } } }) and would
+        otherwise count its comments alone.
+        """
+        task_ids = []
+        for instance in instances:
+            instance = getattr(instance, 'node', instance)
+            if isinstance(instance, Task):
+                task_ids.append(instance.pk)
+            elif isinstance(instance, TaskComment):
+                task_ids.append(instance.task_id)
+        if task_ids:
+            self.task_comment_counts.register(task_ids)
+
+
+def get_loaders(info) -> Loaders:
+    """
+    Return the loaders bound to the current request, creating them on first use.
+    """
+    context = info.context
+    if context is None:
+        return Loaders()
+
+    loaders = getattr(context, '_loaders', None)
+    if loaders is None:
+        loaders = Loaders()
+        context._loaders = loaders
+    return loaders
+
+
+class DataLoaderMiddleware:
+    """
+    Graphene middleware that feeds list results into the request loaders.
+
+    Every resolver returning a list of tasks (or of comments, for their
+    tasks) has its ids queued, so comment_count on the following tasks is
+    answered by a single grouped query instead of one query per row. Project task counts are stored on
+    the project itself and need no loader.
+    """
+
+    def resolve(self, next, root, info, **kwargs):
+        result = next(root, info, **kwargs)
+        if isinstance(result, (list, tuple)) and result:
+            get_loaders(info).register_instances(result)
+        return result
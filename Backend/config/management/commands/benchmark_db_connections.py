@@ -0,0 +1,162 @@
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory, override_settings
+
+from config.db import close_pools
+from task.models import Task
+
+MODES = ('none', 'persistent', 'pool')
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure small-request latency through Django's WSGI handler on PostgreSQL with "
+        "a new connection per request (CONN_MAX_AGE=0), persistent connections and a "
+        "psycopg pool. The request cycle (request_started/request_finished) is the one "
+        "a production server runs; no HTTP or network overhead is included."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per mode')
+        parser.add_argument('--threads', type=int, default=1, help='Concurrent request threads (one per gthread)')
+        parser.add_argument('--modes', default=','.join(MODES), help=f'Comma-separated subset of {", ".join(MODES)}')
+        parser.add_argument('--conn-max-age', type=int, default=60, help='CONN_MAX_AGE of the persistent mode')
+        parser.add_argument('--pool-size', type=int, default=4, help='max_size of the pool mode')
+
+    def handle(self, *args, **options):
+        if connections['default'].vendor != 'postgresql':
+            raise CommandError("This benchmark needs the PostgreSQL database (set DB_NAME and friends).")
+        modes = [mode.strip() for mode in options['modes'].split(',') if mode.strip()]
+        unknown = set(modes) - set(MODES)
+        if unknown:
+            raise CommandError(f"Unknown modes: {', '.join(sorted(unknown))}")
+
+        paths = self._paths()
+        settings_dict = connections['default'].settings_dict
+        saved = settings_dict['CONN_MAX_AGE'], dict(settings_dict['OPTIONS'])
+        results = {}
+        try:
+            # Bypass the response cache so every request reaches the database
+            with override_settings(DEBUG=False, READ_CACHE={**settings.READ_CACHE, 'ENABLED': False}):
+                for mode in modes:
+                    self._configure(settings_dict, mode, options)
+                    self.stdout.write(self.style.MIGRATE_HEADING(
+                        f"{mode}: CONN_MAX_AGE={settings_dict['CONN_MAX_AGE']} "
+                        f"pool={settings_dict['OPTIONS'].get('pool') or False}"
+                    ))
+                    self._run(paths, min(options['requests'], 200), options['threads'])  # warm up
+                    results[mode] = self._run(paths, options['requests'], options['threads'])
+                    self._report(results[mode])
+        finally:
+            close_pools()
+            settings_dict['CONN_MAX_AGE'], settings_dict['OPTIONS'] = saved
+
+        baseline = results.get('none')
+        if baseline:
+            for mode in ('persistent', 'pool'):
+                if mode in results:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"{mode}: p50 {baseline['p50'] - results[mode]['p50']:+.2f} ms saved "
+                        f"({1 - results[mode]['p50'] / baseline['p50']:.0%}), "
+                        f"p99 {baseline['p99'] - results[mode]['p99']:+.2f} ms saved "
+                        f"({1 - results[mode]['p99'] / baseline['p99']:.0%}) versus a new connection per request"
+                    ))
+
+    @staticmethod
+    def _paths():
+        task = Task.objects.select_related('project__organization').order_by('id').first()
+        if task is None:
+            raise CommandError("The database is empty; seed it first (e.g. benchmark_server --seed).")
+        return [
+            f'/api/tasks/{task.id}/',
+            f'/api/projects/{task.project_id}/',
+            f'/api/organizations/slug/{task.project.organization.slug}/',
+            f'/api/tasks/project/{task.project_id}/?limit=10',
+        ]
+
+    @staticmethod
+    def _configure(settings_dict, mode, options):
+        close_pools()
+        settings_dict['OPTIONS'] = {key: value for key, value in settings_dict['OPTIONS'].items() if key != 'pool'}
+        if mode == 'none':
+            settings_dict['CONN_MAX_AGE'] = 0
+        elif mode == 'persistent':
+            settings_dict['CONN_MAX_AGE'] = options['conn_max_age']
+        else:
+            settings_dict['CONN_MAX_AGE'] = 0
+            size = options['pool_size']
+            settings_dict['OPTIONS']['pool'] = {'min_size': min(size, options['threads']), 'max_size': size}
+
+    @staticmethod
+    def _run(paths, total, thread_count):
+        handler = WSGIHandler()
+        factory = RequestFactory()
+        latencies = []
+        failures = []
+        opened = []
+        counter = iter(range(total))
+        lock = threading.Lock()
+
+        def count_connection(sender, connection, **kwargs):
+            with lock:
+                opened.append(connection.alias)
+
+        def start_response(status, headers, exc_info=None):
+            pass
+
+        def worker():
+            while True:
+                with lock:
+                    index = next(counter, None)
+                if index is None:
+                    break
+                environ = factory.get(paths[index % len(paths)]).environ
+                start = time.perf_counter()
+                response = handler(environ, start_response)
+                b''.join(response)
+                response.close()  # request_finished: Django closes or returns the connection here
+                elapsed = time.perf_counter() - start
+                with lock:
+                    (latencies if response.status_code == 200 else failures).append(elapsed)
+            connections.close_all()
+
+        connection_created.connect(count_connection)
+        try:
+            start = time.perf_counter()
+            threads = [threading.Thread(target=worker) for _ in range(thread_count)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            duration = time.perf_counter() - start
+        finally:
+            connection_created.disconnect(count_connection)
+
+        pool = getattr(connections['default'], 'pool', None)
+        stats = pool.get_stats() if pool is not None and not pool.closed else None
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'errors': len(failures),
+            'rps': len(latencies) / duration if duration else 0.0,
+            'p50': statistics.median(latencies) * 1000 if latencies else 0.0,
+            'p99': latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000 if latencies else 0.0,
+            # Pooled checkouts also fire connection_created; the pool counts real connects itself
+            'connects': stats['connections_num'] if stats else len(opened),
+            'pool': stats,
+        }
+
+    def _report(self, result):
+        self.stdout.write(
+            f"  {result['requests']} ok, {result['errors']} errors, {result['rps']:.0f} req/s, "
+            f"p50 {result['p50']:.2f} ms, p99 {result['p99']:.2f} ms, {result['connects']} server connections"
+        )
+        if result['pool']:
+            self.stdout.write(f"  pool stats: {result['pool']}")
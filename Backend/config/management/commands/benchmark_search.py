@@ -0,0 +1,125 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from config.pagination import paginate
+from config.search import ORGANIZATION_SEARCH, PROJECT_SEARCH
+from organization.models import Organization
+from organization.service import OrganizationService
+from project.models import Project
+from project.service import ProjectService
+
+WORDS = (
+    'apollo', 'nimbus', 'harbor', 'quartz', 'falcon', 'meridian', 'cobalt', 'summit', 'lumen', 'vertex',
+    'orbit', 'cascade', 'ember', 'atlas', 'zephyr', 'granite', 'beacon', 'delta', 'pioneer', 'willow',
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the indexed organization/project search with the previous icontains "
+        "implementation on seeded data. Rows are rolled back afterwards unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='Organizations and projects to seed')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per term')
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded rows')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Backend: {connection.vendor}")
+        try:
+            with transaction.atomic():
+                self._seed(options['rows'])
+                self._run(options['repeat'])
+                if not options['keep']:
+                    raise Rollback
+        except Rollback:
+            self.stdout.write("Seeded rows rolled back.")
+
+    def _seed(self, rows):
+        rng = random.Random(42)
+        start = time.perf_counter()
+        organizations = Organization.objects.bulk_create(
+            [
+                Organization(
+                    name=f'{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {i}',
+                    slug=f'bench-{i}',
+                    contact_email=f'ops{i}@{rng.choice(WORDS)}.example.com',
+                )
+                for i in range(rows)
+            ],
+            batch_size=2000,
+        )
+        Project.objects.bulk_create(
+            [
+                Project(
+                    organization=organizations[i % len(organizations)],
+                    name=f'{rng.choice(WORDS).title()} {i}',
+                    description=' '.join(rng.choice(WORDS) for _ in range(12)),
+                    status='active',
+                )
+                for i in range(rows)
+            ],
+            batch_size=2000,
+        )
+        self.stdout.write(f"Seeded {rows} organizations and {rows} projects in {time.perf_counter() - start:.1f}s")
+
+    def _run(self, repeat):
+        organization = Organization.objects.filter(slug='bench-0').first()
+        # A common word, a rare token, an email fragment and a term with no match
+        terms = ['falcon', 'bench-1234', 'ops99@', 'nomatchterm']
+
+        cases = [
+            # The previous organization search raised on its misplaced .distinct(); time the query it meant
+            ('organizations', 'legacy list', lambda term: list(
+                Organization.objects.filter(
+                    Q(name__icontains=term) | Q(slug__icontains=term) | Q(contact_email__icontains=term)
+                )
+            )),
+            ('organizations', 'legacy page', lambda term: paginate(
+                Organization.objects.filter(
+                    Q(name__icontains=term) | Q(slug__icontains=term) | Q(contact_email__icontains=term)
+                )
+            ).items),
+            ('organizations', 'indexed page', lambda term: OrganizationService.get_organizations_page(search=term).items),
+            ('organizations', 'ranked top 20', lambda term: OrganizationService.search_organizations(term, limit=20)),
+            ('projects', 'legacy list', lambda term: list(
+                (Project.objects.filter(name__icontains=term) | Project.objects.filter(description__icontains=term))
+                .distinct()
+            )),
+            ('projects', 'legacy page', lambda term: paginate(
+                Project.objects.filter(Q(name__icontains=term) | Q(description__icontains=term))
+            ).items),
+            ('projects', 'indexed page', lambda term: ProjectService.get_projects_page(search=term).items),
+            ('projects', 'ranked top 20', lambda term: ProjectService.search_projects(term, limit=20)),
+            ('projects', 'ranked in org', lambda term: ProjectService.search_projects(
+                term, organization_id=organization.id, limit=20
+            )),
+        ]
+
+        for term in terms:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"Term {term!r}"))
+            for model, name, run in cases:
+                run(term)
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    results = run(term)
+                    timings.append((time.perf_counter() - start) * 1000)
+                self.stdout.write(
+                    f"  {model:>13} {name:<14} median {statistics.median(timings):8.2f} ms  {len(results):6d} rows"
+                )
+
+        self.stdout.write(
+            f"Index tables: {ORGANIZATION_SEARCH.table}, {PROJECT_SEARCH.table} "
+            f"(PostgreSQL uses trigram GIN indexes on the same columns)"
+        )
@@ -0,0 +1,180 @@
+import http.client
+import io
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from organization.models import Organization
+from project.models import Project
+from task.models import Task
+
+GRAPHQL_QUERY = '{ projectsByOrganization(organizationId: %d) { id name taskCount completionRate } }'
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure REST/GraphQL request throughput of the development server (the old container "
+        "command) and the production gunicorn profile, each started as a subprocess on the "
+        "configured database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per server')
+        parser.add_argument('--concurrency', type=int, default=16, help='Concurrent client connections')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() * 2 + 1, help='Gunicorn workers')
+        parser.add_argument('--threads', type=int, default=1, help='Gunicorn threads per worker')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--server', choices=('runserver', 'gunicorn', 'both'), default='both')
+        parser.add_argument('--seed', action='store_true', help='Insert a fixed dataset first (20 projects x 50 tasks)')
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            self._seed()
+        organization = Organization.objects.order_by('id').first()
+        if organization is None:
+            raise CommandError("The database is empty; run with --seed.")
+
+        paths = [
+            '/api/projects/?limit=50',
+            '/api/tasks/?limit=50',
+            f'/api/projects/organization/{organization.id}/statistics/',
+            '/graphql/?query=' + quote(GRAPHQL_QUERY % organization.id),
+        ]
+
+        port = options['port']
+        servers = {
+            'runserver': [sys.executable, 'manage.py', 'runserver', f'127.0.0.1:{port}'],
+            'gunicorn': [
+                sys.executable, '-m', 'gunicorn', 'config.wsgi:application',
+                '--config', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}',
+                '--workers', str(options['workers']), '--threads', str(options['threads']),
+            ],
+        }
+        names = list(servers) if options['server'] == 'both' else [options['server']]
+
+        results = {}
+        for name in names:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name}: {' '.join(servers[name][1:])}"))
+            results[name] = self._measure(servers[name], port, paths, options['requests'], options['concurrency'])
+            self._report(results[name])
+
+        if len(results) == 2 and results['runserver']['rps']:
+            self.stdout.write(self.style.SUCCESS(
+                f"gunicorn served {results['gunicorn']['rps'] / results['runserver']['rps']:.1f}x "
+                f"the requests per second of runserver"
+            ))
+
+    def _seed(self):
+        organization = Organization.objects.create(
+            name='Benchmark', slug=f'benchmark-{int(time.time())}', contact_email='bench@example.com'
+        )
+        projects = Project.objects.bulk_create([
+            Project(organization=organization, name=f'Project {i}', status='active') for i in range(20)
+        ])
+        Task.objects.bulk_create([
+            Task(project=project, title=f'Task {j}', status=('todo', 'in_progress', 'done')[j % 3])
+            for project in projects for j in range(50)
+        ])
+        call_command('rebuild_task_counters', stdout=io.StringIO())
+        self.stdout.write("Seeded 20 projects and 1000 tasks.")
+
+    def _measure(self, command, port, paths, total, concurrency):
+        env = {**os.environ, 'DEBUG': 'False', 'PORT': str(port), 'GRAPHQL_METRICS_ENABLED': 'False'}
+        process = subprocess.Popen(
+            command, cwd=settings.BASE_DIR, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True,
+        )
+        try:
+            self._wait_ready(port, paths[0], process)
+            self._load(port, paths, min(total, 200), concurrency)  # warm up
+            return self._load(port, paths, total, concurrency)
+        finally:
+            self._stop(process)
+
+    @staticmethod
+    def _stop(process):
+        """SIGTERM the server's process group (gunicorn workers, runserver's reloader child)."""
+        if process.poll() is not None:
+            return
+        os.killpg(process.pid, signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+
+    @staticmethod
+    def _wait_ready(port, path, process, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f"Server exited with status {process.returncode}.")
+            try:
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+                connection.request('GET', path)
+                if connection.getresponse().status == 200:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        raise CommandError("Server did not become ready.")
+
+    @staticmethod
+    def _load(port, paths, total, concurrency):
+        latencies = []
+        errors = []
+        counter = iter(range(total))
+        lock = threading.Lock()
+
+        def client():
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            while True:
+                with lock:
+                    index = next(counter, None)
+                if index is None:
+                    break
+                start = time.perf_counter()
+                try:
+                    connection.request('GET', paths[index % len(paths)])
+                    response = connection.getresponse()
+                    response.read()
+                    ok = response.status == 200
+                except (OSError, http.client.HTTPException):
+                    connection.close()
+                    ok = False
+                elapsed = time.perf_counter() - start
+                with lock:
+                    (latencies if ok else errors).append(elapsed)
+            connection.close()
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=client) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duration = time.perf_counter() - start
+
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'errors': len(errors),
+            'rps': len(latencies) / duration if duration else 0.0,
+            'p50': statistics.median(latencies) * 1000 if latencies else 0.0,
+            'p95': latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0.0,
+        }
+
+    def _report(self, result):
+        self.stdout.write(
+            f"  {result['requests']} ok, {result['errors']} errors, {result['rps']:.0f} req/s, "
+            f"p50 {result['p50']:.1f} ms, p95 {result['p95']:.1f} ms"
+        )
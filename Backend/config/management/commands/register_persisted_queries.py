@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from graphql import GraphQLError, parse, validate
+
+from config.persisted_queries import register_persisted_query
+from config.schema import schema
+
+
+class Command(BaseCommand):
+    help = "Validate GraphQL documents and register them as persisted queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='+', help='.graphql files, one document per file')
+
+    def handle(self, *args, **options):
+        for name in options['files']:
+            path = Path(name)
+            if not path.is_file():
+                raise CommandError(f"{path} does not exist.")
+            query = path.read_text()
+
+            try:
+                errors = validate(schema.graphql_schema, parse(query))
+            except GraphQLError as e:
+                errors = [e]
+            if errors:
+                raise CommandError(f"{path}: {errors[0].message}")
+
+            sha256 = register_persisted_query(query)
+            self.stdout.write(f"{sha256}  {path}")
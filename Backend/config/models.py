@@ -0,0 +1,18 @@
+from django.db import models
+
+
+class PersistedQuery(models.Model):
+    """
+    A GraphQL document registered for the persisted queries protocol,
+    stored under the SHA-256 hash of its text (see config.persisted_queries).
+    """
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    query = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Persisted query'
+        verbose_name_plural = 'Persisted queries'
+
+    def __str__(self):
+        return self.sha256
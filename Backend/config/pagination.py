@@ -0,0 +1,122 @@
+import base64
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+
+
+@dataclass
+class Page:
+    """A single page of results from a keyset-paginated query."""
+    items: list = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    has_next: bool = False
+    # Per-item cursors, when they are not (created_at, id) keysets (e.g. ranked search)
+    cursors: Optional[list] = None
+
+
+def encode_cursor(value: datetime, pk: int) -> str:
+    """
+    Encode an ordering value and primary key into an opaque cursor.
+    """
+    raw = f"{value.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        value, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(value), int(pk)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise ValidationError({'after': 'Invalid cursor.'})
+
+
+def clean_limit(limit: Any) -> int:
+    """
+    Validate a requested page size and clamp it to MAX_PAGE_SIZE.
+
+    Raises:
+        ValidationError: If the limit is not a positive integer
+    """
+    if limit in (None, ''):
+        return settings.DEFAULT_PAGE_SIZE
+    try:
+        limit = int(limit)
+    except (ValueError, TypeError):
+        raise ValidationError({'limit': 'Limit must be a valid integer.'})
+    if limit < 1:
+        raise ValidationError({'limit': 'Limit must be greater than zero.'})
+    return min(limit, settings.MAX_PAGE_SIZE)
+
+
+def get_page_params(request) -> Tuple[int, Optional[str]]:
+    """
+    Read and validate the limit/after query parameters of a request.
+    """
+    limit = clean_limit(request.GET.get('limit', '').strip())
+    after = request.GET.get('after', '').strip() or None
+    return limit, after
+
+
+def get_int_param(request, name: str) -> Optional[int]:
+    """
+    Read an optional integer filter (e.g. project_id) from the query string.
+
+    Raises:
+        ValidationError: If the value is not a valid integer
+    """
+    value = request.GET.get(name, '').strip()
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: 'Must be a valid integer.'})
+
+
+def paginate(
+    queryset: QuerySet,
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
+    ordering_field: str = 'created_at'
+) -> Page:
+    """
+    Return one page of a queryset ordered by (-ordering_field, id).
+
+    Rows after the cursor are selected with a keyset predicate, so the cost
+    of a page depends only on its size and not on how deep it is. Values
+    querysets are supported as long as they include id and ordering_field.
+    """
+    limit = clean_limit(limit)
+    queryset = queryset.order_by(f'-{ordering_field}', 'id')
+
+    if after:
+        value, pk = decode_cursor(after)
+        queryset = queryset.filter(
+            Q(**{f'{ordering_field}__lt': value})
+            | Q(**{ordering_field: value, 'id__gt': pk})
+        )
+
+    items = list(queryset[:limit + 1])
+    has_next = len(items) > limit
+    items = items[:limit]
+
+    next_cursor = None
+    if has_next:
+        last = items[-1]
+        if isinstance(last, dict):
+            next_cursor = encode_cursor(last[ordering_field], last['id'])
+        else:
+            next_cursor = encode_cursor(getattr(last, ordering_field), last.id)
+
+    return Page(items=items, next_cursor=next_cursor, has_next=has_next)
@@ -0,0 +1,124 @@
+import json
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from config.document_cache import document_cache, hash_query
+from config.models import PersistedQuery
+
+KEY_PREFIX = 'graphql:apq:'
+
+
+class PersistedQueryError(Exception):
+    """Raised when a persisted-query request cannot be served."""
+
+    def __init__(self, message: str, code: str):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+    def as_error(self) -> Dict[str, Any]:
+        return {'message': self.message, 'extensions': {'code': self.code}}
+
+
+def _cache():
+    return caches[settings.GRAPHQL_PERSISTED_QUERY_CACHE]
+
+
+def register_persisted_query(query: str) -> str:
+    """
+    Store an operator-approved document under its SHA-256 hash and return the hash.
+
+    The PersistedQuery table is the durable, shared store; the cache only
+    saves the lookup (a hash always maps to the same text, so a per-process
+    cache can never serve a wrong document).
+    """
+    sha256 = hash_query(query)
+    PersistedQuery.objects.get_or_create(sha256=sha256, defaults={'query': query})
+    _cache().set(KEY_PREFIX + sha256, query, timeout=None)
+    return sha256
+
+
+def get_persisted_query(sha256: str) -> Optional[str]:
+    query = _cache().get(KEY_PREFIX + sha256)
+    if query is None:
+        query = PersistedQuery.objects.filter(sha256=sha256).values_list('query', flat=True).first()
+        if query is not None:
+            _cache().set(KEY_PREFIX + sha256, query, timeout=None)
+    return query
+
+
+def _remember_query(request, schema, sha256: str, query: str) -> None:
+    """
+    Keep a client-sent document for GRAPHQL_PERSISTED_QUERY_TIMEOUT seconds.
+
+    Only valid documents of at most GRAPHQL_PERSISTED_QUERY_MAX_LENGTH
+    characters sent with POST are kept, and only in the cache, so clients
+    cannot grow the PersistedQuery table; a client whose entry expired or
+    was evicted gets PERSISTED_QUERY_NOT_FOUND and sends the text again.
+    """
+    if request.method != 'POST' or len(query) > settings.GRAPHQL_PERSISTED_QUERY_MAX_LENGTH:
+        return
+    document, _ = document_cache.get(schema, query)
+    if document is not None:
+        _cache().set(KEY_PREFIX + sha256, query, timeout=settings.GRAPHQL_PERSISTED_QUERY_TIMEOUT)
+
+
+def _get_requested_hash(request, data) -> Optional[str]:
+    extensions = request.GET.get('extensions') or data.get('extensions')
+    if not extensions:
+        return None
+    if isinstance(extensions, str):
+        try:
+            extensions = json.loads(extensions)
+        except ValueError:
+            raise PersistedQueryError('Extensions are invalid JSON.', 'BAD_REQUEST')
+
+    persisted = extensions.get('persistedQuery') if isinstance(extensions, dict) else None
+    if not persisted:
+        return None
+    if persisted.get('version') != 1:
+        raise PersistedQueryError('Unsupported persisted query version.', 'PERSISTED_QUERY_NOT_SUPPORTED')
+    sha256 = persisted.get('sha256Hash')
+    if not isinstance(sha256, str) or not sha256:
+        raise PersistedQueryError('Missing sha256Hash.', 'BAD_REQUEST')
+    return sha256.lower()
+
+
+def resolve_persisted_query(request, data, query: Optional[str], schema) -> Optional[str]:
+    """
+    Return the query text to execute, following the automatic persisted queries protocol.
+
+    - hash only: the registered document, or PERSISTED_QUERY_NOT_FOUND so the
+      client retries with the full text
+    - hash and text: the text, remembering it when it is new (see _remember_query)
+    - text only: the text, unless GRAPHQL_PERSISTED_QUERIES_ONLY is set
+
+    With GRAPHQL_PERSISTED_QUERIES_ONLY, new documents are never registered
+    from requests; use the register_persisted_queries command instead.
+
+    Raises:
+        PersistedQueryError: If the request cannot be served
+    """
+    locked = settings.GRAPHQL_PERSISTED_QUERIES_ONLY
+    sha256 = _get_requested_hash(request, data)
+
+    if sha256 is None:
+        if query and locked:
+            raise PersistedQueryError('Only persisted queries are allowed.', 'PERSISTED_QUERY_REQUIRED')
+        return query
+
+    if not query:
+        stored = get_persisted_query(sha256)
+        if stored is None:
+            raise PersistedQueryError('PersistedQueryNotFound', 'PERSISTED_QUERY_NOT_FOUND')
+        return stored
+
+    if hash_query(query) != sha256:
+        raise PersistedQueryError('provided sha does not match query', 'BAD_REQUEST')
+    if get_persisted_query(sha256) is None:
+        if locked:
+            raise PersistedQueryError('PersistedQueryNotAllowed', 'PERSISTED_QUERY_NOT_ALLOWED')
+        _remember_query(request, schema, sha256, query)
+    return query
@@ -0,0 +1,156 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, QuerySet
+from graphene.utils.str_converters import to_snake_case
+from graphql import FieldNode, FragmentSpreadNode, InlineFragmentNode, value_from_ast_untyped
+
+from project.models import Project
+
+# Model columns read by computed GraphQL fields that are not model fields
+COMPUTED_FIELD_COLUMNS = {
+    Project: {
+        'completed_task_count': ('done_task_count',),
+        'completion_rate': ('task_count', 'done_task_count'),
+    },
+}
+
+
+def collect_fields(info, field_nodes: Iterable[FieldNode]) -> Dict[str, List[FieldNode]]:
+    """
+    Merge the sub-selections of field_nodes into {response field name: [nodes]},
+    expanding fragment spreads and inline fragments.
+    """
+    fields: Dict[str, List[FieldNode]] = {}
+
+    def visit(selection_set):
+        if selection_set is None:
+            return
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                fields.setdefault(selection.name.value, []).append(selection)
+            elif isinstance(selection, InlineFragmentNode):
+                visit(selection.selection_set)
+            elif isinstance(selection, FragmentSpreadNode):
+                fragment = info.fragments.get(selection.name.value)
+                if fragment is not None:
+                    visit(fragment.selection_set)
+
+    for node in field_nodes:
+        visit(node.selection_set)
+    return fields
+
+
+def argument_value(info, node: FieldNode, name: str) -> Optional[Any]:
+    """Value of a field argument, with variables substituted."""
+    for argument in node.arguments or ():
+        if argument.name.value == name:
+            return value_from_ast_untyped(argument.value, info.variable_values)
+    return None
+
+
+def latest_attr(field_name: str, latest: int) -> str:
+    """Attribute holding the prefetched `latest` N rows of a reverse relation."""
+    return f'_prefetched_{field_name}_latest_{latest}'
+
+
+class QueryPlan:
+    """
+    Columns, joins and prefetches needed to resolve a selection on one model.
+    """
+
+    def __init__(self):
+        self.only: List[str] = []
+        self.select_related: List[str] = []
+        self.prefetch_related: List[Prefetch] = []
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset.only(*self.only)
+
+
+def build_plan(info, model, fields: Dict[str, List[FieldNode]], always: Sequence[str] = (), prefix: str = '',
+               plan: QueryPlan = None) -> QueryPlan:
+    """
+    Add what the selected fields of `model` need to plan, at the `prefix` join path.
+
+    Unknown fields (resolver-only fields, __typename) add nothing; anything
+    they read later is loaded lazily, so a plan can only cost extra queries,
+    never wrong results.
+    """
+    plan = plan or QueryPlan()
+    plan.only.extend(prefix + column for column in ('id', *always))
+    computed = COMPUTED_FIELD_COLUMNS.get(model, {})
+
+    for graphql_name, nodes in fields.items():
+        name = to_snake_case(graphql_name)
+        plan.only.extend(prefix + column for column in computed.get(name, ()))
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+
+        if field.many_to_one or (field.one_to_one and field.concrete):
+            plan.only.append(prefix + name)
+            plan.select_related.append(prefix + name)
+            build_plan(info, field.related_model, collect_fields(info, nodes), prefix=f'{prefix}{name}__', plan=plan)
+        elif field.one_to_many:
+            plan.prefetch_related.extend(build_prefetches(info, field, nodes, prefix))
+        elif field.concrete:
+            plan.only.append(prefix + name)
+    return plan
+
+
+def build_prefetches(info, field, nodes: List[FieldNode], prefix: str) -> List[Prefetch]:
+    """
+    Prefetch objects for a reverse relation, one per distinct `latest` argument.
+
+    Without `latest` the relation's own cache is filled, so `obj.<name>.all()`
+    is served from memory. With `latest: N` only the newest N rows per parent
+    are loaded (a window over the parent key) into latest_attr(name, N).
+    """
+    by_latest: Dict[Optional[int], List[FieldNode]] = {}
+    for node in nodes:
+        latest = argument_value(info, node, 'latest')
+        by_latest.setdefault(None if latest is None else max(int(latest), 0), []).append(node)
+
+    model = field.related_model
+    accessor = field.get_accessor_name()
+    prefetches = []
+    for latest, latest_nodes in by_latest.items():
+        child = build_plan(info, model, collect_fields(info, latest_nodes), always=(field.field.attname,))
+        queryset = child.apply(model.objects.all())
+        if latest is None:
+            prefetches.append(Prefetch(prefix + accessor, queryset=queryset))
+        else:
+            queryset = queryset.order_by(*model._meta.ordering, 'pk')[:latest]
+            prefetches.append(
+                Prefetch(prefix + accessor, queryset=queryset, to_attr=latest_attr(accessor, latest))
+            )
+    return prefetches
+
+
+def optimize_queryset(queryset: QuerySet, info, path: Sequence[str] = (), always: Sequence[str] = ()) -> QuerySet:
+    """
+    Restrict queryset to the columns, joins and prefetches the current
+    GraphQL selection needs.
+
+    Args:
+        queryset: Queryset of the model the resolved field returns
+        info: Resolve info of the root field
+        path: Field names between the root field and the model, e.g. ('edges', 'node') for connections
+        always: Extra columns to load regardless of the selection (e.g. the pagination ordering field)
+    """
+    field_nodes = info.field_nodes
+    for name in path:
+        field_nodes = collect_fields(info, field_nodes).get(name, [])
+    fields = collect_fields(info, field_nodes)
+    return build_plan(info, queryset.model, fields, always=always).apply(queryset)
+
+
+def projector(info, path: Sequence[str] = (), always: Sequence[str] = ()):
+    """Return a callable that applies optimize_queryset for this selection."""
+    return lambda queryset: optimize_queryset(queryset, info, path=path, always=always)
@@ -0,0 +1,234 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLObjectType,
+    GraphQLSchema,
+    InlineFragmentNode,
+    OperationType,
+    VariableNode,
+    get_named_type,
+    get_nullable_type,
+    get_operation_ast,
+    is_list_type,
+    is_object_type,
+    value_from_ast_untyped,
+)
+from graphql.execution.values import get_variable_values
+
+
+@dataclass
+class QueryCost:
+    cost: int
+    depth: int
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'requested': self.cost,
+            'maximum': settings.GRAPHQL_COST['MAX_COST'],
+            'depth': self.depth,
+            'max_depth': settings.GRAPHQL_COST['MAX_DEPTH'],
+        }
+
+
+class QueryCostError(GraphQLError):
+    """Raised before execution when an operation is over its cost or depth budget."""
+
+    def __init__(self, message: str, code: str, cost: Optional[QueryCost] = None):
+        extensions = {'code': code}
+        if cost is not None:
+            extensions['cost'] = cost.as_dict()
+        super().__init__(message, extensions=extensions)
+
+
+class CostAnalyzer:
+    """
+    Static cost and depth estimate for one operation of a parsed document.
+
+    Every object or list field costs 1 (or its FIELD_COSTS override), scalar
+    fields cost 0 unless listed in FIELD_COSTS, and the cost of a list's
+    children is multiplied by its expected size: the `first`/`limit`/`latest`
+    argument when given, otherwise DEFAULT_LIST_SIZE.
+    """
+
+    def __init__(self, schema: GraphQLSchema, document: DocumentNode, variables: Optional[dict]):
+        self.schema = schema
+        self.variables = variables or {}
+        self.fragments = {
+            definition.name.value: definition
+            for definition in document.definitions
+            if definition.kind == 'fragment_definition'
+        }
+        self.field_costs = settings.GRAPHQL_COST['FIELD_COSTS']
+        self.default_list_size = settings.GRAPHQL_COST['DEFAULT_LIST_SIZE']
+
+    def analyze(self, operation) -> QueryCost:
+        root = {
+            OperationType.QUERY: self.schema.query_type,
+            OperationType.MUTATION: self.schema.mutation_type,
+            OperationType.SUBSCRIPTION: self.schema.subscription_type,
+        }[operation.operation]
+        cost, depth = self._selection_set(root, operation.selection_set, set())
+        return QueryCost(cost=cost, depth=depth)
+
+    def _selection_set(self, parent: GraphQLObjectType, selection_set, visited_fragments):
+        cost = 0
+        depth = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                field_cost, field_depth = self._field(parent, selection, visited_fragments)
+            elif isinstance(selection, InlineFragmentNode):
+                parent_type = parent
+                if selection.type_condition:
+                    parent_type = self.schema.get_type(selection.type_condition.name.value)
+                field_cost, field_depth = self._selection_set(parent_type, selection.selection_set, visited_fragments)
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = self.fragments.get(name)
+                if fragment is None or name in visited_fragments:
+                    continue
+                parent_type = self.schema.get_type(fragment.type_condition.name.value)
+                field_cost, field_depth = self._selection_set(
+                    parent_type, fragment.selection_set, visited_fragments | {name}
+                )
+            else:
+                continue
+            cost += field_cost
+            depth = max(depth, field_depth)
+        return cost, depth
+
+    def _field(self, parent, node: FieldNode, visited_fragments):
+        name = node.name.value
+        if name.startswith('__') or not is_object_type(parent) or name not in parent.fields:
+            return 0, 0
+
+        field_type = parent.fields[name].type
+        named_type = get_named_type(field_type)
+        key = f'{parent.name}.{name}'
+
+        if node.selection_set is None or not is_object_type(named_type):
+            return self.field_costs.get(key, 0), 0
+
+        child_cost, child_depth = self._selection_set(named_type, node.selection_set, visited_fragments)
+        multiplier = self._list_size(node, field_type, named_type, parent)
+        return self.field_costs.get(key, 1) + multiplier * child_cost, child_depth + 1
+
+    def _list_size(self, node: FieldNode, field_type, named_type, parent) -> int:
+        """Expected number of children for a field (1 for non-list fields)."""
+        limit = self._argument(node, ('first', 'limit', 'latest'))
+        # Connection edges are already bounded by the connection's `first`
+        if parent.name.endswith('Connection') and node.name.value == 'edges':
+            return 1
+        if isinstance(limit, int):
+            return max(limit, 0)
+        if is_list_type(get_nullable_type(field_type)):
+            return self.default_list_size
+        if named_type.name.endswith('Connection'):
+            return settings.DEFAULT_PAGE_SIZE
+        return 1
+
+    def _argument(self, node: FieldNode, names) -> Optional[Any]:
+        for argument in node.arguments or ():
+            if argument.name.value in names:
+                if isinstance(argument.value, VariableNode):
+                    return self.variables.get(argument.value.name.value)
+                return value_from_ast_untyped(argument.value)
+        return None
+
+
+def _client_address(request) -> str:
+    """
+    The client's IP address: REMOTE_ADDR, unless that is one of TRUSTED_PROXIES,
+    in which case the nearest X-Forwarded-For entry not added by a trusted proxy.
+    Entries further left are client-supplied and never trusted.
+    """
+    trusted = settings.GRAPHQL_COST['TRUSTED_PROXIES']
+    address = request.META.get('REMOTE_ADDR') or 'unknown'
+    if address not in trusted:
+        return address
+    forwarded = [entry.strip() for entry in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')]
+    for entry in reversed(forwarded):
+        if entry and entry not in trusted:
+            return entry
+    return address
+
+
+def _client_key(request) -> str:
+    return f'graphql:cost:{_client_address(request)}:{int(time.time() // 60)}'
+
+
+def _throttle(request, cost: QueryCost) -> None:
+    """
+    Charge the operation's cost against the client's per-minute budget.
+    """
+    budget = settings.GRAPHQL_COST['COST_PER_MINUTE']
+    if not budget or request is None:
+        return
+    cache = caches[settings.GRAPHQL_COST['CACHE']]
+    key = _client_key(request)
+    spent = cost.cost
+    if not cache.add(key, spent, timeout=60):
+        try:
+            spent = cache.incr(key, spent)
+        except ValueError:
+            # The key expired between add() and incr(): this charge opens a new window
+            cache.set(key, spent, timeout=60)
+    if spent > budget:
+        raise QueryCostError(
+            f"Query cost budget of {budget} per minute exceeded; retry later.",
+            'COST_RATE_LIMITED',
+            cost,
+        )
+
+
+def check_query_cost(
+    request,
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    operation_name: Optional[str],
+    variables: Optional[dict]
+) -> Optional[QueryCost]:
+    """
+    Compute the cost of the requested operation and enforce the configured limits.
+
+    Returns:
+        QueryCost, or None if the operation cannot be selected or its variables
+        are invalid (execution reports both as request errors)
+
+    Raises:
+        QueryCostError: If the operation exceeds MAX_DEPTH, MAX_COST or the client's budget
+    """
+    operation = get_operation_ast(document, operation_name)
+    if operation is None:
+        return None
+
+    if variables is not None and not isinstance(variables, dict):
+        return None
+    coerced = get_variable_values(schema, operation.variable_definitions or (), variables or {})
+    if isinstance(coerced, list):
+        return None
+
+    cost = CostAnalyzer(schema, document, coerced).analyze(operation)
+    limits = settings.GRAPHQL_COST
+
+    if cost.depth > limits['MAX_DEPTH']:
+        raise QueryCostError(
+            f"Query depth {cost.depth} exceeds the maximum depth of {limits['MAX_DEPTH']}.",
+            'QUERY_TOO_DEEP',
+            cost,
+        )
+    if cost.cost > limits['MAX_COST']:
+        raise QueryCostError(
+            f"Query cost {cost.cost} exceeds the maximum cost of {limits['MAX_COST']}.",
+            'QUERY_TOO_EXPENSIVE',
+            cost,
+        )
+    _throttle(request, cost)
+    return cost
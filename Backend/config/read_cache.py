@@ -0,0 +1,345 @@
+import hashlib
+import math
+import random
+import threading
+import time
+from typing import Any, Callable, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet, ImproperlyConfigured
+from django.db import transaction
+from django.db.models import Prefetch, QuerySet
+
+from config.db.routing import primary_reads
+from project.models import Project
+from task.models import Task
+
+KEY_PREFIX = 'readcache:'
+
+# Generation scope of organization-table lookups that are not keyed by id (e.g. by slug)
+ORGANIZATIONS_SCOPE = 'organizations'
+
+# Generation scope of reads spanning every organization; bumped by every write
+ALL_SCOPE = 'all'
+
+
+def organization_scope(organization_id: int) -> str:
+    """Generation scope of everything owned by one organization."""
+    return f'org:{organization_id}'
+
+
+def get_cache():
+    return caches[settings.READ_CACHE['ALIAS']]
+
+
+def check_shared_cache(processes: int) -> None:
+    """
+    Refuse to serve several worker processes from a per-process read cache:
+    each worker would keep its own generations, serving entries (and 304s)
+    another worker's writes have invalidated.
+
+    Raises:
+        ImproperlyConfigured: If processes > 1, the read cache is enabled and its backend is process-local
+    """
+    backend = settings.CACHES[settings.READ_CACHE['ALIAS']]['BACKEND']
+    if processes > 1 and generations_enabled() and backend == 'django.core.cache.backends.locmem.LocMemCache':
+        raise ImproperlyConfigured(
+            f"The read cache needs a cache shared by the {processes} worker processes: set CACHE_BACKEND "
+            f"(and CACHE_LOCATION) to Redis, Memcached or the database cache, or set READ_CACHE_ENABLED=false."
+        )
+
+
+def generations_enabled() -> bool:
+    """
+    Whether generations may version responses (cache entries and ETags):
+    the read cache is enabled and its backend actually stores them.
+    """
+    backend = settings.CACHES[settings.READ_CACHE['ALIAS']]['BACKEND']
+    return settings.READ_CACHE['ENABLED'] and backend != 'django.core.cache.backends.dummy.DummyCache'
+
+
+class ReadCacheMetrics:
+    """
+    Per-process hit/miss counters and served-entry age for the read cache, by namespace.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._namespaces = {}
+            self.invalidations = 0
+
+    def _entry(self, namespace: str) -> dict:
+        entry = self._namespaces.get(namespace)
+        if entry is None:
+            entry = self._namespaces[namespace] = {
+                'hits': 0, 'misses': 0, 'stale_hits': 0, 'early_refreshes': 0, 'waits': 0,
+                'age_total': 0.0, 'age_max': 0.0,
+            }
+        return entry
+
+    def record_hit(self, namespace: str, age: float, stale: bool = False) -> None:
+        with self._lock:
+            entry = self._entry(namespace)
+            entry['hits'] += 1
+            entry['stale_hits'] += stale
+            entry['age_total'] += age
+            entry['age_max'] = max(entry['age_max'], age)
+
+    def record(self, namespace: str, counter: str) -> None:
+        with self._lock:
+            self._entry(namespace)[counter] += 1
+
+    def record_miss(self, namespace: str) -> None:
+        with self._lock:
+            self._entry(namespace)['misses'] += 1
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            namespaces = {}
+            for namespace, entry in self._namespaces.items():
+                lookups = entry['hits'] + entry['misses']
+                namespaces[namespace] = {
+                    'hits': entry['hits'],
+                    'misses': entry['misses'],
+                    'hit_rate': round(entry['hits'] / lookups, 4) if lookups else 0.0,
+                    'stale_hits': entry['stale_hits'],
+                    'early_refreshes': entry['early_refreshes'],
+                    'waits': entry['waits'],
+                    'avg_age_seconds': round(entry['age_total'] / entry['hits'], 3) if entry['hits'] else 0.0,
+                    'max_age_seconds': round(entry['age_max'], 3),
+                }
+            return {'invalidations': self.invalidations, 'namespaces': namespaces}
+
+
+metrics = ReadCacheMetrics()
+
+
+def _generation_key(scope: str) -> str:
+    return f'{KEY_PREFIX}gen:{scope}'
+
+
+def get_generations(scopes: Iterable[str]) -> list:
+    """
+    Current generation of each scope, initializing missing ones.
+
+    New generations start at the current time in nanoseconds, so a scope
+    whose counter was evicted never reuses the generation of older entries.
+    """
+    cache = get_cache()
+    scopes = list(scopes)
+    keys = [_generation_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    generations = []
+    for key in keys:
+        generation = found.get(key)
+        if generation is None:
+            cache.add(key, time.time_ns(), timeout=None)
+            generation = cache.get(key)
+        generations.append(generation)
+    return generations
+
+
+def bump(*scopes: str) -> None:
+    """Invalidate every entry of the given scopes in O(1) by advancing their generations."""
+    cache = get_cache()
+    for scope in scopes:
+        key = _generation_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+        metrics.record_invalidation()
+
+
+def invalidate(*scopes: str) -> None:
+    """
+    Bump scopes now and again once the current transaction commits, so a
+    concurrent reader cannot re-cache pre-commit data under the new generation.
+    """
+    bump(*scopes)
+    transaction.on_commit(lambda: bump(*scopes))
+
+
+def _should_refresh(stored_at: float, delta: float, now: float) -> bool:
+    """
+    Probabilistic early expiration: the closer an entry is to its soft expiry,
+    and the longer it took to compute, the likelier a reader refreshes it early.
+    """
+    expires_at = stored_at + settings.READ_CACHE['TIMEOUT']
+    beta = settings.READ_CACHE['EARLY_REFRESH_BETA']
+    return now - delta * beta * math.log(1.0 - random.random()) >= expires_at
+
+
+def _compute_and_store(cache, cache_key: str, compute: Callable[[], Any]) -> Any:
+    start = time.time()
+    # Entries outlive replication lag, so they are always built from the primary
+    with primary_reads():
+        value = compute()
+    now = time.time()
+    options = settings.READ_CACHE
+    cache.set(cache_key, (now, value, now - start), options['TIMEOUT'] + options['STALE_TIMEOUT'])
+    return value
+
+
+def invalidate_organizations(*organization_ids: Optional[int]) -> None:
+    """Invalidate the given organizations (None ids are ignored) and cross-tenant reads."""
+    scopes = {organization_scope(pk) for pk in organization_ids if pk is not None}
+    invalidate(*scopes, ALL_SCOPE)
+
+
+def cached(namespace: str, scopes: Iterable[str], key: str, compute: Callable[[], Any]) -> Any:
+    """
+    Return compute() through the read cache, versioned by the generations of scopes.
+
+    Entries are fresh for TIMEOUT seconds and kept STALE_TIMEOUT longer. Only
+    the caller holding the entry's lock recomputes it: others serve the stale
+    value if there is one, or wait up to LOCK_TIMEOUT for the new value. Fresh
+    entries are refreshed early with a probability that rises towards expiry
+    (scaled by EARLY_REFRESH_BETA and the compute time), so popular keys are
+    normally rebuilt before they expire.
+
+    Args:
+        namespace: Metrics and key namespace, e.g. 'projects'
+        scopes: Generation scopes whose invalidation must evict this entry
+        key: Key of the value within the namespace (hashed, so any string is safe)
+        compute: Callable producing the value on a miss
+    """
+    options = settings.READ_CACHE
+    if not options['ENABLED']:
+        return compute()
+
+    scopes = list(scopes)
+    generations = get_generations(scopes)
+    versions = ':'.join(f'{scope}={generation}' for scope, generation in zip(scopes, generations))
+    digest = hashlib.sha1(key.encode()).hexdigest()
+    cache_key = f'{KEY_PREFIX}{namespace}:{versions}:{digest}'
+    lock_key = f'{cache_key}:lock'
+
+    cache = get_cache()
+    entry = cache.get(cache_key)
+    if entry is not None:
+        stored_at, value, delta = entry
+        now = time.time()
+        if not _should_refresh(stored_at, delta, now):
+            metrics.record_hit(namespace, now - stored_at)
+            return value
+        if not cache.add(lock_key, 1, options['LOCK_TIMEOUT']):
+            # Another caller is rebuilding this entry
+            metrics.record_hit(namespace, now - stored_at, stale=now >= stored_at + options['TIMEOUT'])
+            return value
+        metrics.record(namespace, 'early_refreshes')
+        try:
+            return _compute_and_store(cache, cache_key, compute)
+        finally:
+            cache.delete(lock_key)
+
+    metrics.record_miss(namespace)
+    if cache.add(lock_key, 1, options['LOCK_TIMEOUT']):
+        try:
+            return _compute_and_store(cache, cache_key, compute)
+        finally:
+            cache.delete(lock_key)
+
+    # Single flight: wait for the caller holding the lock to store the value
+    metrics.record(namespace, 'waits')
+    deadline = time.monotonic() + options['LOCK_TIMEOUT']
+    while time.monotonic() < deadline:
+        time.sleep(options['WAIT_INTERVAL'])
+        entry = cache.get(cache_key)
+        if entry is not None:
+            return entry[1]
+        if cache.add(lock_key, 1, options['LOCK_TIMEOUT']):
+            # The holder gave up without storing a value; take over
+            try:
+                return _compute_and_store(cache, cache_key, compute)
+            finally:
+                cache.delete(lock_key)
+    return compute()
+
+
+def queryset_key(queryset: QuerySet) -> Optional[str]:
+    """
+    The SQL and prefetches a queryset will run, or None if it cannot be
+    compiled (e.g. a filter that matches nothing).
+    """
+    try:
+        parts = [str(queryset.query)]
+    except EmptyResultSet:
+        return None
+    for lookup in queryset._prefetch_related_lookups:
+        if isinstance(lookup, Prefetch):
+            nested = queryset_key(lookup.queryset) if lookup.queryset is not None else ''
+            if nested is None:
+                return None
+            parts.append(f'{lookup.prefetch_to}>{lookup.to_attr}:{nested}')
+        else:
+            parts.append(str(lookup))
+    return '|'.join(parts)
+
+
+def cached_list(namespace: str, scopes: Iterable[str], queryset: QuerySet) -> list:
+    """Evaluate queryset through the read cache, keyed by its SQL."""
+    key = queryset_key(queryset)
+    if key is None:
+        return list(queryset)
+    return cached(namespace, scopes, key, lambda: list(queryset))
+
+
+def _owner_key(kind: str, pk: int) -> str:
+    return f'{KEY_PREFIX}{kind}-owner:{pk}'
+
+
+def _get_owner(kind: str, pk: int, lookup: Callable[[], Optional[int]]) -> Optional[int]:
+    cache = get_cache()
+    key = _owner_key(kind, pk)
+    owner_id = cache.get(key)
+    if owner_id is None:
+        owner_id = lookup()
+        if owner_id is not None:
+            cache.set(key, owner_id, settings.READ_CACHE['TIMEOUT'])
+    return owner_id
+
+
+def _set_owner(kind: str, pk: int, owner_id: Optional[int]) -> None:
+    cache = get_cache()
+    if owner_id is None:
+        cache.delete(_owner_key(kind, pk))
+    else:
+        cache.set(_owner_key(kind, pk), owner_id, settings.READ_CACHE['TIMEOUT'])
+
+
+def organization_for_project(project_id: int) -> Optional[int]:
+    """
+    Organization id of a project, cached until the project is saved or deleted.
+    """
+    return _get_owner(
+        'project', project_id,
+        lambda: Project.objects.filter(pk=project_id).values_list('organization_id', flat=True).first()
+    )
+
+
+def set_project_organization(project_id: int, organization_id: Optional[int]) -> None:
+    _set_owner('project', project_id, organization_id)
+
+
+def project_for_task(task_id: int) -> Optional[int]:
+    """
+    Project id of a task, cached until the task is saved or deleted.
+    """
+    return _get_owner(
+        'task', task_id,
+        lambda: Task.objects.filter(pk=task_id).values_list('project_id', flat=True).first()
+    )
+
+
+def set_task_project(task_id: int, project_id: Optional[int]) -> None:
+    _set_owner('task', task_id, project_id)
@@ -0,0 +1,64 @@
+import json
+from typing import Any
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _django_default(value: Any) -> Any:
+    """Fallback for types orjson does not handle natively (Decimal, Promise, ...)."""
+    return DjangoJSONEncoder().default(value)
+
+
+def _orjson_dumps(data: Any) -> bytes:
+    return orjson.dumps(data, default=_django_default)
+
+
+def _stdlib_dumps(data: Any) -> bytes:
+    return json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+
+def get_encoder_name() -> str:
+    """
+    Return the name of the encoder selected by the JSON_ENCODER setting.
+
+    'auto' picks orjson when it is installed and the stdlib otherwise.
+    """
+    name = getattr(settings, 'JSON_ENCODER', 'auto')
+    if name == 'auto':
+        return 'orjson' if orjson is not None else 'stdlib'
+    if name == 'orjson' and orjson is None:
+        raise ImportError("JSON_ENCODER is set to 'orjson' but orjson is not installed.")
+    return name
+
+
+def json_dumps(data: Any) -> bytes:
+    """
+    Serialize data to compact JSON bytes with the configured encoder.
+
+    Both encoders emit datetimes and dates as ISO 8601 strings.
+    """
+    if get_encoder_name() == 'orjson':
+        return _orjson_dumps(data)
+    return _stdlib_dumps(data)
+
+
+class JsonResponse(HttpResponse):
+    """
+    Drop-in replacement for django.http.JsonResponse using json_dumps.
+    """
+
+    def __init__(self, data: Any, safe: bool = True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                "In order to allow non-dict objects to be serialized set the "
+                "safe parameter to False."
+            )
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=json_dumps(data), **kwargs)
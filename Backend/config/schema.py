@@ -11,6 +11,10 @@ from taskComment.models import TaskComment
 from project.service import ProjectService
 from task.service import TaskService
 from taskComment.service import TaskCommentService
+from config.loaders import get_loaders
+from config.bulk import check_bulk_size
+from config.pagination import Page, encode_cursor
+from config.projection import latest_attr, projector
 
 
 # Type Definitions
@@ -30,24 +34,24 @@ class ProjectType(DjangoObjectType):
         fields = ("id", "organization", "name", "description", "status", "due_date", "created_at")
     
     def resolve_task_count(self, info):
-        """Calculate total number of tasks for this project."""
-        return self.task_set.count()
+        """Total number of tasks, read from the project's counter column."""
+        return self.task_count
     
     def resolve_completed_task_count(self, info):
-        """Calculate number of completed tasks."""
-        return self.task_set.filter(status='done').count()
+        """Number of completed tasks, read from the project's counter column."""
+        return self.done_task_count
     
     def resolve_completion_rate(self, info):
-        """Calculate completion rate as a percentage."""
-        total = self.task_set.count()
-        if total == 0:
-            return 0.0
-        completed = self.task_set.filter(status='done').count()
-        return round((completed / total) * 100, 2)
+        """Completion rate as a percentage."""
+        return self.completion_rate
 
 
 class TaskType(DjangoObjectType):
     comment_count = graphene.Int()
+    comments = graphene.NonNull(
+        graphene.List(graphene.NonNull(lambda: TaskCommentType)),
+        latest=graphene.Int(description="Only the N most recent comments"),
+    )
     
     class Meta:
         model = Task
@@ -55,7 +59,17 @@ class TaskType(DjangoObjectType):
     
     def resolve_comment_count(self, info):
         """Calculate number of comments for this task."""
-        return self.comments.count()
+        return get_loaders(info).task_comment_counts.load(self.id)
+
+    def resolve_comments(self, info, latest=None):
+        """Comments of this task, served from the root resolver's prefetch when planned."""
+        if latest is None:
+            return self.comments.all()
+        latest = max(latest, 0)
+        prefetched = getattr(self, latest_attr('comments', latest), None)
+        if prefetched is not None:
+            return prefetched
+        return self.comments.order_by('-timestamp', 'id')[:latest]
 
 
 class TaskCommentType(DjangoObjectType):
@@ -64,6 +78,40 @@ class TaskCommentType(DjangoObjectType):
         fields = ("id", "task", "content", "author_email", "timestamp")
 
 
+# Relay-style connections for keyset-paginated lists
+class ProjectConnection(graphene.relay.Connection):
+    class Meta:
+        node = ProjectType
+
+
+class TaskConnection(graphene.relay.Connection):
+    class Meta:
+        node = TaskType
+
+
+class TaskCommentConnection(graphene.relay.Connection):
+    class Meta:
+        node = TaskCommentType
+
+
+def page_to_connection(connection_type, page: Page, after=None):
+    """Build a Relay connection from a keyset (or ranked search) page."""
+    cursors = page.cursors or [encode_cursor(item.created_at, item.id) for item in page.items]
+    edges = [
+        connection_type.Edge(node=item, cursor=cursor)
+        for item, cursor in zip(page.items, cursors)
+    ]
+    return connection_type(
+        edges=edges,
+        page_info=graphene.relay.PageInfo(
+            has_next_page=page.has_next,
+            has_previous_page=bool(after),
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None,
+        ),
+    )
+
+
 # Input Types for Mutations
 class ProjectInput(graphene.InputObjectType):
     organization_id = graphene.Int(required=True)
@@ -99,6 +147,10 @@ class TaskUpdateInput(graphene.InputObjectType):
     project_id = graphene.Int()
 
 
+class TaskBulkUpdateInput(TaskUpdateInput):
+    task_id = graphene.Int(required=True)
+
+
 class TaskCommentInput(graphene.InputObjectType):
     task_id = graphene.Int(required=True)
     content = graphene.String(required=True)
@@ -117,6 +169,21 @@ class OrganizationUpdateInput(graphene.InputObjectType):
     contact_email = graphene.String()
 
 
+class BulkItemErrorType(graphene.ObjectType):
+    index = graphene.Int(description="Position of the rejected item in the input list")
+    field = graphene.String()
+    messages = graphene.List(graphene.String)
+
+
+def bulk_item_errors(result):
+    """Flatten BulkResult errors into BulkItemErrorType objects."""
+    return [
+        BulkItemErrorType(index=error['index'], field=field, messages=messages)
+        for error in result.errors
+        for field, messages in error['errors'].items()
+    ]
+
+
 # Project Statistics Type
 class ProjectStatisticsType(graphene.ObjectType):
     total_projects = graphene.Int()
@@ -136,7 +203,8 @@ class Query(graphene.ObjectType):
     organizations = graphene.List(
         OrganizationType,
         search=graphene.String(description="Optional search term for name, slug, or email"),
-        description="List all organizations or search by term"
+        limit=graphene.Int(description="Maximum number of search results"),
+        description="List all organizations or search by term (best match first)"
     )
 
     # Single organization by ID
@@ -160,6 +228,36 @@ class Query(graphene.ObjectType):
         description="List all projects for a specific organization"
     )
     
+    # Ranked project search
+    search_projects = graphene.List(
+        ProjectType,
+        query=graphene.String(required=True),
+        organization_id=graphene.Int(description="Optional organization scope"),
+        limit=graphene.Int(description="Maximum number of results"),
+        description="Search projects by name or description (best match first)"
+    )
+    
+    # Ranked comment search
+    search_comments = graphene.Field(
+        TaskCommentConnection,
+        query=graphene.String(required=True),
+        organization_id=graphene.Int(description="Only comments within this organization"),
+        project_id=graphene.Int(description="Only comments on tasks of this project"),
+        task_id=graphene.Int(description="Only comments on this task"),
+        first=graphene.Int(description="Page size"),
+        after=graphene.String(description="Cursor of the last hit on the previous page"),
+        description="Search comment content and author emails (best match first)"
+    )
+    
+    # Paginated projects for an organization
+    projects_by_organization_connection = graphene.Field(
+        ProjectConnection,
+        organization_id=graphene.Int(required=True),
+        first=graphene.Int(description="Page size"),
+        after=graphene.String(description="Cursor of the last project on the previous page"),
+        description="Page through projects for a specific organization"
+    )
+    
     # Project statistics
     project_statistics = graphene.Field(
         ProjectStatisticsType,
@@ -187,12 +285,20 @@ class Query(graphene.ObjectType):
         project_id=graphene.Int(required=True),
         description="List all tasks for a specific project"
     )
+
+    tasks_by_project_connection = graphene.Field(
+        TaskConnection,
+        project_id=graphene.Int(required=True),
+        first=graphene.Int(description="Page size"),
+        after=graphene.String(description="Cursor of the last task on the previous page"),
+        description="Page through tasks for a specific project"
+    )
     
-    def resolve_organizations(self, info, search=None):
+    def resolve_organizations(self, info, search=None, limit=None):
         """Resolve all organizations or search by term."""
         try:
             if search:
-                return OrganizationService.search_organizations(search)
+                return OrganizationService.search_organizations(search, limit=limit)
             return OrganizationService.get_all_organizations()
         except Exception as e:
             raise Exception(f"Error fetching organizations: {str(e)}")
@@ -220,52 +326,55 @@ class Query(graphene.ObjectType):
     def resolve_projects_by_organization(self, info, organization_id):
         """Resolve projects for an organization."""
         try:
-            projects = ProjectService.get_projects_by_organization(organization_id)
+            projects = ProjectService.get_projects_by_organization(organization_id, optimize=projector(info))
             return projects
         except Exception as e:
             raise Exception(f"Error fetching projects: {str(e)}")
+
+    def resolve_search_projects(self, info, query, organization_id=None, limit=None):
+        """Resolve ranked project search results."""
+        try:
+            return ProjectService.search_projects(
+                query, organization_id=organization_id, limit=limit, optimize=projector(info)
+            )
+        except Exception as e:
+            raise Exception(f"Error searching projects: {str(e)}")
+
+    def resolve_search_comments(self, info, query, organization_id=None, project_id=None, task_id=None,
+                                first=None, after=None):
+        """Resolve one page of ranked comment search hits."""
+        try:
+            page = TaskCommentService.search_comments(
+                query, organization_id=organization_id, project_id=project_id, task_id=task_id,
+                limit=first, after=after, optimize=projector(info, path=('edges', 'node'))
+            )
+            return page_to_connection(TaskCommentConnection, page, after)
+        except Exception as e:
+            raise Exception(f"Error searching comments: {str(e)}")
+
+    def resolve_projects_by_organization_connection(self, info, organization_id, first=None, after=None):
+        """Resolve one page of projects for an organization."""
+        try:
+            page = ProjectService.get_projects_page(
+                organization_id=organization_id, limit=first, after=after,
+                optimize=projector(info, path=('edges', 'node'), always=('created_at',))
+            )
+            return page_to_connection(ProjectConnection, page, after)
+        except Exception as e:
+            raise Exception(f"Error fetching projects: {str(e)}")
     
     def resolve_project_statistics(self, info, organization_id):
         """Resolve project statistics for an organization."""
         try:
-            projects = ProjectService.get_projects_by_organization(organization_id)
-            
-            total_projects = len(projects)
-            active_projects = sum(1 for p in projects if p.status == 'active')
-            completed_projects = sum(1 for p in projects if p.status == 'completed')
-            on_hold_projects = sum(1 for p in projects if p.status == 'on_hold')
-            
-            # Get all tasks for these projects
-            project_ids = [p.id for p in projects]
-            tasks = Task.objects.filter(project_id__in=project_ids)
-            
-            total_tasks = tasks.count()
-            completed_tasks = tasks.filter(status='done').count()
-            in_progress_tasks = tasks.filter(status='in_progress').count()
-            todo_tasks = tasks.filter(status='todo').count()
-            
-            overall_completion_rate = 0.0
-            if total_tasks > 0:
-                overall_completion_rate = round((completed_tasks / total_tasks) * 100, 2)
-            
-            return ProjectStatisticsType(
-                total_projects=total_projects,
-                active_projects=active_projects,
-                completed_projects=completed_projects,
-                on_hold_projects=on_hold_projects,
-                total_tasks=total_tasks,
-                completed_tasks=completed_tasks,
-                in_progress_tasks=in_progress_tasks,
-                todo_tasks=todo_tasks,
-                overall_completion_rate=overall_completion_rate
-            )
+            statistics = ProjectService.get_statistics(organization_id)
+            return ProjectStatisticsType(**statistics)
         except Exception as e:
             raise Exception(f"Error fetching statistics: {str(e)}")
     
     def resolve_project(self, info, project_id):
         """Resolve a single project by ID."""
         try:
-            project = ProjectService.get_project_by_id(project_id)
+            project = ProjectService.get_project_by_id(project_id, optimize=projector(info))
             if not project:
                 raise Exception(f"Project with ID {project_id} not found")
             return project
@@ -275,7 +384,7 @@ class Query(graphene.ObjectType):
     def resolve_task(self, info, task_id):
         """Resolve a single task by ID."""
         try:
-            task = TaskService.get_task_by_id(task_id)
+            task = TaskService.get_task_by_id(task_id, optimize=projector(info))
             if not task:
                 raise Exception(f"Task with ID {task_id} not found")
             return task
@@ -285,11 +394,22 @@ class Query(graphene.ObjectType):
     def resolve_tasks_by_project(self, info, project_id):
         """Resolve tasks for a project."""
         try:
-            tasks = TaskService.get_tasks_by_project(project_id)
+            tasks = TaskService.get_tasks_by_project(project_id, optimize=projector(info))
             return tasks
         except Exception as e:
             raise Exception(f"Error fetching tasks: {str(e)}")
 
+    def resolve_tasks_by_project_connection(self, info, project_id, first=None, after=None):
+        """Resolve one page of tasks for a project."""
+        try:
+            page = TaskService.get_tasks_page(
+                project_id=project_id, limit=first, after=after,
+                optimize=projector(info, path=('edges', 'node'), always=('created_at',))
+            )
+            return page_to_connection(TaskConnection, page, after)
+        except Exception as e:
+            raise Exception(f"Error fetching tasks: {str(e)}")
+
 
 # Mutations
 class CreateProject(graphene.Mutation):
@@ -403,6 +523,55 @@ class UpdateTask(graphene.Mutation):
             return UpdateTask(task=None, success=False, errors=[str(e)])
 
 
+class BulkCreateTasks(graphene.Mutation):
+    class Arguments:
+        input = graphene.List(graphene.NonNull(TaskInput), required=True)
+        allow_partial = graphene.Boolean(default_value=False)
+
+    tasks = graphene.List(TaskType)
+    success = graphene.Boolean()
+    errors = graphene.List(graphene.String)
+    item_errors = graphene.List(BulkItemErrorType)
+
+    def mutate(self, info, input, allow_partial=False):
+        try:
+            items = [
+                {key: value for key, value in dict(item).items() if value is not None}
+                for item in check_bulk_size(list(input))
+            ]
+            result = TaskService.bulk_create_tasks(items, allow_partial=allow_partial)
+            return BulkCreateTasks(
+                tasks=result.items, success=result.ok, errors=[], item_errors=bulk_item_errors(result)
+            )
+        except Exception as e:
+            return BulkCreateTasks(tasks=[], success=False, errors=[str(e)], item_errors=[])
+
+
+class BulkUpdateTasks(graphene.Mutation):
+    class Arguments:
+        input = graphene.List(graphene.NonNull(TaskBulkUpdateInput), required=True)
+        allow_partial = graphene.Boolean(default_value=False)
+
+    tasks = graphene.List(TaskType)
+    success = graphene.Boolean()
+    errors = graphene.List(graphene.String)
+    item_errors = graphene.List(BulkItemErrorType)
+
+    def mutate(self, info, input, allow_partial=False):
+        try:
+            items = []
+            for item in check_bulk_size(list(input)):
+                data = {key: value for key, value in dict(item).items() if value is not None}
+                data['id'] = data.pop('task_id')
+                items.append(data)
+            result = TaskService.bulk_update_tasks(items, allow_partial=allow_partial)
+            return BulkUpdateTasks(
+                tasks=result.items, success=result.ok, errors=[], item_errors=bulk_item_errors(result)
+            )
+        except Exception as e:
+            return BulkUpdateTasks(tasks=[], success=False, errors=[str(e)], item_errors=[])
+
+
 class CreateOrganization(graphene.Mutation):
     class Arguments:
         input = OrganizationInput(required=True)
@@ -493,6 +662,8 @@ class Mutation(graphene.ObjectType):
     update_project = UpdateProject.Field()
     create_task = CreateTask.Field()
     update_task = UpdateTask.Field()
+    bulk_create_tasks = BulkCreateTasks.Field()
+    bulk_update_tasks = BulkUpdateTasks.Field()
     add_task_comment = AddTaskComment.Field()
     create_organization = CreateOrganization.Field()
     update_organization = UpdateOrganization.Field()
@@ -0,0 +1,270 @@
+import base64
+from functools import reduce
+from operator import or_
+from typing import Any, Dict, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+from config.pagination import Page
+
+# Shortest term the trigram indexes can serve; shorter terms scan the table
+MIN_INDEXED_LENGTH = 3
+
+
+def search_limit(limit: Any) -> int:
+    """
+    Validate a requested result count and clamp it to SEARCH_MAX_LIMIT.
+
+    Raises:
+        ValidationError: If the limit is not a positive integer
+    """
+    if limit in (None, ''):
+        return settings.SEARCH_DEFAULT_LIMIT
+    try:
+        limit = int(limit)
+    except (ValueError, TypeError):
+        raise ValidationError({'limit': 'Limit must be a valid integer.'})
+    if limit < 1:
+        raise ValidationError({'limit': 'Limit must be greater than zero.'})
+    return min(limit, settings.SEARCH_MAX_LIMIT)
+
+
+def get_search_params(request) -> Tuple[str, int]:
+    """
+    Read and validate the q/limit query parameters of a search request.
+    """
+    query = request.GET.get('q', '').strip()
+    if not query:
+        raise ValidationError({'q': 'Search query is required.'})
+    return query, search_limit(request.GET.get('limit', '').strip())
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Opaque cursor of a position in a ranked result list."""
+    return base64.urlsafe_b64encode(f'rank|{offset}'.encode()).decode()
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    """
+    Decode a cursor produced by encode_offset_cursor.
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    try:
+        kind, offset = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        if kind != 'rank' or int(offset) < 0:
+            raise ValueError(cursor)
+        return int(offset)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise ValidationError({'after': 'Invalid cursor.'})
+
+
+class SearchIndex:
+    """
+    Case-insensitive substring search over text columns of one model.
+
+    PostgreSQL: pg_trgm GIN indexes on UPPER(column) serve the `icontains`
+    filters Django emits, and results are ranked by weighted trigram word
+    similarity. SQLite: an external-content FTS5 table with the trigram
+    tokenizer, kept in sync by triggers, ranked by weighted bm25. Terms
+    shorter than MIN_INDEXED_LENGTH, and other backends, fall back to an
+    unindexed `icontains` scan with the same matches.
+
+    Args:
+        model: App label and model name, e.g. 'organization.Organization'
+        weights: {field name: rank weight} of the searched columns
+    """
+
+    def __init__(self, model: str, weights: Dict[str, float]):
+        self.model_label = model
+        self.weights = weights
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def table(self) -> str:
+        return f'{self.model._meta.db_table}_search'
+
+    @property
+    def columns(self) -> list:
+        return [self.model._meta.get_field(name).column for name in self.weights]
+
+    def matches(self, query: str, using: str = 'default') -> Q:
+        """Condition selecting rows that contain query in any searched column."""
+        if self._uses_fts(using, query):
+            return Q(pk__in=RawSQL(
+                f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s', [self._phrase(query)]
+            ))
+        return self._contains(query)
+
+    def filter(self, queryset: QuerySet, query: str) -> QuerySet:
+        """Restrict queryset to rows containing query in any searched column, keeping its ordering."""
+        return queryset.filter(self.matches(query, queryset.db))
+
+    def search(self, queryset: QuerySet, query: str, limit: Optional[int] = None, offset: int = 0) -> list:
+        """
+        Best matches of query among queryset, most relevant first, newest first on ties.
+
+        Args:
+            queryset: Rows to search (filters and only/select_related are kept)
+            query: Search term, matched as a substring
+            limit: Maximum number of results (see search_limit)
+            offset: Number of better-ranked results to skip
+        """
+        limit = search_limit(limit)
+        vendor = connections[queryset.db].vendor
+        newest_first = [*self.model._meta.ordering, '-pk']
+
+        if vendor == 'postgresql':
+            from django.contrib.postgres.search import TrigramWordSimilarity
+
+            rank = reduce(
+                lambda total, expression: total + expression,
+                (TrigramWordSimilarity(query, name) * weight for name, weight in self.weights.items())
+            )
+            queryset = queryset.filter(self._contains(query)).annotate(search_rank=rank)
+            return list(queryset.order_by('-search_rank', *newest_first)[offset:offset + limit])
+
+        if not self._uses_fts(queryset.db, query):
+            return list(self.filter(queryset, query).order_by(*newest_first)[offset:offset + limit])
+
+        # Rank the FTS matches that are also in queryset, then load those rows
+        scope_sql, scope_params = queryset.order_by().values('pk').query.sql_with_params()
+        weights = ', '.join(str(float(weight)) for weight in self.weights.values())
+        pk = self.model._meta.pk.column
+        sql = (
+            f'SELECT {self.table}.rowid FROM {self.table} JOIN ({scope_sql}) scope ON scope.{pk} = {self.table}.rowid '
+            f'WHERE {self.table} MATCH %s ORDER BY bm25({self.table}, {weights}), {self.table}.rowid DESC LIMIT %s OFFSET %s'
+        )
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(sql, [*scope_params, self._phrase(query), limit, offset])
+            ids = [row[0] for row in cursor.fetchall()]
+        rows = queryset.in_bulk(ids)
+        return [rows[row_id] for row_id in ids if row_id in rows]
+
+    def search_page(self, queryset: QuerySet, query: str, limit: Optional[int] = None,
+                    after: Optional[str] = None) -> Page:
+        """
+        One page of ranked matches. Cursors are positions in the ranking, so a
+        page is exact as long as no matching rows are written in between.
+        """
+        limit = search_limit(limit)
+        offset = decode_offset_cursor(after) if after else 0
+        items = self.search(queryset, query, limit=limit + 1, offset=offset)
+        has_next = len(items) > limit
+        items = items[:limit]
+        cursors = [encode_offset_cursor(offset + position + 1) for position in range(len(items))]
+        return Page(
+            items=items,
+            next_cursor=cursors[-1] if has_next else None,
+            has_next=has_next,
+            cursors=cursors,
+        )
+
+    def _contains(self, query: str) -> Q:
+        return reduce(or_, (Q(**{f'{name}__icontains': query}) for name in self.weights))
+
+    def _uses_fts(self, using: str, query: str) -> bool:
+        return (
+            len(query) >= MIN_INDEXED_LENGTH
+            and connections[using].vendor == 'sqlite'
+            and self._fts_available(connections[using])
+        )
+
+    @staticmethod
+    def _phrase(query: str) -> str:
+        """FTS5 phrase matching query literally (trigram phrases match substrings)."""
+        return '"' + query.replace('"', '""') + '"'
+
+    @staticmethod
+    def _fts_available(connection) -> bool:
+        # The FTS5 trigram tokenizer arrived in SQLite 3.34
+        return connection.Database.sqlite_version_info >= (3, 34, 0)
+
+    def _sqlite_triggers(self) -> Dict[str, str]:
+        base = self.model._meta.db_table
+        pk = self.model._meta.pk.column
+        columns = ', '.join(self.columns)
+        new = ', '.join(f'new.{column}' for column in self.columns)
+        old = ', '.join(f'old.{column}' for column in self.columns)
+        delete = (
+            f"INSERT INTO {self.table}({self.table}, rowid, {columns}) VALUES ('delete', old.{pk}, {old});"
+        )
+        insert = f"INSERT INTO {self.table}(rowid, {columns}) VALUES (new.{pk}, {new});"
+        return {
+            f'{self.table}_ai': f'AFTER INSERT ON {base} BEGIN {insert} END',
+            f'{self.table}_ad': f'AFTER DELETE ON {base} BEGIN {delete} END',
+            f'{self.table}_au': f'AFTER UPDATE OF {columns} ON {base} BEGIN {delete} {insert} END',
+        }
+
+    def _postgresql_indexes(self) -> Dict[str, str]:
+        base = self.model._meta.db_table
+        # Quoted: PostgreSQL folds unquoted names such as taskComment_taskcomment to lower case
+        return {
+            f'"{base}_{column}_trgm"': f'ON "{base}" USING gin ((UPPER("{column}"::text)) gin_trgm_ops)'
+            for column in self.columns
+        }
+
+    def create(self, connection) -> None:
+        """Create the index objects if missing (safe to run repeatedly)."""
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+                for name, definition in self._postgresql_indexes().items():
+                    cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} {definition}')
+
+            elif connection.vendor == 'sqlite' and self._fts_available(connection):
+                triggers = self._sqlite_triggers()
+                cursor.execute(
+                    "SELECT name FROM sqlite_master WHERE name IN (%s)" % ', '.join(['%s'] * (len(triggers) + 1)),
+                    [self.table, *triggers],
+                )
+                if len(cursor.fetchall()) == len(triggers) + 1:
+                    return
+                # Missing objects (first run, or triggers dropped by a table rebuild
+                # in a later migration): recreate them and reindex every row
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+                    f"{', '.join(self.columns)}, content='{self.model._meta.db_table}', "
+                    f"content_rowid='{self.model._meta.pk.column}', tokenize='trigram')"
+                )
+                for name, definition in triggers.items():
+                    cursor.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {definition}')
+                cursor.execute(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')")
+
+    def drop(self, connection) -> None:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                for name in self._postgresql_indexes():
+                    cursor.execute(f'DROP INDEX IF EXISTS {name}')
+            elif connection.vendor == 'sqlite':
+                for name in self._sqlite_triggers():
+                    cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+                cursor.execute(f'DROP TABLE IF EXISTS {self.table}')
+
+
+ORGANIZATION_SEARCH = SearchIndex('organization.Organization', {'name': 1.0, 'slug': 0.5, 'contact_email': 0.25})
+PROJECT_SEARCH = SearchIndex('project.Project', {'name': 1.0, 'description': 0.4})
+COMMENT_SEARCH = SearchIndex('taskComment.TaskComment', {'content': 1.0, 'author_email': 0.5})
+
+SEARCH_INDEXES = (ORGANIZATION_SEARCH, PROJECT_SEARCH, COMMENT_SEARCH)
+
+
+def ensure_search_indexes(sender, using='default', **kwargs) -> None:
+    """
+    post_migrate handler recreating the search objects of the migrated app.
+
+    SQLite rebuilds a table to alter it, which drops its triggers; this
+    restores them (and reindexes) after any later migration of the model.
+    """
+    for index in SEARCH_INDEXES:
+        if index.model._meta.app_label == sender.label:
+            index.create(connections[using])
@@ -0,0 +1,21 @@
+from typing import Any, Dict, Iterable
+
+
+def isoformat_fields(rows: list[Dict[str, Any]], fields: Iterable[str]) -> list[Dict[str, Any]]:
+    """
+    Convert date/datetime columns of value rows to ISO strings in place.
+
+    Args:
+        rows: Dictionaries produced by QuerySet.values()
+        fields: Names of the date or datetime columns to format
+
+    Returns:
+        The same list of rows
+    """
+    fields = tuple(fields)
+    for row in rows:
+        for name in fields:
+            value = row[name]
+            if value is not None:
+                row[name] = value.isoformat()
+    return rows
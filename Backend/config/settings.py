@@ -11,11 +11,14 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Runtime files the app writes (e.g. dead-lettered comments), kept outside the source tree
+DATA_DIR = Path(config("DATA_DIR", default=str(Path.home() / ".local" / "state" / "voice-ai-wrapper")))
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.2/howto/deployment/checklist/
@@ -44,11 +47,13 @@ INSTALLED_APPS = [
     "project",
     "task",
     "taskComment",
+    "config",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    "config.db.routing.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -84,18 +89,44 @@ WSGI_APPLICATION = "config.wsgi.application"
 # the server can still boot in environments without a DB (e.g., Render probe).
 DB_NAME = config("DB_NAME", default=None)
 
+# Connection reuse: DB_POOL keeps a psycopg pool per worker process (shared by
+# its threads); otherwise each thread keeps its connection open for
+# DB_CONN_MAX_AGE seconds (0 reconnects on every request). A pool requires
+# CONN_MAX_AGE = 0: Django returns the connection to it after each request.
+DB_POOL = config("DB_POOL", default=False, cast=bool)
+
 if DB_NAME:
+    DB_OPTIONS = {"sslmode": config("DB_SSLMODE", default="require")}
+    if DB_POOL:
+        DB_OPTIONS["pool"] = {
+            "min_size": config("DB_POOL_MIN_SIZE", default=2, cast=int),
+            "max_size": config("DB_POOL_MAX_SIZE", default=10, cast=int),
+            # Seconds a request waits for a free connection before failing
+            "timeout": config("DB_POOL_TIMEOUT", default=10.0, cast=float),
+            # Idle connections above min_size are closed after max_idle seconds
+            "max_idle": config("DB_POOL_MAX_IDLE", default=600.0, cast=float),
+            "max_lifetime": config("DB_POOL_MAX_LIFETIME", default=3600.0, cast=float),
+        }
+
     DATABASES = {
         "default": {
-            "ENGINE": "django.db.backends.postgresql",
+            "ENGINE": "config.db.postgresql",
             "NAME": DB_NAME,
             "USER": config("DB_USER", default=""),
             "PASSWORD": config("DB_PASSWORD", default=""),
             "HOST": config("DB_HOST", default=""),
             "PORT": config("DB_PORT", default="5432"),
-            "OPTIONS": {"sslmode": "require"},
+            "CONN_MAX_AGE": 0 if DB_POOL else config("DB_CONN_MAX_AGE", default=60, cast=int),
+            # Check reused connections before use, so a dropped one is replaced instead of failing the request
+            "CONN_HEALTH_CHECKS": config("DB_CONN_HEALTH_CHECKS", default=True, cast=bool),
+            "OPTIONS": DB_OPTIONS,
         }
     }
+    # Streaming replicas of the primary, as host or host:port (same database and credentials)
+    DB_REPLICAS = [
+        {"HOST": host, "PORT": port or DATABASES["default"]["PORT"]}
+        for host, _, port in (entry.partition(":") for entry in config("DB_REPLICA_HOSTS", default="", cast=Csv()))
+    ]
 else:
     DATABASES = {
         "default": {
@@ -103,6 +134,19 @@ else:
             "NAME": BASE_DIR / "db.sqlite3",
         }
     }
+    # Local replica setups: copies of the SQLite file (e.g. refreshed with `sqlite3 db.sqlite3 ".backup replica.sqlite3"`)
+    DB_REPLICAS = [{"NAME": path} for path in config("SQLITE_REPLICA_PATHS", default="", cast=Csv())]
+
+# Read replicas: list, search and statistics reads and GraphQL queries go to
+# one of these (see config.db.routing); writes, and every read of a client for
+# DB_REPLICA_STICKY_SECONDS after it wrote, stay on the primary.
+for number, replica in enumerate(DB_REPLICAS, start=1):
+    DATABASES[f"replica_{number}"] = {**DATABASES["default"], **replica, "TEST": {"MIRROR": "default"}}
+
+DATABASE_REPLICAS = [f"replica_{number}" for number in range(1, len(DB_REPLICAS) + 1)]
+DATABASE_ROUTERS = ["config.db.routing.PrimaryReplicaRouter"]
+DATABASE_REPLICA_STICKY_SECONDS = config("DB_REPLICA_STICKY_SECONDS", default=5, cast=int)
+DATABASE_REPLICA_STICKY_COOKIE = "db_primary_until"
 
 
 # Password validation
@@ -154,6 +198,42 @@ STATICFILES_DIRS = [
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Keyset pagination for list endpoints and GraphQL connections
+DEFAULT_PAGE_SIZE = config("DEFAULT_PAGE_SIZE", default=100, cast=int)
+MAX_PAGE_SIZE = config("MAX_PAGE_SIZE", default=1000, cast=int)
+
+# Rows fetched per server-side cursor round trip when streaming exports
+EXPORT_CHUNK_SIZE = config("EXPORT_CHUNK_SIZE", default=2000, cast=int)
+
+# Bulk write endpoints: items accepted per request and rows per INSERT/UPDATE batch
+BULK_MAX_ITEMS = config("BULK_MAX_ITEMS", default=10000, cast=int)
+BULK_BATCH_SIZE = config("BULK_BATCH_SIZE", default=1000, cast=int)
+BULK_MAX_BODY_SIZE = config("BULK_MAX_BODY_SIZE", default=64 * 1024 * 1024, cast=int)
+
+# Async comment ingestion (taskComment.ingest): the background writer flushes
+# after QUEUE_FLUSH_SIZE pending comments or QUEUE_FLUSH_INTERVAL seconds, and
+# callers flush themselves once QUEUE_MAX_PENDING are waiting. While a failed
+# batch waits for its retry, async requests are answered with 503.
+COMMENT_INGEST = {
+    "QUEUE_FLUSH_SIZE": config("COMMENT_INGEST_FLUSH_SIZE", default=1000, cast=int),
+    "QUEUE_FLUSH_INTERVAL": config("COMMENT_INGEST_FLUSH_INTERVAL", default=1.0, cast=float),
+    "QUEUE_MAX_PENDING": config("COMMENT_INGEST_MAX_PENDING", default=20000, cast=int),
+    # A failed batch is retried after RETRY_BACKOFF seconds, doubling up to
+    # RETRY_BACKOFF_MAX, then appended to DEAD_LETTER_PATH (JSON lines, under
+    # DATA_DIR unless set; missing directories are created)
+    "MAX_RETRIES": config("COMMENT_INGEST_MAX_RETRIES", default=5, cast=int),
+    "RETRY_BACKOFF": config("COMMENT_INGEST_RETRY_BACKOFF", default=1.0, cast=float),
+    "RETRY_BACKOFF_MAX": 30.0,
+    "DEAD_LETTER_PATH": config("COMMENT_INGEST_DEAD_LETTER_PATH", default=str(DATA_DIR / "comment_ingest_dead_letter.jsonl")),
+}
+
+# Ranked search results (config.search): default and maximum result count
+SEARCH_DEFAULT_LIMIT = config("SEARCH_DEFAULT_LIMIT", default=20, cast=int)
+SEARCH_MAX_LIMIT = config("SEARCH_MAX_LIMIT", default=100, cast=int)
+
+# JSON encoder for REST and GraphQL responses: "auto", "orjson" or "stdlib"
+JSON_ENCODER = config("JSON_ENCODER", default="auto")
+
 # CORS Configuration - Allow all origins (disable CORS errors)
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
@@ -167,7 +247,9 @@ CORS_ALLOWED_HEADERS = [
     "user-agent",
     "x-csrftoken",
     "x-requested-with",
+    "x-graphql-metrics",
 ]
+CORS_EXPOSE_HEADERS = ["etag"]
 CORS_ALLOW_METHODS = [
     "DELETE",
     "GET",
@@ -183,11 +265,103 @@ CSRF_TRUSTED_ORIGINS = [
     "https://heavily-beloved-fawn.ngrok-free.app"
 ]
 
+# Cache backends. locmem is per process; point CACHE_BACKEND/CACHE_LOCATION
+# at a shared backend (Redis, Memcached, database) when running several
+# workers: `serve` turns the read cache off (with a warning) when several
+# workers would each get their own locmem cache (see gunicorn.conf.py).
+CACHES = {
+    "default": {
+        "BACKEND": config("CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": config("CACHE_LOCATION", default="taskflow"),
+    }
+}
+
+# Tenant-scoped read cache used by the service classes (config.read_cache).
+# Entries are versioned per organization and invalidated by model signals.
+# Expired entries are served for STALE_TIMEOUT more seconds while a single
+# caller (holding a LOCK_TIMEOUT lock) recomputes them; EARLY_REFRESH_BETA > 1
+# favours refreshing earlier, 0 disables early refresh.
+READ_CACHE = {
+    "ENABLED": config("READ_CACHE_ENABLED", default=True, cast=bool),
+    "ALIAS": "default",
+    "TIMEOUT": config("READ_CACHE_TIMEOUT", default=300, cast=int),
+    "STALE_TIMEOUT": config("READ_CACHE_STALE_TIMEOUT", default=60, cast=int),
+    "LOCK_TIMEOUT": 10,
+    "WAIT_INTERVAL": 0.05,
+    "EARLY_REFRESH_BETA": 1.0,
+}
+
 # GraphQL Configuration
 GRAPHENE = {
     "SCHEMA": "config.schema.schema",
     "SCHEMA_OUTPUT": "schema.json", 
     "MIDDLEWARE": [
-        "graphene_django.debug.DjangoDebugMiddleware",
+        "config.instrumentation.ResolverTimingMiddleware",
+        "config.loaders.DataLoaderMiddleware",
     ],
 }
+
+# DjangoDebugMiddleware wraps every cursor, so only enable it for local debugging
+if DEBUG:
+    GRAPHENE["MIDDLEWARE"].insert(0, "graphene_django.debug.DjangoDebugMiddleware")
+
+# Per-operation GraphQL metrics (query count, DB time, resolver timings).
+# Returned in response extensions and logged to "graphql.metrics" when the
+# request sends the GRAPHQL_METRICS_HEADER header. Without it, operations are
+# logged only when GRAPHQL_METRICS_ENABLED and either slower than
+# GRAPHQL_METRICS_SLOW_MS (0 disables) or picked by GRAPHQL_METRICS_SAMPLE_RATE.
+GRAPHQL_METRICS_ENABLED = config("GRAPHQL_METRICS_ENABLED", default=True, cast=bool)
+GRAPHQL_METRICS_SLOW_MS = config("GRAPHQL_METRICS_SLOW_MS", default=0, cast=int)
+GRAPHQL_METRICS_SAMPLE_RATE = config("GRAPHQL_METRICS_SAMPLE_RATE", default=0.0, cast=float)
+GRAPHQL_METRICS_HEADER = "X-GraphQL-Metrics"
+GRAPHQL_METRICS_MAX_RESOLVERS = 50
+
+# Parsed-and-validated GraphQL documents kept in memory per worker process
+GRAPHQL_DOCUMENT_CACHE_SIZE = config("GRAPHQL_DOCUMENT_CACHE_SIZE", default=512, cast=int)
+
+# Automatic persisted queries. Documents registered with `manage.py
+# register_persisted_queries` are stored in the PersistedQuery table and looked
+# up through this cache alias; GRAPHQL_PERSISTED_QUERIES_ONLY rejects any other
+# document. Documents clients send (POST, valid, at most MAX_LENGTH characters)
+# are only kept in the cache, for TIMEOUT seconds. Successful GET requests by
+# hash are cacheable by browsers and CDNs for GRAPHQL_PERSISTED_QUERY_MAX_AGE
+# seconds (0 disables).
+GRAPHQL_PERSISTED_QUERY_CACHE = "default"
+GRAPHQL_PERSISTED_QUERY_TIMEOUT = config("GRAPHQL_PERSISTED_QUERY_TIMEOUT", default=86400, cast=int)
+GRAPHQL_PERSISTED_QUERY_MAX_LENGTH = config("GRAPHQL_PERSISTED_QUERY_MAX_LENGTH", default=10000, cast=int)
+GRAPHQL_PERSISTED_QUERY_MAX_AGE = config("GRAPHQL_PERSISTED_QUERY_MAX_AGE", default=30, cast=int)
+GRAPHQL_PERSISTED_QUERIES_ONLY = config("GRAPHQL_PERSISTED_QUERIES_ONLY", default=False, cast=bool)
+
+# Static cost analysis run before every GraphQL operation (config.query_cost).
+# Object fields cost 1 and scalars 0 unless overridden in FIELD_COSTS; list
+# children are multiplied by `first`/`limit` or DEFAULT_LIST_SIZE. Project
+# task counters are stored columns, so only comment lookups are priced.
+# COST_PER_MINUTE (0 disables) throttles each client address via CACHE.
+GRAPHQL_COST = {
+    "MAX_COST": config("GRAPHQL_MAX_QUERY_COST", default=5000, cast=int),
+    "MAX_DEPTH": config("GRAPHQL_MAX_QUERY_DEPTH", default=8, cast=int),
+    "DEFAULT_LIST_SIZE": 50,
+    "FIELD_COSTS": {
+        "TaskType.commentCount": 1,
+        "TaskType.comments": 2,
+    },
+    "COST_PER_MINUTE": config("GRAPHQL_COST_PER_MINUTE", default=0, cast=int),
+    "CACHE": "default",
+    # Proxies whose X-Forwarded-For is believed when identifying the client
+    "TRUSTED_PROXIES": config("GRAPHQL_TRUSTED_PROXIES", default="", cast=Csv()),
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "graphql.metrics": {
+            "handlers": ["console"],
+            "level": config("GRAPHQL_METRICS_LOG_LEVEL", default="INFO"),
+            "propagate": False,
+        },
+    },
+}
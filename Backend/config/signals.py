@@ -0,0 +1,73 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from config.read_cache import (
+    ALL_SCOPE,
+    ORGANIZATIONS_SCOPE,
+    invalidate,
+    invalidate_organizations,
+    organization_for_project,
+    organization_scope,
+    project_for_task,
+    set_project_organization,
+    set_task_project,
+)
+from organization.models import Organization
+from project.models import Project
+from task.models import Task
+from taskComment.models import TaskComment
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+def invalidate_organization(sender, instance, **kwargs):
+    invalidate(organization_scope(instance.pk), ORGANIZATIONS_SCOPE, ALL_SCOPE)
+
+
+@receiver(pre_save, sender=Project)
+def remember_project_organization(sender, instance, **kwargs):
+    """Record the stored organization so moving a project invalidates both tenants."""
+    if instance.pk and not instance._state.adding:
+        instance._previous_organization_id = organization_for_project(instance.pk)
+
+
+@receiver(post_save, sender=Project)
+def invalidate_saved_project(sender, instance, **kwargs):
+    set_project_organization(instance.pk, instance.organization_id)
+    invalidate_organizations(instance.organization_id, getattr(instance, '_previous_organization_id', None))
+
+
+@receiver(post_delete, sender=Project)
+def invalidate_deleted_project(sender, instance, **kwargs):
+    set_project_organization(instance.pk, None)
+    invalidate_organizations(instance.organization_id)
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_project(sender, instance, **kwargs):
+    """Record the stored project so moving a task invalidates its previous tenant."""
+    if instance.pk and not instance._state.adding:
+        instance._previous_project_id = project_for_task(instance.pk)
+
+
+@receiver(post_save, sender=Task)
+def invalidate_saved_task(sender, instance, **kwargs):
+    set_task_project(instance.pk, instance.project_id)
+    previous_project_id = getattr(instance, '_previous_project_id', None)
+    invalidate_organizations(
+        organization_for_project(instance.project_id),
+        organization_for_project(previous_project_id) if previous_project_id not in (None, instance.project_id) else None,
+    )
+
+
+@receiver(post_delete, sender=Task)
+def invalidate_deleted_task(sender, instance, **kwargs):
+    set_task_project(instance.pk, None)
+    invalidate_organizations(organization_for_project(instance.project_id))
+
+
+@receiver(post_save, sender=TaskComment)
+@receiver(post_delete, sender=TaskComment)
+def invalidate_task_comment(sender, instance, **kwargs):
+    project_id = project_for_task(instance.task_id)
+    invalidate_organizations(organization_for_project(project_id) if project_id is not None else None)
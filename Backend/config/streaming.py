@@ -0,0 +1,84 @@
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import StreamingHttpResponse
+
+from config.responses import json_dumps
+
+# Values accepted by the ?format= query parameter of exportable list views
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'json-stream': 'application/json',
+}
+
+
+def get_stream_format(request) -> Optional[str]:
+    """
+    Return the requested streaming format, or None for a regular paginated response.
+
+    Raises:
+        ValidationError: If an unknown format is requested
+    """
+    export_format = request.GET.get('format', '').strip()
+    if not export_format or export_format == 'json':
+        return None
+    if export_format not in STREAM_FORMATS:
+        raise ValidationError({
+            'format': f'Format must be one of: json, {", ".join(STREAM_FORMATS)}.'
+        })
+    return export_format
+
+
+def _chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[list]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _encode(chunk: list) -> list[bytes]:
+    return [json_dumps(row) for row in chunk]
+
+
+def _ndjson(rows, formatter, chunk_size) -> Iterator[bytes]:
+    for chunk in _chunks(rows, chunk_size):
+        yield b'\n'.join(_encode(formatter(chunk))) + b'\n'
+
+
+def _json_array(rows, formatter, chunk_size) -> Iterator[bytes]:
+    yield b'['
+    separator = b''
+    for chunk in _chunks(rows, chunk_size):
+        yield separator + b','.join(_encode(formatter(chunk)))
+        separator = b','
+    yield b']'
+
+
+def stream_rows(
+    rows: Iterable[Dict[str, Any]],
+    export_format: str,
+    formatter: Callable[[list], list],
+    chunk_size: Optional[int] = None
+) -> StreamingHttpResponse:
+    """
+    Stream value rows as NDJSON or as a single JSON array.
+
+    Rows are pulled and formatted chunk_size at a time, so memory use stays
+    flat no matter how many rows the underlying iterator yields.
+
+    Args:
+        rows: Iterator of dictionaries, typically QuerySet.values().iterator()
+        export_format: One of STREAM_FORMATS
+        formatter: Callable that formats a list of rows in place (e.g. values_to_list_dict)
+        chunk_size: Rows per encoded chunk (defaults to EXPORT_CHUNK_SIZE)
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    if export_format == 'ndjson':
+        content = _ndjson(rows, formatter, chunk_size)
+    else:
+        content = _json_array(rows, formatter, chunk_size)
+    return StreamingHttpResponse(content, content_type=STREAM_FORMATS[export_format])
@@ -0,0 +1,606 @@
+import datetime
+import hashlib
+import importlib.util
+import json
+import os
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.db import DatabaseCache
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.management import call_command
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from graphql import validate
+
+from config.db import pool_stats
+from config.db.routing import ReplicaRoutingMiddleware, primary_reads, replica_reads, request_routing
+from config.document_cache import DocumentCache, document_cache
+from config.models import PersistedQuery
+from config.pagination import clean_limit, decode_cursor, encode_cursor, paginate
+from config.persisted_queries import get_persisted_query
+from config.read_cache import cached, check_shared_cache
+from config.responses import JsonResponse, get_encoder_name, json_dumps
+from config.schema import schema as graphql_schema
+from config.search import encode_offset_cursor
+from organization.models import Organization
+from organization.serializers import OrganizationSerializer
+from project.models import Project
+from project.serializers import ProjectSerializer
+from task.models import Task
+from task.serializers import TaskSerializer
+from taskComment.models import TaskComment
+from taskComment.serializers import TaskCommentSerializer
+
+
+class DocumentCacheTests(TestCase):
+    """GraphQL documents are parsed and validated once per distinct query text."""
+
+    def setUp(self):
+        self.schema = graphql_schema.graphql_schema
+
+    def test_lru_entries_and_counters(self):
+        documents = DocumentCache(maxsize=2)
+        first, errors = documents.get(self.schema, '{ __typename }')
+        self.assertIsNone(errors)
+        self.assertIs(documents.get(self.schema, '{ __typename }')[0], first)
+        documents.get(self.schema, '{ a: __typename }')
+        documents.get(self.schema, '{ __typename }')  # most recently used
+        documents.get(self.schema, '{ b: __typename }')  # evicts the 'a' query
+        self.assertEqual(documents.stats()['size'], 2)
+        self.assertIs(documents.get(self.schema, '{ __typename }')[0], first)
+        self.assertEqual((documents.stats()['hits'], documents.stats()['misses']), (3, 3))
+
+    def test_errors_are_cached(self):
+        documents = DocumentCache(maxsize=8)
+        for query in ('{ noSuchField }', '{ unclosed'):
+            with mock.patch('config.document_cache.validate', wraps=validate) as validate_calls:
+                for _ in range(2):
+                    document, errors = documents.get(self.schema, query)
+                    self.assertIsNone(document)
+                    self.assertTrue(errors)
+            self.assertLessEqual(validate_calls.call_count, 1)
+
+    def test_view_reuses_documents(self):
+        document_cache.clear()
+        with mock.patch('config.document_cache.validate', wraps=validate) as validate_calls:
+            for _ in range(3):
+                response = self.client.post('/graphql/', {'query': '{ organizations { id } }'},
+                                            content_type='application/json')
+                self.assertEqual(response.status_code, 200)
+            response = self.client.post('/graphql/', {'query': '{ noSuchField }'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(validate_calls.call_count, 2)
+
+    def test_get_cannot_run_mutations(self):
+        response = self.client.get('/graphql/', {'query': 'mutation { deleteOrganization(organizationId: 1) { success } }'},
+                                   HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 405)
+
+
+class PersistedQueryTests(TestCase):
+    """Registered documents live in the database and are served by hash."""
+
+    QUERY = '{ __typename }'
+
+    def setUp(self):
+        cache.clear()
+        self.sha256 = hashlib.sha256(self.QUERY.encode()).hexdigest()
+
+    def get(self, sha256):
+        extensions = json.dumps({'persistedQuery': {'version': 1, 'sha256Hash': sha256}})
+        return self.client.get('/graphql/', {'extensions': extensions})
+
+    def register(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / 'typename.graphql'
+        path.write_text(self.QUERY)
+        call_command('register_persisted_queries', str(path), stdout=StringIO())
+
+    def test_registered_query_survives_the_cache(self):
+        self.register()
+        cache.clear()  # another worker, or the command's own process-local cache
+        with override_settings(GRAPHQL_PERSISTED_QUERIES_ONLY=True):
+            response = self.get(self.sha256)
+            self.assertEqual(response.json()['data'], {'__typename': 'Query'})
+            rejected = self.client.post('/graphql/', {'query': '{ __schema { queryType { name } } }'},
+                                        content_type='application/json')
+        self.assertEqual(rejected.json()['errors'][0]['extensions']['code'], 'PERSISTED_QUERY_REQUIRED')
+        self.assertTrue(PersistedQuery.objects.filter(sha256=self.sha256).exists())
+
+    def test_get_by_hash_is_cacheable(self):
+        self.register()
+        response = self.get(self.sha256)
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn(f'max-age={settings.GRAPHQL_PERSISTED_QUERY_MAX_AGE}', response['Cache-Control'])
+        self.assertIn('Accept', response['Vary'])
+
+    def test_automatic_registration(self):
+        self.assertEqual(self.get(self.sha256).json()['errors'][0]['extensions']['code'], 'PERSISTED_QUERY_NOT_FOUND')
+        extensions = {'persistedQuery': {'version': 1, 'sha256Hash': self.sha256}}
+        response = self.client.post('/graphql/', {'query': self.QUERY, 'extensions': extensions},
+                                    content_type='application/json')
+        self.assertEqual(response.json()['data'], {'__typename': 'Query'})
+        self.assertEqual(self.get(self.sha256).json()['data'], {'__typename': 'Query'})
+        # Client registrations only live in the cache
+        self.assertFalse(PersistedQuery.objects.exists())
+
+    def test_only_valid_bounded_posts_are_remembered(self):
+        def send(query, method='post'):
+            sha256 = hashlib.sha256(query.encode()).hexdigest()
+            extensions = {'persistedQuery': {'version': 1, 'sha256Hash': sha256}}
+            if method == 'post':
+                self.client.post('/graphql/', {'query': query, 'extensions': extensions},
+                                 content_type='application/json')
+            else:
+                self.client.get('/graphql/', {'query': query, 'extensions': json.dumps(extensions)})
+            return get_persisted_query(sha256)
+
+        self.assertIsNone(send('{ noSuchField }'))
+        self.assertIsNone(send(self.QUERY, method='get'))
+        with override_settings(GRAPHQL_PERSISTED_QUERY_MAX_LENGTH=len(self.QUERY) - 1):
+            self.assertIsNone(send(self.QUERY))
+        with mock.patch('config.persisted_queries.caches') as caches:
+            caches.__getitem__.return_value.get.return_value = None
+            send(self.QUERY)
+        caches.__getitem__.return_value.set.assert_called_once_with(
+            'graphql:apq:' + self.sha256, self.QUERY, timeout=settings.GRAPHQL_PERSISTED_QUERY_TIMEOUT)
+        self.assertEqual(send(self.QUERY), self.QUERY)
+
+    def test_invalid_requests(self):
+        cases = [
+            ({'version': 1, 'sha256Hash': '0' * 64}, self.QUERY, 'BAD_REQUEST'),
+            ({'version': 2, 'sha256Hash': self.sha256}, None, 'PERSISTED_QUERY_NOT_SUPPORTED'),
+            ({'version': 1}, None, 'BAD_REQUEST'),
+        ]
+        for persisted, query, code in cases:
+            with self.subTest(code=code, persisted=persisted):
+                body = {'extensions': {'persistedQuery': persisted}}
+                if query:
+                    body['query'] = query
+                response = self.client.post('/graphql/', body, content_type='application/json')
+                self.assertEqual(response.json()['errors'][0]['extensions']['code'], code)
+        self.assertFalse(PersistedQuery.objects.exists())
+
+    @override_settings(GRAPHQL_PERSISTED_QUERIES_ONLY=True)
+    def test_locked_mode_does_not_register_from_requests(self):
+        extensions = {'persistedQuery': {'version': 1, 'sha256Hash': self.sha256}}
+        response = self.client.post('/graphql/', {'query': self.QUERY, 'extensions': extensions},
+                                    content_type='application/json')
+        self.assertEqual(response.json()['errors'][0]['extensions']['code'], 'PERSISTED_QUERY_NOT_ALLOWED')
+        self.assertFalse(PersistedQuery.objects.exists())
+
+    def test_errors_are_not_stored(self):
+        response = self.get('0' * 64)
+        self.assertEqual(response.json()['errors'][0]['extensions']['code'], 'PERSISTED_QUERY_NOT_FOUND')
+        self.assertEqual(response['Cache-Control'], 'no-store')
+
+
+class JsonEncoderTests(SimpleTestCase):
+    """orjson and the stdlib encoder produce the same documents; JSON_ENCODER picks one."""
+
+    DATA = {
+        'text': 'caf\u00e9 \u2713', 'int': 7, 'float': 0.5, 'none': None, 'list': [True, False],
+        'decimal': Decimal('12.50'), 'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'lazy': gettext_lazy('Validation failed.'), 'date': datetime.date(2030, 1, 31),
+        'datetime': datetime.datetime(2030, 1, 31, 12, 30, tzinfo=datetime.timezone.utc),
+    }
+
+    def dumps(self, encoder):
+        with override_settings(JSON_ENCODER=encoder):
+            return json.loads(json_dumps(self.DATA))
+
+    def test_encoders_agree(self):
+        fast, stdlib = self.dumps('orjson'), self.dumps('stdlib')
+        # The stdlib (DjangoJSONEncoder) spells UTC as Z
+        for data in (fast, stdlib):
+            data['datetime'] = datetime.datetime.fromisoformat(data['datetime'].replace('Z', '+00:00'))
+        self.assertEqual(fast, stdlib)
+        self.assertEqual(fast['decimal'], '12.50')
+        self.assertEqual(fast['date'], '2030-01-31')
+
+    def test_encoder_selection(self):
+        with override_settings(JSON_ENCODER='auto'):
+            self.assertEqual(get_encoder_name(), 'orjson')
+            with mock.patch('config.responses.orjson', None):
+                self.assertEqual(get_encoder_name(), 'stdlib')
+        with override_settings(JSON_ENCODER='orjson'), mock.patch('config.responses.orjson', None):
+            with self.assertRaises(ImportError):
+                get_encoder_name()
+
+    def test_json_response(self):
+        response = JsonResponse({'success': True, 'data': [1]})
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content), {'success': True, 'data': [1]})
+        with self.assertRaises(TypeError):
+            JsonResponse([1])
+
+
+class EntrypointTests(SimpleTestCase):
+    """entrypoint.sh dispatches serve/migrate/dev/other commands; serve never migrates by default."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.bin = Path(directory.name)
+        for name in ('gunicorn', 'python', 'echo-args'):
+            stub = self.bin / name
+            stub.write_text(f'#!/bin/sh\necho "{name} $*"\n')
+            stub.chmod(0o755)
+
+    def run_entrypoint(self, *args, **env):
+        result = subprocess.run(
+            ['sh', str(settings.BASE_DIR / 'entrypoint.sh'), *args],
+            env={'PATH': f"{self.bin}:{os.environ['PATH']}", **env},
+            capture_output=True, text=True, check=True,
+        )
+        return result.stdout.splitlines()
+
+    def test_serve_is_the_default(self):
+        self.assertEqual(self.run_entrypoint(), ['gunicorn config.wsgi:application'])
+        self.assertEqual(self.run_entrypoint('serve', '--workers', '2'), ['gunicorn config.wsgi:application --workers 2'])
+        self.assertEqual(self.run_entrypoint(SERVER_APP='config.asgi:application'), ['gunicorn config.asgi:application'])
+
+    def test_migrate_on_start(self):
+        self.assertEqual(self.run_entrypoint('serve', MIGRATE_ON_START='true'),
+                         ['python manage.py migrate --noinput', 'gunicorn config.wsgi:application'])
+
+    def test_other_commands(self):
+        self.assertEqual(self.run_entrypoint('migrate'), ['python manage.py migrate --noinput'])
+        self.assertEqual(self.run_entrypoint('dev', PORT='9000'), ['python manage.py runserver 0.0.0.0:9000'])
+        self.assertEqual(self.run_entrypoint('echo-args', 'a', 'b'), ['echo-args a b'])
+
+
+class ValuesSerializationTests(TestCase):
+    """List rows read with values() serialize exactly like the model instances."""
+
+    def test_values_rows_match_to_dict(self):
+        organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        project = Project.objects.create(organization=organization, name='Launch', status='active',
+                                         due_date=datetime.date(2030, 1, 31))
+        task = Task.objects.create(project=project, title='Kickoff', status='todo', assignee_email='dev@acme.com')
+        Task.objects.create(project=project, title='Unassigned', status='done')
+        TaskComment.objects.create(task=task, content='Note', author_email='dev@acme.com')
+
+        for model, serializer in ((Organization, OrganizationSerializer), (Project, ProjectSerializer),
+                                  (Task, TaskSerializer), (TaskComment, TaskCommentSerializer)):
+            with self.subTest(model=model.__name__):
+                expected = [
+                    {name: serializer.to_dict(instance)[name] for name in serializer.LIST_FIELDS}
+                    for instance in model.objects.order_by('id')
+                ]
+                rows = list(model.objects.order_by('id').values(*serializer.LIST_FIELDS))
+                self.assertEqual(serializer.values_to_list_dict(rows), expected)
+
+
+class KeysetPaginationTests(TestCase):
+    """Cursors are opaque, limits are validated, and pages walk the list exactly once."""
+
+    def setUp(self):
+        organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        self.project = Project.objects.create(organization=organization, name='Launch', status='active')
+        tasks = [Task(project=self.project, title=f'Task {i}', status='todo') for i in range(7)]
+        Task.objects.bulk_create(tasks)
+        # Equal timestamps: the id tiebreaker must keep pages from skipping or repeating rows
+        Task.objects.update(created_at=timezone.now())
+
+    def test_cursor_round_trip(self):
+        value = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor(value, 42)), (value, 42))
+        for cursor in ('not a cursor', encode_offset_cursor(3)):
+            with self.assertRaises(ValidationError):
+                decode_cursor(cursor)
+
+    def test_limit_is_validated_and_clamped(self):
+        self.assertEqual(clean_limit(None), settings.DEFAULT_PAGE_SIZE)
+        self.assertEqual(clean_limit('5'), 5)
+        self.assertEqual(clean_limit(settings.MAX_PAGE_SIZE + 1), settings.MAX_PAGE_SIZE)
+        for limit in ('abc', 0, -1):
+            with self.assertRaises(ValidationError):
+                clean_limit(limit)
+
+    def test_pages_cover_every_row_once(self):
+        seen, after = [], None
+        while True:
+            page = paginate(Task.objects.all(), limit=3, after=after)
+            seen.extend(task.id for task in page.items)
+            if not page.has_next:
+                break
+            after = page.next_cursor
+        self.assertEqual(sorted(seen), sorted(Task.objects.values_list('id', flat=True)))
+        self.assertEqual(len(seen), 7)
+
+    def test_rest_list_pages(self):
+        url = f'/api/tasks/project/{self.project.id}/'
+        first = self.client.get(url, {'limit': 4}).json()
+        self.assertEqual((first['count'], first['has_next']), (4, True))
+        rest = self.client.get(url, {'limit': 4, 'after': first['next_cursor']}).json()
+        self.assertEqual((rest['count'], rest['has_next'], rest['next_cursor']), (3, False, None))
+        self.assertEqual(self.client.get(url, {'limit': 'abc'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'after': 'bogus'}).status_code, 400)
+
+    @override_settings(DEFAULT_PAGE_SIZE=5)
+    def test_rest_list_is_capped_at_the_default_page_size(self):
+        response = self.client.get(f'/api/tasks/project/{self.project.id}/').json()
+        self.assertEqual((response['count'], response['has_next']), (5, True))
+
+    def test_relay_page_info(self):
+        query = '''query($id: Int!, $after: String) {
+            tasksByProjectConnection(projectId: $id, first: 5, after: $after) {
+                edges { cursor node { id } }
+                pageInfo { hasNextPage hasPreviousPage startCursor endCursor }
+            }
+        }'''
+
+        def fetch(after=None):
+            response = self.client.post('/graphql/', {'query': query, 'variables': {'id': self.project.id, 'after': after}},
+                                        content_type='application/json')
+            return response.json()['data']['tasksByProjectConnection']
+
+        first = fetch()
+        info = first['pageInfo']
+        self.assertEqual((len(first['edges']), info['hasNextPage'], info['hasPreviousPage']), (5, True, False))
+        self.assertEqual((info['startCursor'], info['endCursor']), (first['edges'][0]['cursor'], first['edges'][-1]['cursor']))
+
+        second = fetch(info['endCursor'])
+        self.assertEqual((len(second['edges']), second['pageInfo']['hasNextPage'], second['pageInfo']['hasPreviousPage']),
+                         (2, False, True))
+        ids = {edge['node']['id'] for edge in first['edges'] + second['edges']}
+        self.assertEqual(len(ids), 7)
+
+
+class ReadCacheStampedeTests(SimpleTestCase):
+    """Concurrent readers of one key trigger a single recomputation."""
+
+    THREADS = 16
+
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+        self.calls_lock = threading.Lock()
+
+    def slow_compute(self, value):
+        def compute():
+            with self.calls_lock:
+                self.calls += 1
+            time.sleep(0.2)
+            return value
+        return compute
+
+    def run_concurrently(self, compute):
+        barrier = threading.Barrier(self.THREADS)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(cached('stampede', ['org:stampede'], 'totals', compute))
+
+        threads = [threading.Thread(target=worker) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_misses_wait_for_one_computation(self):
+        results = self.run_concurrently(self.slow_compute(42))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [42] * self.THREADS)
+
+    def test_expired_entry_is_served_stale_while_one_caller_refreshes(self):
+        with override_settings(READ_CACHE={**settings.READ_CACHE, 'TIMEOUT': 0}):
+            cached('stampede', ['org:stampede'], 'totals', lambda: 'old')
+            results = self.run_concurrently(self.slow_compute('new'))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results.count('new'), 1)
+        self.assertEqual(results.count('old'), self.THREADS - 1)
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    """Several workers never share a per-process read cache; the default configuration still boots."""
+
+    LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    REDIS = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://cache:6379'}}
+    ENV = ('WEB_CONCURRENCY', 'GUNICORN_THREADS', 'CACHE_BACKEND', 'CACHE_LOCATION', 'READ_CACHE_ENABLED')
+
+    def load_conf(self):
+        spec = importlib.util.spec_from_file_location('gunicorn_conf', settings.BASE_DIR / 'gunicorn.conf.py')
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def on_starting(self, module, workers):
+        server = SimpleNamespace(cfg=SimpleNamespace(workers=workers), log=mock.Mock())
+        module.on_starting(server)
+        return server
+
+    def test_default_configuration_boots_without_the_read_cache(self):
+        environ = {key: value for key, value in os.environ.items() if key not in self.ENV}
+        with mock.patch.dict(os.environ, environ, clear=True):
+            module = self.load_conf()
+        self.assertGreater(module.workers, 1)
+        # The settings defaults: locmem with the read cache enabled
+        with override_settings(CACHES=self.LOCMEM, READ_CACHE={**settings.READ_CACHE, 'ENABLED': True}):
+            server = self.on_starting(module, module.workers)
+            self.assertFalse(settings.READ_CACHE['ENABLED'])
+        server.log.warning.assert_called_once()
+        self.assertIn('Serving without the read cache', server.log.warning.call_args[0][0])
+
+    def test_single_worker_or_shared_backend_keeps_the_read_cache(self):
+        module = self.load_conf()
+        for caches, workers in ((self.LOCMEM, 1), (self.REDIS, 3)):
+            with self.subTest(backend=caches['default']['BACKEND'], workers=workers), \
+                    override_settings(CACHES=caches, READ_CACHE={**settings.READ_CACHE, 'ENABLED': True}):
+                server = self.on_starting(module, workers)
+                self.assertTrue(settings.READ_CACHE['ENABLED'])
+                server.log.warning.assert_not_called()
+
+    def test_check_shared_cache(self):
+        with override_settings(CACHES=self.LOCMEM, READ_CACHE={**settings.READ_CACHE, 'ENABLED': True}):
+            check_shared_cache(1)
+            with self.assertRaisesMessage(ImproperlyConfigured, 'READ_CACHE_ENABLED=false'):
+                check_shared_cache(3)
+        with override_settings(CACHES=self.REDIS):
+            check_shared_cache(3)
+
+
+class PooledBackendTests(SimpleTestCase):
+    """Pool configuration of config.db.postgresql (no server needed: pools open on first use)."""
+
+    def make_wrapper(self, pool=None, conn_max_age=0):
+        from config.db.postgresql.base import DatabaseWrapper
+
+        options = {'sslmode': 'disable'}
+        if pool is not None:
+            options['pool'] = pool
+        return DatabaseWrapper({
+            'ENGINE': 'config.db.postgresql', 'NAME': 'taskflow', 'USER': 'app', 'PASSWORD': '',
+            'HOST': 'localhost', 'PORT': '5432', 'OPTIONS': options, 'TIME_ZONE': None,
+            'CONN_MAX_AGE': conn_max_age, 'CONN_HEALTH_CHECKS': True, 'AUTOCOMMIT': True,
+            'ATOMIC_REQUESTS': False,
+        }, alias='pool-test')
+
+    def test_pool_is_built_lazily_from_options(self):
+        wrapper = self.make_wrapper(pool={'min_size': 1, 'max_size': 3})
+        self.addCleanup(wrapper.close_pool)
+        pool = wrapper.pool
+        self.assertTrue(pool.closed)
+        self.assertEqual((pool.min_size, pool.max_size), (1, 3))
+        self.assertNotIn('pool', pool.kwargs)
+        self.assertTrue(pool.kwargs['autocommit'])
+        self.assertIs(self.make_wrapper(pool=True).pool, pool)
+
+    def test_pool_is_rebuilt_when_database_name_changes(self):
+        wrapper = self.make_wrapper(pool=True)
+        self.addCleanup(wrapper.close_pool)
+        pool = wrapper.pool
+        wrapper.settings_dict['NAME'] = 'test_taskflow'
+        self.assertIsNot(wrapper.pool, pool)
+        self.assertEqual(wrapper.pool.kwargs['dbname'], 'test_taskflow')
+
+    def test_pool_requires_non_persistent_connections(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.make_wrapper(pool=True, conn_max_age=60).pool
+
+    def test_without_pool_option(self):
+        self.assertIsNone(self.make_wrapper().pool)
+        self.assertEqual(pool_stats(), {})
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'], DATABASE_REPLICA_STICKY_SECONDS=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    """Routing decisions only: querysets resolve their database without connecting."""
+
+    def test_reads_use_replica_only_when_hinted(self):
+        with request_routing():
+            self.assertEqual(Project.objects.all().db, 'default')
+            with replica_reads():
+                self.assertEqual(Project.objects.all().db, 'replica_1')
+                with primary_reads():
+                    self.assertEqual(Project.objects.all().db, 'default')
+
+    def test_write_pins_rest_of_request(self):
+        with request_routing() as state, replica_reads():
+            self.assertEqual(router.db_for_write(Project), 'default')
+            self.assertTrue(state.wrote)
+            self.assertEqual(Project.objects.all().db, 'default')
+
+    def test_infrastructure_models_stay_on_primary(self):
+        cache_entry = DatabaseCache('read_cache', {}).cache_model_class
+        with request_routing() as state, replica_reads():
+            for model in (cache_entry, PersistedQuery):
+                with self.subTest(app=model._meta.app_label):
+                    self.assertEqual(router.db_for_read(model), 'default')
+                    self.assertEqual(router.db_for_write(model), 'default')
+            self.assertFalse(state.wrote or state.pinned)
+            self.assertEqual(Project.objects.all().db, 'replica_1')
+
+    def test_cache_entries_are_built_from_primary(self):
+        cache.clear()
+        with request_routing(), replica_reads():
+            db = cached('routing', ['org:routing'], 'db', lambda: Project.objects.all().db)
+        self.assertEqual(db, 'default')
+
+    def test_client_stays_on_primary_after_writing(self):
+        def view(request):
+            with replica_reads():
+                if request.method == 'POST':
+                    router.db_for_write(Project)
+                if 'fill' in request.GET:
+                    router.db_for_write(DatabaseCache('read_cache', {}).cache_model_class)
+                return HttpResponse(Project.objects.all().db)
+
+        middleware = ReplicaRoutingMiddleware(view)
+        factory = RequestFactory()
+
+        response = middleware(factory.post('/'))
+        self.assertEqual(response.content, b'default')
+        cookie = response.cookies[settings.DATABASE_REPLICA_STICKY_COOKIE]
+        self.assertEqual(cookie['max-age'], 5)
+
+        sticky = factory.get('/')
+        sticky.COOKIES[cookie.key] = cookie.value
+        self.assertEqual(middleware(sticky).content, b'default')
+
+        cache_fill = middleware(factory.get('/', {'fill': 1}))
+        self.assertNotIn(settings.DATABASE_REPLICA_STICKY_COOKIE, cache_fill.cookies)
+        self.assertEqual(cache_fill.content, b'replica_1')
+
+        expired = factory.get('/')
+        expired.COOKIES[cookie.key] = str(time.time() - 1)
+        self.assertEqual(middleware(expired).content, b'replica_1')
+        self.assertEqual(middleware(factory.get('/')).content, b'replica_1')
+
+
+class GraphQLMetricsTests(TestCase):
+    """Per-operation metrics are opt-in per request, or logged by sampling/slow threshold."""
+
+    QUERY = '{ projectsByOrganization(organizationId: %d) { id name taskCount } }'
+
+    def setUp(self):
+        cache.clear()
+        organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        for i in range(3):
+            Project.objects.create(organization=organization, name=f'Project {i}', status='active')
+        self.query = self.QUERY % organization.id
+
+    def post(self, **headers):
+        return self.client.post('/graphql/', {'query': self.query}, content_type='application/json', **headers)
+
+    def test_header_returns_and_logs_metrics(self):
+        with self.assertLogs('graphql.metrics', 'INFO') as logs:
+            response = self.post(HTTP_X_GRAPHQL_METRICS='1')
+        metrics = response.json()['extensions']['metrics']
+        self.assertEqual(metrics['query_count'], 1)
+        self.assertGreater(metrics['db_time_ms'], 0)
+        self.assertEqual(metrics['resolvers']['Query.projectsByOrganization']['calls'], 1)
+        self.assertEqual(metrics['resolvers']['ProjectType.name']['calls'], 3)
+        self.assertEqual(len(logs.records), 1)
+
+    def test_no_header_no_metrics(self):
+        with self.assertNoLogs('graphql.metrics', 'INFO'):
+            response = self.post()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('metrics', response.json().get('extensions', {}))
+
+    @override_settings(GRAPHQL_METRICS_SLOW_MS=60000)
+    def test_only_slow_operations_are_logged(self):
+        with self.assertNoLogs('graphql.metrics', 'INFO'):
+            self.post()
+        with override_settings(GRAPHQL_METRICS_SLOW_MS=0, GRAPHQL_METRICS_SAMPLE_RATE=1.0):
+            with self.assertLogs('graphql.metrics', 'INFO'):
+                self.post()
@@ -18,7 +18,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include, re_path
 from django.views.decorators.csrf import csrf_exempt
-from graphene_django.views import GraphQLView
+from config.views import GraphQLView
 from django.views.generic import TemplateView
 
 urlpatterns = [
@@ -0,0 +1,204 @@
+import random
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.http import HttpResponseNotAllowed
+from django.http.response import HttpResponseBadRequest
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from graphene_django.constants import MUTATION_ERRORS_FLAG
+from graphene_django.settings import graphene_settings
+from graphene_django.views import GraphQLView as BaseGraphQLView, HttpError
+from graphql import OperationType, execute_sync, get_operation_ast
+from graphql.execution import ExecutionResult
+
+from config.db.routing import replica_reads
+from config.document_cache import document_cache
+from config.instrumentation import OperationMetrics
+from config.persisted_queries import PersistedQueryError, resolve_persisted_query
+from config.query_cost import QueryCostError, check_query_cost
+from config.read_cache import metrics as read_cache_metrics
+from config.responses import json_dumps
+
+
+class GraphQLView(BaseGraphQLView):
+    """
+    GraphQL endpoint with the shared JSON encoder, a parsed-document cache
+    and per-operation metrics.
+
+    Documents are parsed and validated once per distinct query text and then
+    served from config.document_cache. Automatic persisted queries are
+    resolved first (see config.persisted_queries); successful GET requests by
+    hash are publicly cacheable for GRAPHQL_PERSISTED_QUERY_MAX_AGE seconds,
+    failed ones are no-store. Every operation is costed and checked against
+    GRAPHQL_COST before it runs (see config.query_cost); the cost is reported
+    under "extensions". Metrics are
+    returned under "extensions" and logged when the request carries the header
+    named by GRAPHQL_METRICS_HEADER; otherwise only operations slower than
+    GRAPHQL_METRICS_SLOW_MS, or a GRAPHQL_METRICS_SAMPLE_RATE sample, are logged.
+    """
+
+    def execute_graphql_request(self, request, data, query, variables, operation_name, show_graphiql=False):
+        requested = bool(request.headers.get(settings.GRAPHQL_METRICS_HEADER))
+        if not query or not (requested or self.metrics_sampled()):
+            return self.execute_document(
+                request, query, variables, operation_name, show_graphiql
+            )
+
+        metrics = OperationMetrics(operation_name)
+        request._graphql_metrics = metrics
+        with ExitStack() as stack:
+            # Queries may read from a replica; count statements on every database
+            for alias in (DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS):
+                stack.enter_context(connections[alias].execute_wrapper(metrics))
+            result = self.execute_document(
+                request, query, variables, operation_name, show_graphiql
+            )
+        metrics.finish()
+        slow_ms = settings.GRAPHQL_METRICS_SLOW_MS
+        if requested or not slow_ms or metrics.duration * 1000 >= slow_ms:
+            metrics.log()
+
+        if requested:
+            extensions = self.get_extensions(request)
+            extensions['metrics'] = metrics.as_dict()
+            extensions['document_cache'] = document_cache.stats()
+            extensions['read_cache'] = read_cache_metrics.stats()
+        return result
+
+    def execute_document(self, request, query, variables, operation_name, show_graphiql=False):
+        """
+        Execute a query using the cached parsed-and-validated document.
+
+        Mirrors graphene-django's execute_graphql_request, minus the per-call
+        parse and validate.
+        """
+        if not query:
+            if show_graphiql:
+                return None
+            raise HttpError(HttpResponseBadRequest("Must provide query string."))
+
+        document, errors = document_cache.get(self.schema.graphql_schema, query)
+        if errors:
+            return ExecutionResult(data=None, errors=errors)
+
+        operation_ast = get_operation_ast(document, operation_name)
+        if request.method.lower() == "get":
+            if operation_ast and operation_ast.operation != OperationType.QUERY:
+                if show_graphiql:
+                    return None
+                raise HttpError(
+                    HttpResponseNotAllowed(
+                        ["POST"],
+                        "Can only perform a {} operation from a POST request.".format(
+                            operation_ast.operation.value
+                        ),
+                    )
+                )
+
+        try:
+            cost = check_query_cost(
+                request, self.schema.graphql_schema, document, operation_name, variables
+            )
+        except QueryCostError as e:
+            return ExecutionResult(data=None, errors=[e])
+        if cost is not None:
+            self.get_extensions(request)['cost'] = cost.as_dict()
+
+        try:
+            options = {
+                "schema": self.schema.graphql_schema,
+                "document": document,
+                "root_value": self.get_root_value(request),
+                "variable_values": variables,
+                "operation_name": operation_name,
+                "context_value": self.get_context(request),
+                "middleware": self.get_middleware(request),
+            }
+            if self.execution_context_class:
+                options["execution_context_class"] = self.execution_context_class
+
+            if (
+                operation_ast
+                and operation_ast.operation == OperationType.MUTATION
+                and (
+                    graphene_settings.ATOMIC_MUTATIONS is True
+                    or connection.settings_dict.get("ATOMIC_MUTATIONS", False) is True
+                )
+            ):
+                with transaction.atomic():
+                    result = execute_sync(**options)
+                    if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
+                        transaction.set_rollback(True)
+                return result
+
+            if operation_ast and operation_ast.operation == OperationType.QUERY:
+                with replica_reads():
+                    return execute_sync(**options)
+            return execute_sync(**options)
+        except Exception as e:
+            return ExecutionResult(errors=[e])
+
+    @staticmethod
+    def metrics_sampled() -> bool:
+        """
+        Whether to measure an operation the client did not ask metrics for:
+        all of them when GRAPHQL_METRICS_SLOW_MS is set (only slow ones are
+        logged), otherwise a GRAPHQL_METRICS_SAMPLE_RATE fraction.
+        """
+        if not settings.GRAPHQL_METRICS_ENABLED:
+            return False
+        if settings.GRAPHQL_METRICS_SLOW_MS:
+            return True
+        rate = settings.GRAPHQL_METRICS_SAMPLE_RATE
+        return rate > 0 and random.random() < rate
+
+    @staticmethod
+    def get_extensions(request):
+        """Return the response extensions collected for this request."""
+        extensions = getattr(request, '_graphql_extensions', None)
+        if extensions is None:
+            extensions = request._graphql_extensions = {}
+        return extensions
+
+    def dispatch(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        cache_control = request.__dict__.pop('_graphql_cache_control', None)
+        if request.method != 'GET' or cache_control is None:
+            return response
+        if cache_control == 'public' and settings.GRAPHQL_PERSISTED_QUERY_MAX_AGE:
+            patch_cache_control(response, public=True, max_age=settings.GRAPHQL_PERSISTED_QUERY_MAX_AGE)
+            patch_vary_headers(response, ('Accept', settings.GRAPHQL_METRICS_HEADER))
+        elif cache_control == 'no-store':
+            patch_cache_control(response, no_store=True)
+        return response
+
+    def get_response(self, request, data, show_graphiql=False):
+        query, _, _, id = self.get_graphql_params(request, data)
+        try:
+            resolved = resolve_persisted_query(request, data, query, self.schema.graphql_schema)
+        except PersistedQueryError as e:
+            request._graphql_cache_control = 'no-store'
+            response = {"errors": [e.as_error()]}
+            if self.batch:
+                response["id"] = id
+                response["status"] = 200
+            return self.json_encode(request, response), 200
+
+        if resolved != query:
+            # Hash-only request: hand graphene the registered document text
+            data = {**data, "query": resolved}
+            # Its GET URL names one fixed document, so a successful response may be cached
+            request._graphql_cache_control = 'public'
+        return super().get_response(request, data, show_graphiql)
+
+    def json_encode(self, request, d, pretty=False):
+        # Attach the extensions collected while executing this operation (one per batch entry)
+        extensions = request.__dict__.pop('_graphql_extensions', None)
+        if extensions and isinstance(d, dict):
+            d["extensions"] = extensions
+        if isinstance(d, dict) and d.get("errors") and '_graphql_cache_control' in request.__dict__:
+            request._graphql_cache_control = 'no-store'
+        if not (self.pretty or pretty) and not request.GET.get("pretty"):
+            return json_dumps(d)
+        return super().json_encode(request, d, pretty=pretty)
@@ -0,0 +1,33 @@
+#!/bin/sh
+# Container entrypoint.
+#
+#   serve    (default) production server: gunicorn with gunicorn.conf.py
+#   migrate  apply database migrations, then exit (run once per release)
+#   dev      Django's development server with autoreload
+#   *        any other command is executed as given
+#
+# Migrations are not part of `serve`, so restarting or scaling the web
+# container never runs them. Platforms without a release step can set
+# MIGRATE_ON_START=true to migrate once before the server starts.
+set -e
+
+command="${1:-serve}"
+[ "$#" -gt 0 ] && shift
+
+case "$command" in
+  serve)
+    if [ "${MIGRATE_ON_START:-false}" = "true" ]; then
+      python manage.py migrate --noinput
+    fi
+    exec gunicorn "${SERVER_APP:-config.wsgi:application}" "$@"
+    ;;
+  migrate)
+    exec python manage.py migrate --noinput "$@"
+    ;;
+  dev)
+    exec python manage.py runserver "0.0.0.0:${PORT:-8000}" "$@"
+    ;;
+  *)
+    exec "$command" "$@"
+    ;;
+esac
@@ -0,0 +1,73 @@
+"""
+Gunicorn settings for the production server (`./entrypoint.sh serve`).
+
+A master process loads the Django application once (preload_app) and forks
+the workers, so they share its memory copy-on-write. Every value can be
+overridden from the environment; gunicorn reads this file automatically
+when started from the Backend directory.
+"""
+
+import multiprocessing
+import os
+
+# Imported under another name: gunicorn treats a module-level `config` as its own setting
+from decouple import config as env
+
+bind = f"0.0.0.0:{env('PORT', default=8000, cast=int)}"
+
+# Pre-forked worker processes, each serving `threads` requests at a time
+workers = env("WEB_CONCURRENCY", default=multiprocessing.cpu_count() * 2 + 1, cast=int)
+threads = env("GUNICORN_THREADS", default=1, cast=int)
+worker_class = env("GUNICORN_WORKER_CLASS", default="gthread" if threads > 1 else "sync")
+preload_app = env("GUNICORN_PRELOAD", default=True, cast=bool)
+
+# Workers get graceful_timeout seconds to finish in-flight requests on SIGTERM
+timeout = env("GUNICORN_TIMEOUT", default=60, cast=int)
+graceful_timeout = env("GUNICORN_GRACEFUL_TIMEOUT", default=30, cast=int)
+keepalive = env("GUNICORN_KEEPALIVE", default=5, cast=int)
+
+# Recycle workers after this many requests (0 disables) to bound memory growth
+max_requests = env("GUNICORN_MAX_REQUESTS", default=0, cast=int)
+max_requests_jitter = env("GUNICORN_MAX_REQUESTS_JITTER", default=0, cast=int)
+
+# Heartbeat files on tmpfs: a slow container disk must not stall the workers
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = env("GUNICORN_ACCESS_LOG", default="-")
+errorlog = "-"
+loglevel = env("GUNICORN_LOG_LEVEL", default="info")
+forwarded_allow_ips = env("FORWARDED_ALLOW_IPS", default="127.0.0.1")
+
+
+def on_starting(server):
+    # Workers must share the read cache's generations; a per-process cache
+    # (the default locmem) is switched off instead, so the defaults still boot
+    if server.cfg.workers > 1:
+        import django
+        from django.conf import settings
+        from django.core.exceptions import ImproperlyConfigured
+
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+        django.setup()
+        from config.read_cache import check_shared_cache
+
+        try:
+            check_shared_cache(server.cfg.workers)
+        except ImproperlyConfigured as e:
+            server.log.warning("%s Serving without the read cache.", e)
+            # Workers are forked from this process and inherit its settings
+            settings.READ_CACHE = {**settings.READ_CACHE, "ENABLED": False}
+
+
+def pre_fork(server, worker):
+    # Never hand a database socket (or a pool, whose threads die in fork) opened in the master to a worker
+    from config.db import close_pools
+
+    close_pools()
+
+
+def worker_exit(server, worker):
+    # Write comments still waiting in the async ingestion queue
+    from taskComment.ingest import comment_queue
+
+    comment_queue.stop()
@@ -0,0 +1,58 @@
+from django.db import migrations
+
+# The search objects of config.search.ORGANIZATION_SEARCH as of this migration, frozen
+# so that later changes to the model or to config.search cannot alter it.
+# config.search.ensure_search_indexes keeps them current after later migrations.
+POSTGRESQL_CREATE = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS "organization_organization_name_trgm" ON "organization_organization" USING gin ((UPPER("name"::text)) gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS "organization_organization_slug_trgm" ON "organization_organization" USING gin ((UPPER("slug"::text)) gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS "organization_organization_contact_email_trgm" ON "organization_organization" USING gin ((UPPER("contact_email"::text)) gin_trgm_ops)',
+]
+POSTGRESQL_DROP = [
+    'DROP INDEX IF EXISTS "organization_organization_name_trgm"',
+    'DROP INDEX IF EXISTS "organization_organization_slug_trgm"',
+    'DROP INDEX IF EXISTS "organization_organization_contact_email_trgm"',
+]
+# FTS5 table with the trigram tokenizer (SQLite 3.34+), kept in sync by triggers
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS organization_organization_search USING fts5(name, slug, contact_email, content='organization_organization', content_rowid='id', tokenize='trigram')",
+    'CREATE TRIGGER IF NOT EXISTS organization_organization_search_ai AFTER INSERT ON organization_organization BEGIN INSERT INTO organization_organization_search(rowid, name, slug, contact_email) VALUES (new.id, new.name, new.slug, new.contact_email); END',
+    "CREATE TRIGGER IF NOT EXISTS organization_organization_search_ad AFTER DELETE ON organization_organization BEGIN INSERT INTO organization_organization_search(organization_organization_search, rowid, name, slug, contact_email) VALUES ('delete', old.id, old.name, old.slug, old.contact_email); END",
+    "CREATE TRIGGER IF NOT EXISTS organization_organization_search_au AFTER UPDATE OF name, slug, contact_email ON organization_organization BEGIN INSERT INTO organization_organization_search(organization_organization_search, rowid, name, slug, contact_email) VALUES ('delete', old.id, old.name, old.slug, old.contact_email); INSERT INTO organization_organization_search(rowid, name, slug, contact_email) VALUES (new.id, new.name, new.slug, new.contact_email); END",
+    "INSERT INTO organization_organization_search(organization_organization_search) VALUES ('rebuild')",
+]
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS organization_organization_search_ai',
+    'DROP TRIGGER IF EXISTS organization_organization_search_ad',
+    'DROP TRIGGER IF EXISTS organization_organization_search_au',
+    'DROP TABLE IF EXISTS organization_organization_search',
+]
+
+
+def run(schema_editor, statements):
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite" and connection.Database.sqlite_version_info < (3, 34, 0):
+        return
+    with connection.cursor() as cursor:
+        for sql in statements.get(connection.vendor, ()):
+            cursor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    run(schema_editor, {"postgresql": POSTGRESQL_CREATE, "sqlite": SQLITE_CREATE})
+
+
+def drop_search_index(apps, schema_editor):
+    run(schema_editor, {"postgresql": POSTGRESQL_DROP, "sqlite": SQLITE_DROP})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("organization", "0002_alter_organization_contact_email"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,11 +1,16 @@
 from typing import Dict, Any
 from django.core.exceptions import ValidationError
+from config.serialization import isoformat_fields
 from .models import Organization
 from slugify import slugify
 
 class OrganizationSerializer:
     """Serializer for Organization model."""
 
+    # Columns returned by list endpoints, in to_dict order
+    LIST_FIELDS = ('id', 'name', 'slug', 'contact_email', 'created_at')
+    DATE_FIELDS = ('created_at',)
+
     @staticmethod
     def validate_create_data(data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -119,3 +124,10 @@ class OrganizationSerializer:
             List of dictionary representations
         """
         return [OrganizationSerializer.to_dict(org) for org in organizations]
+
+    @staticmethod
+    def values_to_list_dict(rows: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
+        """
+        Format rows fetched with .values(*LIST_FIELDS) without building model instances.
+        """
+        return isoformat_fields(rows, OrganizationSerializer.DATE_FIELDS)
@@ -1,6 +1,10 @@
 from typing import Optional, Dict, Any
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
+from config.db.routing import replica_reads
+from config.pagination import Page, paginate
+from config.read_cache import ORGANIZATIONS_SCOPE, cached
+from config.search import ORGANIZATION_SEARCH
 from .models import Organization
 
 
@@ -67,12 +71,13 @@ class OrganizationService:
         Returns:
             Organization instance or None if not found
         """
-        try:
-            return Organization.objects.get(slug=slug)
-        except Organization.DoesNotExist:
-            return None
+        return cached(
+            'organization', [ORGANIZATIONS_SCOPE], f'slug:{slug}',
+            lambda: Organization.objects.filter(slug=slug).first()
+        )
 
     @staticmethod
+    @replica_reads()
     def get_all_organizations() -> list[Organization]:
         """
         Retrieve all organizations.
@@ -149,20 +154,48 @@ class OrganizationService:
         return Organization.objects.filter(id=org_id).exists()
 
     @staticmethod
-    def search_organizations(query: str) -> list[Organization]:
+    @replica_reads()
+    def search_organizations(query: str, limit: Optional[int] = None) -> list[Organization]:
         """
         Search organizations by name, slug, or email.
         
         Args:
-            query: Search query string
+            query: Search query string, matched as a case-insensitive substring
+            limit: Maximum number of results (see config.search.search_limit)
+            
+        Returns:
+            Matching Organization instances, best match first
+        """
+        return ORGANIZATION_SEARCH.search(Organization.objects.all(), query, limit)
+
+    @staticmethod
+    @replica_reads()
+    def get_organizations_page(
+        search: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        fields: Optional[tuple] = None
+    ) -> Page:
+        """
+        Retrieve one page of organizations, optionally filtered by a search term.
+        
+        Args:
+            search: Optional search query string
+            limit: Maximum number of organizations to return
+            after: Cursor returned by the previous page
+            fields: Optional columns to fetch as dictionaries instead of instances
             
         Returns:
-            List of matching Organization instances
-        """
-        return list(Organization.objects.filter(
-            name__icontains=query
-        ) | Organization.objects.filter(
-            slug__icontains=query
-        ) | Organization.objects.filter(
-            contact_email__icontains=query
-        ).distinct())
+            Page of Organization instances (or dictionaries when fields is given)
+        """
+        if search:
+            queryset = OrganizationService._search_queryset(search)
+        else:
+            queryset = Organization.objects.all()
+        if fields:
+            queryset = queryset.values(*fields)
+        return paginate(queryset, limit=limit, after=after)
+
+    @staticmethod
+    def _search_queryset(query: str):
+        return ORGANIZATION_SEARCH.filter(Organization.objects.all(), query)
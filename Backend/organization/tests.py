@@ -1,3 +1,55 @@
 from django.test import TestCase
 
-# Create your tests here.
+from .models import Organization
+from .service import OrganizationService
+
+
+class OrganizationListQueryCountTests(TestCase):
+    """List serialization must run a constant number of queries."""
+
+    def setUp(self):
+        for i in range(5):
+            Organization.objects.create(name=f'Org {i}', slug=f'org-{i}', contact_email=f'org{i}@example.com')
+
+    def test_list_query_count_is_constant(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/organizations/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 5)
+
+
+class OrganizationSearchTests(TestCase):
+    """Search matches substrings of name, slug or email, ranked and limited."""
+
+    def setUp(self):
+        self.acme = Organization.objects.create(name='Acme Rockets', slug='acme', contact_email='ops@acme.com')
+        self.lab = Organization.objects.create(name='Rocket Lab', slug='rl', contact_email='hi@lab.io')
+        Organization.objects.create(name='Zeta', slug='zeta', contact_email='rocket@zeta.io')
+
+    def test_search_matches_any_field(self):
+        response = self.client.get('/api/organizations/search/', {'q': 'ROCKET'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 3)
+
+        response = self.client.get('/api/organizations/search/', {'q': 'rocket', 'limit': 1})
+        self.assertEqual(response.json()['count'], 1)
+
+    def test_index_follows_writes(self):
+        self.lab.name = 'Orbital Lab'
+        self.lab.save()
+        self.acme.delete()
+        names = [o.name for o in OrganizationService.search_organizations('rocket')]
+        self.assertEqual(names, ['Zeta'])
+        self.assertEqual([o.name for o in OrganizationService.search_organizations('orbital')], ['Orbital Lab'])
+
+    def test_paginated_list_search(self):
+        response = self.client.get('/api/organizations/', {'search': 'rocket'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 3)
+
+        response = self.client.get('/api/organizations/', {'search': 'rl'})
+        self.assertEqual([row['slug'] for row in response.json()['data']], ['rl'])
+
+    def test_search_requires_query(self):
+        response = self.client.get('/api/organizations/search/')
+        self.assertEqual(response.status_code, 400)
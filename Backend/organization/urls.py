@@ -2,7 +2,8 @@ from django.urls import path
 from .views import (
     OrganizationListView,
     OrganizationDetailView,
-    OrganizationBySlugView
+    OrganizationBySlugView,
+    OrganizationSearchView
 )
 
 app_name = 'organization'
@@ -11,6 +12,9 @@ urlpatterns = [
     # List all organizations or create a new one
     path('', OrganizationListView.as_view(), name='list-create'),
     
+    # Ranked search by name, slug, or email
+    path('search/', OrganizationSearchView.as_view(), name='search'),
+    
     # Get organization by slug
     path('slug/<str:slug>/', OrganizationBySlugView.as_view(), name='by-slug'),
     
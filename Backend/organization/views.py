@@ -1,14 +1,18 @@
 import json
-from django.http import JsonResponse
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.core.exceptions import ValidationError
 from .service import OrganizationService
 from .serializers import OrganizationSerializer
+from config.pagination import get_page_params
+from config.responses import JsonResponse
+from config.search import get_search_params
+from config.etags import conditional, organization_etag, organizations_etag
 
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(conditional(organizations_etag), name='get')
 class OrganizationListView(View):
   
 
@@ -18,23 +22,35 @@ class OrganizationListView(View):
         
         Query parameters:
             - search: Optional search query to filter organizations
+            - limit: Page size (defaults to DEFAULT_PAGE_SIZE)
+            - after: Cursor returned as next_cursor by the previous page
         """
         try:
             search_query = request.GET.get('search', '').strip()
+            limit, after = get_page_params(request)
             
-            if search_query:
-                organizations = OrganizationService.search_organizations(search_query)
-            else:
-                organizations = OrganizationService.get_all_organizations()
+            page = OrganizationService.get_organizations_page(
+                search=search_query or None, limit=limit, after=after,
+                fields=OrganizationSerializer.LIST_FIELDS
+            )
             
-            data = OrganizationSerializer.to_list_dict(organizations)
+            data = OrganizationSerializer.values_to_list_dict(page.items)
             
             return JsonResponse({
                 'success': True,
                 'data': data,
-                'count': len(data)
+                'count': len(data),
+                'next_cursor': page.next_cursor,
+                'has_next': page.has_next
             }, status=200)
         
+        except ValidationError as e:
+            return JsonResponse({
+                'success': False,
+                'error': 'Validation failed.',
+                'errors': e.message_dict if hasattr(e, 'message_dict') else {'detail': str(e)}
+            }, status=400)
+        
         except Exception as e:
             return JsonResponse({
                 'success': False,
@@ -81,6 +97,7 @@ class OrganizationListView(View):
 
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(conditional(organization_etag), name='get')
 class OrganizationDetailView(View):
     """View for retrieving, updating, and deleting a specific organization."""
 
@@ -195,6 +212,7 @@ class OrganizationDetailView(View):
 
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(conditional(organizations_etag), name='get')
 class OrganizationBySlugView(View):
     """View for retrieving an organization by slug."""
 
@@ -219,3 +237,41 @@ class OrganizationBySlugView(View):
                 'success': False,
                 'error': str(e)
             }, status=500)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(conditional(organizations_etag), name='get')
+class OrganizationSearchView(View):
+    """View for ranked organization search."""
+
+    def get(self, request):
+        """
+        Search organizations by name, slug, or email, best match first.
+        
+        Query parameters:
+            - q: Search term (required)
+            - limit: Maximum number of results (defaults to SEARCH_DEFAULT_LIMIT)
+        """
+        try:
+            query, limit = get_search_params(request)
+            
+            organizations = OrganizationService.search_organizations(query, limit=limit)
+            
+            return JsonResponse({
+                'success': True,
+                'data': OrganizationSerializer.to_list_dict(organizations),
+                'count': len(organizations)
+            }, status=200)
+        
+        except ValidationError as e:
+            return JsonResponse({
+                'success': False,
+                'error': 'Validation failed.',
+                'errors': e.message_dict if hasattr(e, 'message_dict') else {'detail': str(e)}
+            }, status=400)
+        
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=500)
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Q
+
+from project.models import TASK_COUNTER_FIELDS, Project
+from task.models import Task
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized task counters on Project from the Task table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Only report projects whose counters drifted; exit non-zero if any did.',
+        )
+
+    def handle(self, *args, **options):
+        verify = options['verify']
+        drifted = []
+        with transaction.atomic():
+            # Lock the projects first: task writes update their project's counters, so
+            # none can commit between counting and saving. organization_id is read by
+            # the read-cache invalidation signal on save.
+            projects = list(
+                Project.objects.select_for_update().order_by('id').only('id', 'organization_id', *TASK_COUNTER_FIELDS)
+            )
+            actual = {
+                row['project_id']: (row['total'], row['todo'], row['in_progress'], row['done'])
+                for row in Task.objects.order_by().values('project_id').annotate(
+                    total=Count('id'),
+                    todo=Count('id', filter=Q(status='todo')),
+                    in_progress=Count('id', filter=Q(status='in_progress')),
+                    done=Count('id', filter=Q(status='done')),
+                )
+            }
+
+            for project in projects:
+                stored = tuple(getattr(project, field) for field in TASK_COUNTER_FIELDS)
+                expected = actual.get(project.id, (0, 0, 0, 0))
+                if stored == expected:
+                    continue
+                drifted.append(project.id)
+                self.stdout.write(f"Project {project.id}: stored {stored}, actual {expected}")
+                if not verify:
+                    for field, value in zip(TASK_COUNTER_FIELDS, expected):
+                        setattr(project, field, value)
+                    project.save(update_fields=TASK_COUNTER_FIELDS)
+
+        if verify and drifted:
+            raise CommandError(f"{len(drifted)} project(s) have out-of-date task counters.")
+        if verify:
+            self.stdout.write(self.style.SUCCESS("All project task counters are correct."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt task counters for {len(drifted)} project(s)."))
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.27 on 2026-10-16 23:39
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_task_counters(apps, schema_editor):
+    Project = apps.get_model("project", "Project")
+    Task = apps.get_model("task", "Task")
+
+    rows = (
+        Task.objects.order_by()
+        .values("project_id")
+        .annotate(
+            total=Count("id"),
+            todo=Count("id", filter=Q(status="todo")),
+            in_progress=Count("id", filter=Q(status="in_progress")),
+            done=Count("id", filter=Q(status="done")),
+        )
+    )
+    for row in rows:
+        Project.objects.filter(id=row["project_id"]).update(
+            task_count=row["total"],
+            todo_task_count=row["todo"],
+            in_progress_task_count=row["in_progress"],
+            done_task_count=row["done"],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project", "0001_initial"),
+        ("task", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="task_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="todo_task_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="in_progress_task_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="done_task_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_task_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations
+
+# The search objects of config.search.PROJECT_SEARCH as of this migration, frozen
+# so that later changes to the model or to config.search cannot alter it.
+# config.search.ensure_search_indexes keeps them current after later migrations.
+POSTGRESQL_CREATE = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS "project_project_name_trgm" ON "project_project" USING gin ((UPPER("name"::text)) gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS "project_project_description_trgm" ON "project_project" USING gin ((UPPER("description"::text)) gin_trgm_ops)',
+]
+POSTGRESQL_DROP = [
+    'DROP INDEX IF EXISTS "project_project_name_trgm"',
+    'DROP INDEX IF EXISTS "project_project_description_trgm"',
+]
+# FTS5 table with the trigram tokenizer (SQLite 3.34+), kept in sync by triggers
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS project_project_search USING fts5(name, description, content='project_project', content_rowid='id', tokenize='trigram')",
+    'CREATE TRIGGER IF NOT EXISTS project_project_search_ai AFTER INSERT ON project_project BEGIN INSERT INTO project_project_search(rowid, name, description) VALUES (new.id, new.name, new.description); END',
+    "CREATE TRIGGER IF NOT EXISTS project_project_search_ad AFTER DELETE ON project_project BEGIN INSERT INTO project_project_search(project_project_search, rowid, name, description) VALUES ('delete', old.id, old.name, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS project_project_search_au AFTER UPDATE OF name, description ON project_project BEGIN INSERT INTO project_project_search(project_project_search, rowid, name, description) VALUES ('delete', old.id, old.name, old.description); INSERT INTO project_project_search(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+    "INSERT INTO project_project_search(project_project_search) VALUES ('rebuild')",
+]
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS project_project_search_ai',
+    'DROP TRIGGER IF EXISTS project_project_search_ad',
+    'DROP TRIGGER IF EXISTS project_project_search_au',
+    'DROP TABLE IF EXISTS project_project_search',
+]
+
+
+def run(schema_editor, statements):
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite" and connection.Database.sqlite_version_info < (3, 34, 0):
+        return
+    with connection.cursor() as cursor:
+        for sql in statements.get(connection.vendor, ()):
+            cursor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    run(schema_editor, {"postgresql": POSTGRESQL_CREATE, "sqlite": SQLITE_CREATE})
+
+
+def drop_search_index(apps, schema_editor):
+    run(schema_editor, {"postgresql": POSTGRESQL_DROP, "sqlite": SQLITE_DROP})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project", "0002_project_task_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
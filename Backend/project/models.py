@@ -11,6 +11,10 @@ STATUS_CHOICES = [
 ]
 
 
+# Denormalized counters written only through F() updates (see TaskService)
+TASK_COUNTER_FIELDS = ('task_count', 'todo_task_count', 'in_progress_task_count', 'done_task_count')
+
+
 class Project(models.Model):
     """
     Represents a project within an organization.
@@ -23,6 +27,12 @@ class Project(models.Model):
     due_date = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Denormalized task counters, maintained by TaskService on every write
+    task_count = models.PositiveIntegerField(default=0)
+    todo_task_count = models.PositiveIntegerField(default=0)
+    in_progress_task_count = models.PositiveIntegerField(default=0)
+    done_task_count = models.PositiveIntegerField(default=0)
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Project'
@@ -31,5 +41,11 @@ class Project(models.Model):
             models.Index(fields=['organization', '-created_at']),
         ]
 
+    @property
+    def completion_rate(self) -> float:
+        if self.task_count == 0:
+            return 0.0
+        return round((self.done_task_count / self.task_count) * 100, 2)
+
     def __str__(self):
         return f"{self.name} ({self.organization.name})"
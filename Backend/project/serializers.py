@@ -1,11 +1,16 @@
 from typing import Dict, Any, Optional
 from django.core.exceptions import ValidationError
+from config.serialization import isoformat_fields
 from .models import Project, STATUS_CHOICES
 
 
 class ProjectSerializer:
     """Serializer for Project model."""
 
+    # Columns returned by list endpoints, in to_dict order
+    LIST_FIELDS = ('id', 'organization_id', 'name', 'description', 'status', 'due_date', 'created_at')
+    DATE_FIELDS = ('due_date', 'created_at')
+
     @staticmethod
     def validate_create_data(data: Dict[str, Any]) -> Dict[str, Any]:
        
@@ -103,7 +108,7 @@ class ProjectSerializer:
         """
         return {
             'id': project.id,
-            'organization_id': project.organization.id,
+            'organization_id': project.organization_id,
             'name': project.name,
             'description': project.description,
             'status': project.status,
@@ -115,3 +120,10 @@ class ProjectSerializer:
     def to_list_dict(projects: list[Project]) -> list[Dict[str, Any]]:
     
         return [ProjectSerializer.to_dict(project) for project in projects]
+
+    @staticmethod
+    def values_to_list_dict(rows: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
+        """
+        Format rows fetched with .values(*LIST_FIELDS) without building model instances.
+        """
+        return isoformat_fields(rows, ProjectSerializer.DATE_FIELDS)
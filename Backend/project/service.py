@@ -1,8 +1,14 @@
-from typing import Optional
+from typing import Callable, Optional, Dict, Any
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
-from .models import Project
+from django.db.models import Count, Q, QuerySet, Sum
+from django.db.models.functions import Coalesce
+from .models import Project, TASK_COUNTER_FIELDS
 from organization.models import Organization
+from config.db.routing import replica_reads
+from config.pagination import Page, paginate
+from config.read_cache import cached, cached_list, organization_scope
+from config.search import PROJECT_SEARCH
 
 
 class ProjectService:
@@ -42,16 +48,24 @@ class ProjectService:
             raise
 
     @staticmethod
-    def get_project_by_id(project_id: int) -> Optional[Project]:
+    def get_project_by_id(
+        project_id: int,
+        optimize: Optional[Callable[[QuerySet], QuerySet]] = None
+    ) -> Optional[Project]:
         """
         Retrieve a project by ID.
+        optimize, if given, is applied to the queryset before it is evaluated.
         """
+        queryset = Project.objects.all()
+        if optimize:
+            queryset = optimize(queryset)
         try:
-            return Project.objects.get(id=project_id)
+            return queryset.get(id=project_id)
         except Project.DoesNotExist:
             return None
 
     @staticmethod
+    @replica_reads()
     def get_all_projects() -> list[Project]:
         """
         Retrieve all projects.
@@ -59,11 +73,19 @@ class ProjectService:
         return list(Project.objects.all())
 
     @staticmethod
-    def get_projects_by_organization(organization_id: int) -> list[Project]:
+    @replica_reads()
+    def get_projects_by_organization(
+        organization_id: int,
+        optimize: Optional[Callable[[QuerySet], QuerySet]] = None
+    ) -> list[Project]:
         """
-        Retrieve all projects for a specific organization.
+        Retrieve all projects for a specific organization, through the read cache.
+        optimize, if given, is applied to the queryset before it is evaluated.
         """
-        return list(Project.objects.filter(organization_id=organization_id))
+        queryset = Project.objects.filter(organization_id=organization_id)
+        if optimize:
+            queryset = optimize(queryset)
+        return cached_list('projects', [organization_scope(organization_id)], queryset)
 
     @staticmethod
     def update_project(project_id: int, **kwargs) -> Optional[Project]:
@@ -75,22 +97,28 @@ class ProjectService:
             return None
 
         try:
+            updated_fields = []
             # Handle organization_id separately if provided
             if 'organization_id' in kwargs:
                 org_id = kwargs.pop('organization_id')
                 try:
                     organization = Organization.objects.get(id=org_id)
                     project.organization = organization
+                    updated_fields.append('organization')
                 except Organization.DoesNotExist:
                     raise ValidationError(f"Organization with ID {org_id} does not exist.")
             
-            # Update other fields
+            # Update other fields; the task counters belong to TaskService
             for field, value in kwargs.items():
-                if hasattr(project, field) and value is not None:
+                if hasattr(project, field) and value is not None and field not in TASK_COUNTER_FIELDS:
                     setattr(project, field, value)
+                    updated_fields.append(field)
             
             project.full_clean()
-            project.save()
+            # Write only the edited columns, so the counters loaded above
+            # cannot overwrite concurrent F() updates
+            if updated_fields:
+                project.save(update_fields=updated_fields)
             return project
         except IntegrityError as e:
             raise ValidationError(f"Error updating project: {str(e)}")
@@ -118,32 +146,122 @@ class ProjectService:
         return Project.objects.filter(id=project_id).exists()
 
     @staticmethod
-    def search_projects(query: str, organization_id: Optional[int] = None) -> list[Project]:
+    @replica_reads()
+    def search_projects(
+        query: str,
+        organization_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        optimize: Optional[Callable[[QuerySet], QuerySet]] = None
+    ) -> list[Project]:
         """
-        Search projects by name or description.
+        Search projects by name or description, best match first.
         
         """
-        queryset = Project.objects.filter(
-            name__icontains=query
-        ) | Project.objects.filter(
-            description__icontains=query
-        )
-        
+        queryset = Project.objects.all()
         if organization_id:
             queryset = queryset.filter(organization_id=organization_id)
-        
-        return list(queryset.distinct())
+        if optimize:
+            queryset = optimize(queryset)
+        return PROJECT_SEARCH.search(queryset, query, limit)
 
     @staticmethod
+    @replica_reads()
     def filter_projects_by_status(status: str, organization_id: Optional[int] = None) -> list[Project]:
         """
         Filter projects by status.
         
       
         """
+        return list(ProjectService._status_queryset(status, organization_id))
+
+    @staticmethod
+    @replica_reads()
+    def get_projects_page(
+        organization_id: Optional[int] = None,
+        search: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        fields: Optional[tuple] = None,
+        optimize: Optional[Callable[[QuerySet], QuerySet]] = None
+    ) -> Page:
+        """
+        Retrieve one page of projects.
+
+        A search term takes precedence over a status filter; both can be
+        scoped to an organization. When fields is given, rows are fetched as
+        dictionaries of those columns instead of model instances; otherwise
+        optimize, if given, is applied to the model queryset.
+        """
+        if search:
+            queryset = ProjectService._search_queryset(search, organization_id)
+        elif status:
+            queryset = ProjectService._status_queryset(status, organization_id)
+        elif organization_id:
+            queryset = Project.objects.filter(organization_id=organization_id)
+        else:
+            queryset = Project.objects.all()
+        if fields:
+            queryset = queryset.values(*fields)
+        elif optimize:
+            queryset = optimize(queryset)
+        return paginate(queryset, limit=limit, after=after)
+
+    @staticmethod
+    def _search_queryset(query: str, organization_id: Optional[int] = None):
+        queryset = Project.objects.all()
+        
+        if organization_id:
+            queryset = queryset.filter(organization_id=organization_id)
+        
+        return PROJECT_SEARCH.filter(queryset, query)
+
+    @staticmethod
+    def _status_queryset(status: str, organization_id: Optional[int] = None):
         queryset = Project.objects.filter(status=status)
         
         if organization_id:
             queryset = queryset.filter(organization_id=organization_id)
         
-        return list(queryset)
+        return queryset
+
+    @staticmethod
+    @replica_reads()
+    def get_statistics(organization_id: int) -> Dict[str, Any]:
+        """
+        Compute project and task statistics for an organization.
+
+        A single conditional-aggregation query over projects; task totals come
+        from the denormalized counter columns maintained by TaskService.
+        Results are served from the read cache until the organization changes.
+        """
+        return cached(
+            'statistics',
+            [organization_scope(organization_id)],
+            'totals',
+            lambda: ProjectService._compute_statistics(organization_id),
+        )
+
+    @staticmethod
+    def _compute_statistics(organization_id: int) -> Dict[str, Any]:
+        totals = Project.objects.filter(organization_id=organization_id).aggregate(
+            total_projects=Count('id'),
+            active_projects=Count('id', filter=Q(status='active')),
+            completed_projects=Count('id', filter=Q(status='completed')),
+            on_hold_projects=Count('id', filter=Q(status='on_hold')),
+            total_tasks=Coalesce(Sum('task_count'), 0),
+            completed_tasks=Coalesce(Sum('done_task_count'), 0),
+            in_progress_tasks=Coalesce(Sum('in_progress_task_count'), 0),
+            todo_tasks=Coalesce(Sum('todo_task_count'), 0),
+        )
+
+        overall_completion_rate = 0.0
+        if totals['total_tasks'] > 0:
+            overall_completion_rate = round(
+                (totals['completed_tasks'] / totals['total_tasks']) * 100, 2
+            )
+
+        return {
+            **totals,
+            'overall_completion_rate': overall_completion_rate,
+        }
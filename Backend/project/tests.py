@@ -1,3 +1,158 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from organization.models import Organization
+from task.service import TaskService
+from .models import Project
+from .service import ProjectService
+
+
+class ProjectStatisticsTests(TestCase):
+    """Organization statistics come from one aggregate query over the projects."""
+
+    def setUp(self):
+        cache.clear()
+        self.organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        other = Organization.objects.create(name='Other', slug='other', contact_email='ops@other.com')
+        launch = Project.objects.create(organization=self.organization, name='Launch', status='active')
+        archive = Project.objects.create(organization=self.organization, name='Archive', status='completed')
+        Project.objects.create(organization=self.organization, name='Paused', status='on_hold')
+        noise = Project.objects.create(organization=other, name='Other', status='active')
+        for project, statuses in ((launch, ['todo', 'in_progress', 'done']), (archive, ['done', 'done']), (noise, ['done'])):
+            for status in statuses:
+                TaskService.create_task(project_id=project.id, title=status, status=status)
+        cache.clear()
+
+    def test_totals_in_one_query(self):
+        with self.assertNumQueries(1):
+            statistics = ProjectService.get_statistics(self.organization.id)
+        self.assertEqual(statistics, {
+            'total_projects': 3, 'active_projects': 1, 'completed_projects': 1, 'on_hold_projects': 1,
+            'total_tasks': 5, 'completed_tasks': 3, 'in_progress_tasks': 1, 'todo_tasks': 1,
+            'overall_completion_rate': 60.0,
+        })
+
+    def test_empty_organization(self):
+        empty = Organization.objects.create(name='Empty', slug='empty', contact_email='ops@empty.com')
+        statistics = ProjectService.get_statistics(empty.id)
+        self.assertEqual((statistics['total_projects'], statistics['total_tasks']), (0, 0))
+        self.assertEqual(statistics['overall_completion_rate'], 0.0)
+
+    def test_rest_endpoint(self):
+        response = self.client.get(f'/api/projects/organization/{self.organization.id}/statistics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['total_tasks'], 5)
+
+    def test_graphql_field(self):
+        query = '{ projectStatistics(organizationId: %d) { totalProjects completedTasks overallCompletionRate } }'
+        response = self.client.post('/graphql/', {'query': query % self.organization.id}, content_type='application/json')
+        self.assertEqual(response.json()['data']['projectStatistics'],
+                         {'totalProjects': 3, 'completedTasks': 3, 'overallCompletionRate': 60.0})
+
+
+class ProjectListQueryCountTests(TestCase):
+    """List serialization must not lazy-load the organization of each project."""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        for i in range(5):
+            Project.objects.create(organization=self.organization, name=f'Project {i}', status='active')
+
+    def test_list_query_count_is_constant(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/projects/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 5)
+
+    def test_organization_list_query_count_is_constant(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/projects/organization/{self.organization.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'][0]['organization_id'], self.organization.id)
+
+
+class ProjectReadCacheTests(TestCase):
+    """Cached project reads are served without queries until the tenant changes."""
+
+    def setUp(self):
+        cache.clear()
+        self.organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        self.other = Organization.objects.create(name='Other', slug='other', contact_email='ops@other.com')
+        self.project = Project.objects.create(organization=self.organization, name='Launch', status='active')
+        self.other_project = Project.objects.create(organization=self.other, name='Other', status='active')
+
+    def test_statistics_are_cached_until_a_task_changes(self):
+        self.assertEqual(ProjectService.get_statistics(self.organization.id)['total_tasks'], 0)
+        with self.assertNumQueries(0):
+            ProjectService.get_statistics(self.organization.id)
+
+        task = TaskService.create_task(project_id=self.project.id, title='Kickoff', status='done')
+        self.assertEqual(ProjectService.get_statistics(self.organization.id)['completed_tasks'], 1)
+
+        ProjectService.get_statistics(self.other.id)
+        TaskService.update_task(task.id, project_id=self.other_project.id)
+        self.assertEqual(ProjectService.get_statistics(self.organization.id)['total_tasks'], 0)
+        self.assertEqual(ProjectService.get_statistics(self.other.id)['total_tasks'], 1)
+
+    def test_writes_only_invalidate_their_tenant(self):
+        ProjectService.get_projects_by_organization(self.other.id)
+        Project.objects.create(organization=self.organization, name='Second', status='active')
+        with self.assertNumQueries(0):
+            self.assertEqual(len(ProjectService.get_projects_by_organization(self.other.id)), 1)
+        self.assertEqual(len(ProjectService.get_projects_by_organization(self.organization.id)), 2)
+
+
+class ProjectUpdateTests(TestCase):
+    """Editing a project must not overwrite the task counters."""
+
+    def setUp(self):
+        organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        self.project = Project.objects.create(organization=organization, name='Launch', status='active')
+
+    def test_stale_counters_are_not_saved(self):
+        stale = Project.objects.get(pk=self.project.pk)
+        TaskService.create_task(project_id=self.project.id, title='Kickoff', status='todo')
+
+        with mock.patch.object(ProjectService, 'get_project_by_id', return_value=stale):
+            ProjectService.update_project(self.project.id, name='Relaunch', task_count=0)
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.name, 'Relaunch')
+        self.assertEqual((self.project.task_count, self.project.todo_task_count), (1, 1))
+
+
+class ProjectSearchTests(TestCase):
+    """Project search is ranked by name over description and scoped by organization."""
+
+    def setUp(self):
+        self.acme = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        other = Organization.objects.create(name='Other', slug='other', contact_email='ops@other.com')
+        Project.objects.create(organization=self.acme, name='Booster', description='Rocket booster', status='active')
+        Project.objects.create(organization=self.acme, name='Rocket engine', status='active')
+        Project.objects.create(organization=other, name='Rocketry', status='active')
+
+    def test_ranked_and_scoped(self):
+        names = [p.name for p in ProjectService.search_projects('rocket', organization_id=self.acme.id)]
+        self.assertEqual(names, ['Rocket engine', 'Booster'])
+
+        response = self.client.get('/api/projects/search/', {'q': 'rocket', 'limit': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 2)
+
+    def test_invalid_organization_id_is_rejected(self):
+        for path, params in (('/api/projects/', {}), ('/api/projects/search/', {'q': 'rocket'})):
+            with self.subTest(path=path):
+                response = self.client.get(path, {**params, 'organization_id': 'abc'})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('organization_id', response.json()['errors'])
+
+    def test_counter_updates_keep_index(self):
+        Project.objects.update(done_task_count=1)
+        self.assertEqual(len(ProjectService.search_projects('rocket')), 3)
+
+    def test_graphql_search(self):
+        query = '{ searchProjects(query: "engine") { name completedTaskCount } }'
+        response = self.client.post('/graphql/', {'query': query}, content_type='application/json')
+        self.assertEqual(response.json()['data']['searchProjects'], [{'name': 'Rocket engine', 'completedTaskCount': 0}])
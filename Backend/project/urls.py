@@ -2,7 +2,9 @@ from django.urls import path
 from .views import (
     ProjectListView,
     ProjectDetailView,
-    OrganizationProjectListView
+    OrganizationProjectListView,
+    OrganizationProjectStatisticsView,
+    ProjectSearchView
 )
 
 app_name = 'project'
@@ -11,9 +13,15 @@ urlpatterns = [
     # List all projects or create a new one
     path('', ProjectListView.as_view(), name='list-create'),
     
+    # Ranked search by name or description
+    path('search/', ProjectSearchView.as_view(), name='search'),
+    
     # Get, update, or delete a specific project by ID
     path('<int:project_id>/', ProjectDetailView.as_view(), name='detail'),
     
     # List all projects for a specific organization
     path('organization/<int:org_id>/', OrganizationProjectListView.as_view(), name='by-organization'),
+    
+    # Get project and task statistics for a specific organization
+    path('organization/<int:org_id>/statistics/', OrganizationProjectStatisticsView.as_view(), name='statistics'),
 ]
@@ -1,14 +1,18 @@
 import json
-from django.http import JsonResponse
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.core.exceptions import ValidationError
 from .service import ProjectService
 from .serializers import ProjectSerializer
+from config.pagination import get_int_param, get_page_params
+from config.responses import JsonResponse
+from config.search import get_search_params
+from config.etags import all_etag, conditional, organization_etag, project_etag
 
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(conditional(all_etag), name='get')
 class ProjectListView(View):
     """View for listing all projects and creating new projects."""
 
@@ -19,27 +23,35 @@ class ProjectListView(View):
         try:
             search_query = request.GET.get('search', '').strip()
             status = request.GET.get('status', '').strip()
-            organization_id = request.GET.get('organization_id', '').strip()
-            
-            if search_query:
-                org_id = int(organization_id) if organization_id else None
-                projects = ProjectService.search_projects(search_query, organization_id=org_id)
-            elif status:
-                org_id = int(organization_id) if organization_id else None
-                projects = ProjectService.filter_projects_by_status(status, organization_id=org_id)
-            elif organization_id:
-                projects = ProjectService.get_projects_by_organization(int(organization_id))
-            else:
-                projects = ProjectService.get_all_projects()
+            organization_id = get_int_param(request, 'organization_id')
+            limit, after = get_page_params(request)
+            
+            page = ProjectService.get_projects_page(
+                organization_id=organization_id,
+                search=search_query or None,
+                status=status or None,
+                limit=limit,
+                after=after,
+                fields=ProjectSerializer.LIST_FIELDS
+            )
             
-            data = ProjectSerializer.to_list_dict(projects)
+            data = ProjectSerializer.values_to_list_dict(page.items)
             
             return JsonResponse({
                 'success': True,
                 'data': data,
-                'count': len(data)
+                'count': len(data),
+                'next_cursor': page.next_cursor,
+                'has_next': page.has_next
             }, status=200)
         
+        except ValidationError as e:
+            return JsonResponse({
+                'success': False,
+                'error': 'Validation failed.',
+                'errors': e.message_dict if hasattr(e, 'message_dict') else {'detail': str(e)}
+            }, status=400)
+        
         except Exception as e:
             return JsonResponse({
                 'success': False,
@@ -82,6 +94,7 @@ class ProjectListView(View):
 
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(conditional(project_etag), name='get')
 class ProjectDetailView(View):
     """View for retrieving, updating, and deleting a specific project."""
 
@@ -191,6 +204,7 @@ class ProjectDetailView(View):
 
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(conditional(organization_etag), name='get')
 class OrganizationProjectListView(View):
     """View for listing all projects for a specific organization."""
 
@@ -201,20 +215,56 @@ class OrganizationProjectListView(View):
         try:
             search_query = request.GET.get('search', '').strip()
             status = request.GET.get('status', '').strip()
+            limit, after = get_page_params(request)
             
-            if search_query:
-                projects = ProjectService.search_projects(search_query, organization_id=org_id)
-            elif status:
-                projects = ProjectService.filter_projects_by_status(status, organization_id=org_id)
-            else:
-                projects = ProjectService.get_projects_by_organization(org_id)
+            page = ProjectService.get_projects_page(
+                organization_id=org_id,
+                search=search_query or None,
+                status=status or None,
+                limit=limit,
+                after=after,
+                fields=ProjectSerializer.LIST_FIELDS
+            )
             
-            data = ProjectSerializer.to_list_dict(projects)
+            data = ProjectSerializer.values_to_list_dict(page.items)
             
             return JsonResponse({
                 'success': True,
                 'data': data,
-                'count': len(data)
+                'count': len(data),
+                'next_cursor': page.next_cursor,
+                'has_next': page.has_next
+            }, status=200)
+        
+        except ValidationError as e:
+            return JsonResponse({
+                'success': False,
+                'error': 'Validation failed.',
+                'errors': e.message_dict if hasattr(e, 'message_dict') else {'detail': str(e)}
+            }, status=400)
+        
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=500)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(conditional(organization_etag), name='get')
+class OrganizationProjectStatisticsView(View):
+    """View for project and task statistics of a specific organization."""
+
+    def get(self, request, org_id):
+        """
+        Retrieve project statistics for a specific organization.
+        """
+        try:
+            statistics = ProjectService.get_statistics(org_id)
+            
+            return JsonResponse({
+                'success': True,
+                'data': statistics
             }, status=200)
         
         except Exception as e:
@@ -222,3 +272,47 @@ class OrganizationProjectListView(View):
                 'success': False,
                 'error': str(e)
             }, status=500)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(conditional(all_etag), name='get')
+class ProjectSearchView(View):
+    """View for ranked project search."""
+
+    def get(self, request):
+        """
+        Search projects by name or description, best match first.
+        
+        Query parameters:
+            - q: Search term (required)
+            - organization_id: Optional organization scope
+            - limit: Maximum number of results (defaults to SEARCH_DEFAULT_LIMIT)
+        """
+        try:
+            query, limit = get_search_params(request)
+            org_id = get_int_param(request, 'organization_id')
+            
+            projects = ProjectService.search_projects(
+                query,
+                organization_id=org_id,
+                limit=limit
+            )
+            
+            return JsonResponse({
+                'success': True,
+                'data': ProjectSerializer.to_list_dict(projects),
+                'count': len(projects)
+            }, status=200)
+        
+        except ValidationError as e:
+            return JsonResponse({
+                'success': False,
+                'error': 'Validation failed.',
+                'errors': e.message_dict if hasattr(e, 'message_dict') else {'detail': str(e)}
+            }, status=400)
+        
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=500)
@@ -0,0 +1,65 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from config import responses
+from task.serializers import TaskSerializer
+
+
+class Command(BaseCommand):
+    help = "Compare orjson and stdlib encoding of a large task list payload."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Number of tasks in the payload')
+        parser.add_argument('--repeat', type=int, default=10, help='Timed runs per encoder')
+
+    def handle(self, *args, **options):
+        rows = self._build_rows(options['rows'])
+        payload = {'success': True, 'data': rows, 'count': len(rows)}
+
+        encoders = [('stdlib', responses._stdlib_dumps)]
+        if responses.orjson is not None:
+            encoders.append(('orjson', responses._orjson_dumps))
+        else:
+            self.stdout.write(self.style.WARNING('orjson is not installed; only timing the stdlib encoder.'))
+
+        results = {}
+        for name, dumps in encoders:
+            dumps(payload)
+            timings = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                body = dumps(payload)
+                timings.append((time.perf_counter() - start) * 1000)
+            results[name] = statistics.median(timings)
+            self.stdout.write(
+                f"{name:>7}: median {results[name]:.2f} ms, "
+                f"min {min(timings):.2f} ms, {len(body) / 1024:.0f} KiB"
+            )
+
+        if 'orjson' in results:
+            self.stdout.write(self.style.SUCCESS(
+                f"orjson is {results['stdlib'] / results['orjson']:.1f}x faster on {len(rows)} tasks"
+            ))
+
+    @staticmethod
+    def _build_rows(count):
+        """Build task rows shaped like the /api/tasks/ fast path, without a database."""
+        now = timezone.now()
+        rows = [
+            {
+                'id': i,
+                'project_id': i % 50,
+                'title': f'Task {i}',
+                'description': 'Transcript follow-up ' * 20,
+                'status': ('todo', 'in_progress', 'done')[i % 3],
+                'assignee_email': f'user{i % 100}@example.com',
+                'due_date': now + timedelta(days=i % 30),
+                'created_at': now - timedelta(minutes=i),
+            }
+            for i in range(count)
+        ]
+        return TaskSerializer.values_to_list_dict(rows)
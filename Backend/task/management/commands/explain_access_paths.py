@@ -0,0 +1,122 @@
+import random
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+
+from organization.models import Organization
+from project.models import Project
+from task.models import Task
+from taskComment.models import TaskComment
+
+# Plan fragments that show the planner used an index rather than a full scan
+INDEX_MARKERS = {
+    'sqlite': ('USING INDEX', 'USING COVERING INDEX', 'USING INTEGER PRIMARY KEY'),
+    'postgresql': ('Index Scan', 'Index Only Scan', 'Bitmap Index Scan'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the service-layer Task/TaskComment/Project queries and check that "
+        "each one is served by an index. Optionally seeds realistic volumes first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', action='store_true', help='Insert benchmark data before explaining.')
+        parser.add_argument('--projects', type=int, default=200)
+        parser.add_argument('--tasks-per-project', type=int, default=500)
+        parser.add_argument('--comments-per-task', type=int, default=3)
+        parser.add_argument('--page-size', type=int, default=100)
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in INDEX_MARKERS:
+            raise CommandError(f"Unsupported database backend: {vendor}")
+
+        if options['seed']:
+            self._seed(options['projects'], options['tasks_per_project'], options['comments_per_task'])
+
+        project = Project.objects.order_by('-task_count').first()
+        task = Task.objects.filter(project=project).first() if project else None
+        if task is None:
+            raise CommandError("No tasks found; run with --seed to create benchmark data.")
+
+        self._analyze()
+        failures = []
+        for label, queryset in self._access_paths(project, task, options['page_size']):
+            plan = queryset.explain()
+            start = time.perf_counter()
+            list(queryset)
+            elapsed = (time.perf_counter() - start) * 1000
+
+            uses_index = any(marker in plan for marker in INDEX_MARKERS[vendor])
+            status = self.style.SUCCESS('index') if uses_index else self.style.ERROR('SCAN')
+            self.stdout.write(f"[{status}] {label}: {elapsed:.2f} ms")
+            self.stdout.write('    ' + plan.replace('\n', '\n    '))
+            if not uses_index:
+                failures.append(label)
+
+        if failures:
+            raise CommandError(f"Queries without an index scan: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All access paths use an index."))
+
+    @staticmethod
+    def _access_paths(project, task, page_size):
+        """Querysets mirroring the service list, page and aggregate queries."""
+        task_ids = list(Task.objects.filter(project=project).values_list('id', flat=True)[:page_size])
+        return [
+            ('tasks by project page', Task.objects.filter(project_id=project.id)
+                .order_by('-created_at', 'id')[:page_size + 1]),
+            ('all tasks page', Task.objects.order_by('-created_at', 'id')[:page_size + 1]),
+            ('tasks by project and status', Task.objects.filter(project_id=project.id, status='done')
+                .order_by().values('id')),
+            ('comments by task page', TaskComment.objects.filter(task_id=task.id)
+                .order_by('-timestamp', 'id')[:page_size + 1]),
+            ('all comments page', TaskComment.objects.order_by('-timestamp', 'id')[:page_size + 1]),
+            ('comment counts per task', TaskComment.objects.filter(task_id__in=task_ids)
+                .order_by().values('task_id').annotate(total=Count('id'))),
+            ('projects by organization page', Project.objects.filter(organization_id=project.organization_id)
+                .order_by('-created_at', 'id')[:page_size + 1]),
+        ]
+
+    @staticmethod
+    def _analyze():
+        """Refresh planner statistics so EXPLAIN reflects the seeded volumes."""
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def _seed(self, project_count, tasks_per_project, comments_per_task):
+        self.stdout.write(
+            f"Seeding {project_count} projects x {tasks_per_project} tasks x {comments_per_task} comments..."
+        )
+        suffix = int(time.time())
+        organization = Organization.objects.create(
+            name=f'Benchmark {suffix}', slug=f'benchmark-{suffix}', contact_email='bench@example.com'
+        )
+        projects = Project.objects.bulk_create(
+            Project(organization=organization, name=f'Project {i}', status='active')
+            for i in range(project_count)
+        )
+
+        statuses = ('todo', 'in_progress', 'done')
+        for project in projects:
+            tasks = Task.objects.bulk_create(
+                Task(
+                    project=project,
+                    title=f'Task {i}',
+                    description='Transcript follow-up ' * 50,
+                    status=random.choice(statuses),
+                )
+                for i in range(tasks_per_project)
+            )
+            TaskComment.objects.bulk_create(
+                TaskComment(task=task, content='Call notes', author_email='agent@example.com')
+                for task in tasks
+                for _ in range(comments_per_task)
+            )
+
+        call_command('rebuild_task_counters', stdout=StringIO())
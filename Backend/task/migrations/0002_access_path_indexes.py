@@ -0,0 +1,25 @@
+# Generated by Django 4.2.27 on 2026-10-16 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["project", "-created_at", "id"], name="task_project_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["project", "status"], name="task_project_status_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["-created_at", "id"], name="task_created_idx"),
+        ),
+    ]
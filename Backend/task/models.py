@@ -22,6 +22,14 @@ class Task(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Task'
         verbose_name_plural = 'Tasks'
+        indexes = [
+            # Keyset pages of a project's tasks: filter project, order (-created_at, id)
+            models.Index(fields=['project', '-created_at', 'id'], name='task_project_created_idx'),
+            # Per-status counts within a project
+            models.Index(fields=['project', 'status'], name='task_project_status_idx'),
+            # Keyset pages over all tasks
+            models.Index(fields=['-created_at', 'id'], name='task_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.project.name})"
@@ -1,11 +1,16 @@
 from typing import Dict, Any, Optional
 from django.core.exceptions import ValidationError
+from config.serialization import isoformat_fields
 from .models import Task, TASK_STATUS_CHOICES
 
 
 class TaskSerializer:
     """Serializer for Task model."""
 
+    # Columns returned by list endpoints, in to_dict order
+    LIST_FIELDS = ('id', 'project_id', 'title', 'description', 'status', 'assignee_email', 'due_date', 'created_at')
+    DATE_FIELDS = ('due_date', 'created_at')
+
     @staticmethod
     def validate_create_data(data: Dict[str, Any]) -> Dict[str, Any]:
         errors = {}
@@ -105,7 +110,7 @@ class TaskSerializer:
         """
         return {
             'id': task.id,
-            'project_id': task.project.id,
+            'project_id': task.project_id,
             'title': task.title,
             'description': task.description,
             'status': task.status,
@@ -117,3 +122,10 @@ class TaskSerializer:
     @staticmethod
     def to_list_dict(tasks: list[Task]) -> list[Dict[str, Any]]:
         return [TaskSerializer.to_dict(task) for task in tasks]
+
+    @staticmethod
+    def values_to_list_dict(rows: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
+        """
+        Format rows fetched with .values(*LIST_FIELDS) without building model instances.
+        """
+        return isoformat_fields(rows, TaskSerializer.DATE_FIELDS)
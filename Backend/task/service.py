@@ -1,8 +1,32 @@
-from typing import Optional
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Optional, Iterator
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.db.models import F, QuerySet
 from .models import Task
 from project.models import Project
+from config.db.routing import replica_reads
+from config.pagination import Page, paginate
+from config.bulk import BulkResult
+from config.read_cache import (
+    cached_list,
+    invalidate_organizations,
+    organization_for_project,
+    organization_scope,
+    set_task_project,
+)
+
+
+# Project counter column for each task status
+STATUS_COUNTER_FIELDS = {
+    'todo': 'todo_task_count',
+    'in_progress': 'in_progress_task_count',
+    'done': 'done_task_count',
+}
+
+# Task columns accepted by the bulk create/update methods
+BULK_FIELDS = ('project_id', 'title', 'description', 'status', 'assignee_email', 'due_date')
 
 
 class TaskService:
@@ -31,7 +55,9 @@ class TaskService:
                 due_date=due_date
             )
             task.full_clean()
-            task.save()
+            with transaction.atomic():
+                task.save()
+                TaskService._adjust_counters(project.id, status, 1)
             return task
         except Project.DoesNotExist:
             raise ValidationError(f"Project with ID {project_id} does not exist.")
@@ -41,16 +67,24 @@ class TaskService:
             raise
 
     @staticmethod
-    def get_task_by_id(task_id: int) -> Optional[Task]:
+    def get_task_by_id(
+        task_id: int,
+        optimize: Optional[Callable[[QuerySet], QuerySet]] = None
+    ) -> Optional[Task]:
         """
         Retrieve a task by ID.
+        optimize, if given, is applied to the queryset before it is evaluated.
         """
+        queryset = Task.objects.all()
+        if optimize:
+            queryset = optimize(queryset)
         try:
-            return Task.objects.get(id=task_id)
+            return queryset.get(id=task_id)
         except Task.DoesNotExist:
             return None
 
     @staticmethod
+    @replica_reads()
     def get_all_tasks() -> list[Task]:
         """
         Retrieve all tasks.
@@ -58,11 +92,61 @@ class TaskService:
         return list(Task.objects.all())
 
     @staticmethod
-    def get_tasks_by_project(project_id: int) -> list[Task]:
+    @replica_reads()
+    def get_tasks_by_project(
+        project_id: int,
+        optimize: Optional[Callable[[QuerySet], QuerySet]] = None
+    ) -> list[Task]:
+        """
+        Retrieve all tasks for a specific project, through the read cache.
+        optimize, if given, is applied to the queryset before it is evaluated.
+        """
+        queryset = Task.objects.filter(project_id=project_id)
+        if optimize:
+            queryset = optimize(queryset)
+        organization_id = organization_for_project(project_id)
+        if organization_id is None:
+            return list(queryset)
+        return cached_list('tasks', [organization_scope(organization_id)], queryset)
+
+    @staticmethod
+    @replica_reads()
+    def get_tasks_page(
+        project_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        fields: Optional[tuple] = None,
+        optimize: Optional[Callable[[QuerySet], QuerySet]] = None
+    ) -> Page:
         """
-        Retrieve all tasks for a specific project.
+        Retrieve one page of tasks, optionally for a specific project.
+        When fields is given, rows are fetched as dictionaries of those columns;
+        otherwise optimize, if given, is applied to the model queryset.
         """
-        return list(Task.objects.filter(project_id=project_id))
+        queryset = Task.objects.all()
+        if project_id:
+            queryset = queryset.filter(project_id=project_id)
+        if fields:
+            queryset = queryset.values(*fields)
+        elif optimize:
+            queryset = optimize(queryset)
+        return paginate(queryset, limit=limit, after=after)
+
+    @staticmethod
+    @replica_reads()
+    def iter_tasks(
+        project_id: Optional[int] = None,
+        fields: tuple = (),
+        chunk_size: int = 2000
+    ) -> Iterator[dict]:
+        """
+        Stream task rows as dictionaries using a server-side cursor.
+        """
+        queryset = Task.objects.order_by('-created_at', 'id')
+        if project_id:
+            queryset = queryset.filter(project_id=project_id)
+        # Bind the database now: the iterator is consumed after this call returns
+        return queryset.using(queryset.db).values(*fields).iterator(chunk_size=chunk_size)
 
     @staticmethod
     def update_task(task_id: int, **kwargs) -> Optional[Task]:
@@ -89,7 +173,15 @@ class TaskService:
                     setattr(task, field, value)
             
             task.full_clean()
-            task.save()
+            with transaction.atomic():
+                # Lock the row so concurrent updates see each other's status/project
+                old_project_id, old_status = Task.objects.select_for_update().values_list(
+                    'project_id', 'status'
+                ).get(id=task.id)
+                task.save()
+                if (task.project_id, task.status) != (old_project_id, old_status):
+                    TaskService._adjust_counters(old_project_id, old_status, -1)
+                    TaskService._adjust_counters(task.project_id, task.status, 1)
             return task
         except IntegrityError as e:
             raise ValidationError(f"Error updating task: {str(e)}")
@@ -105,5 +197,211 @@ class TaskService:
         if not task:
             return False
         
-        task.delete()
+        with transaction.atomic():
+            current = Task.objects.select_for_update().filter(id=task.id).values_list(
+                'project_id', 'status'
+            ).first()
+            if current is None:
+                return False
+            task.delete()
+            TaskService._adjust_counters(*current, -1)
         return True
+
+    @staticmethod
+    def bulk_create_tasks(items: list[Dict[str, Any]], allow_partial: bool = False) -> BulkResult:
+        """
+        Validate and create many tasks in one transaction.
+
+        Referenced projects are resolved with one query and tasks are inserted
+        with bulk_create in BULK_BATCH_SIZE batches; project counters get one
+        UPDATE per project. Invalid items are reported by index. Unless
+        allow_partial is set, nothing is written when any item is invalid.
+
+        Args:
+            items: Dictionaries with BULK_FIELDS keys (description, assignee_email and due_date optional)
+            allow_partial: Create the valid items even if others are rejected
+
+        Returns:
+            BulkResult with the created tasks and per-item errors
+        """
+        result = BulkResult()
+        organizations = TaskService._project_organizations(item.get('project_id') for item in items)
+
+        tasks = []
+        for index, data in enumerate(items):
+            task = Task(
+                project_id=data.get('project_id'),
+                title=data.get('title', ''),
+                description=data.get('description') or '',
+                status=data.get('status', ''),
+                assignee_email=data.get('assignee_email') or '',
+                due_date=data.get('due_date'),
+            )
+            errors = TaskService._bulk_errors(task, organizations)
+            if errors:
+                result.add_error(index, errors)
+            else:
+                tasks.append(task)
+
+        if not tasks or (result.errors and not allow_partial):
+            return result
+
+        with transaction.atomic():
+            result.items = Task.objects.bulk_create(tasks, batch_size=settings.BULK_BATCH_SIZE)
+            TaskService._apply_counter_deltas(Counter((task.project_id, task.status) for task in tasks))
+            # bulk_create sends no signals
+            invalidate_organizations(*{organizations[task.project_id] for task in tasks})
+        return result
+
+    @staticmethod
+    def bulk_update_tasks(items: list[Dict[str, Any]], allow_partial: bool = False) -> BulkResult:
+        """
+        Validate and update many tasks in one transaction.
+
+        Each item carries the task 'id' plus the BULK_FIELDS to change; an id
+        may appear once per request. Tasks
+        are locked and loaded with one query, target projects resolved with
+        one more, and rows written with bulk_update. Counters follow status
+        and project changes.
+
+        Returns:
+            BulkResult with the updated tasks and per-item errors
+        """
+        result = BulkResult()
+        with transaction.atomic():
+            task_ids = [item.get('id') for item in items if isinstance(item.get('id'), int)]
+            tasks = Task.objects.select_for_update().in_bulk(task_ids)
+            organizations = TaskService._project_organizations(
+                [item['project_id'] for item in items if 'project_id' in item]
+                + [task.project_id for task in tasks.values()]
+            )
+
+            updated = {}
+            changed_fields = set()
+            deltas = Counter()
+            for index, data in enumerate(items):
+                task = tasks.get(data.get('id'))
+                if task is None:
+                    result.add_error(index, {'id': [f"Task with ID {data.get('id')} does not exist."]})
+                    continue
+                if task.id in updated:
+                    # A second update would lose the task's original project (and its counters)
+                    result.add_error(index, {'id': [f"Task with ID {task.id} appears more than once."]})
+                    continue
+
+                previous = {field: getattr(task, field) for field in BULK_FIELDS}
+                fields = [field for field in BULK_FIELDS if field in data]
+                for field in fields:
+                    setattr(task, field, data[field])
+                errors = TaskService._bulk_errors(task, organizations)
+                if errors:
+                    for field, value in previous.items():
+                        setattr(task, field, value)
+                    result.add_error(index, errors)
+                    continue
+
+                deltas[(previous['project_id'], previous['status'])] -= 1
+                deltas[(task.project_id, task.status)] += 1
+                changed_fields.update(fields)
+                updated[task.id] = (task, previous['project_id'])
+
+            if not updated or (result.errors and not allow_partial):
+                return result
+
+            Task.objects.bulk_update(
+                [task for task, _ in updated.values()], sorted(changed_fields),
+                batch_size=settings.BULK_BATCH_SIZE
+            )
+            TaskService._apply_counter_deltas(deltas)
+            # bulk_update sends no signals
+            for task, previous_project_id in updated.values():
+                if task.project_id != previous_project_id:
+                    set_task_project(task.id, task.project_id)
+            invalidate_organizations(*{
+                organizations.get(project_id)
+                for task, previous_project_id in updated.values()
+                for project_id in (task.project_id, previous_project_id)
+            })
+        result.items = [task for task, _ in updated.values()]
+        return result
+
+    @staticmethod
+    def bulk_delete_tasks(task_ids: list[int]) -> BulkResult:
+        """
+        Delete many tasks in one transaction, reporting ids that do not exist.
+
+        Returns:
+            BulkResult whose items are the deleted task ids
+        """
+        result = BulkResult()
+        with transaction.atomic():
+            rows = {
+                task_id: (project_id, status)
+                for task_id, project_id, status in Task.objects.select_for_update().filter(
+                    id__in=[task_id for task_id in task_ids if isinstance(task_id, int)]
+                ).values_list('id', 'project_id', 'status')
+            }
+            for index, task_id in enumerate(task_ids):
+                if task_id not in rows:
+                    result.add_error(index, {'id': [f"Task with ID {task_id} does not exist."]})
+            if not rows:
+                return result
+
+            Task.objects.filter(id__in=rows).delete()
+            deltas = Counter()
+            for key in rows.values():
+                deltas[key] -= 1
+            TaskService._apply_counter_deltas(deltas)
+        result.items = list(dict.fromkeys(task_id for task_id in task_ids if task_id in rows))
+        return result
+
+    @staticmethod
+    def _project_organizations(project_ids: Iterable[Any]) -> Dict[int, int]:
+        """Map the existing projects among project_ids to their organization ids, in one query."""
+        ids = {project_id for project_id in project_ids if isinstance(project_id, int)}
+        return dict(Project.objects.filter(id__in=ids).values_list('id', 'organization_id'))
+
+    @staticmethod
+    def _bulk_errors(task: Task, organizations: Dict[int, int]) -> Dict[str, list]:
+        """
+        Model validation of a task without per-row queries: the project is
+        checked against the pre-fetched organizations map instead.
+        """
+        errors = {}
+        try:
+            task.full_clean(exclude=['project'], validate_unique=False)
+        except ValidationError as e:
+            errors.update(e.message_dict)
+        if task.project_id not in organizations:
+            errors['project_id'] = [f"Project with ID {task.project_id} does not exist."]
+        return errors
+
+    @staticmethod
+    def _apply_counter_deltas(deltas: Dict[tuple, int]) -> None:
+        """
+        Apply (project_id, status) -> delta changes with one UPDATE per project.
+        """
+        per_project: Dict[int, Dict[str, int]] = {}
+        for (project_id, status), delta in deltas.items():
+            if not delta:
+                continue
+            changes = per_project.setdefault(project_id, {})
+            changes['task_count'] = changes.get('task_count', 0) + delta
+            status_field = STATUS_COUNTER_FIELDS.get(status)
+            if status_field:
+                changes[status_field] = changes.get(status_field, 0) + delta
+        for project_id, changes in per_project.items():
+            updates = {field: F(field) + delta for field, delta in changes.items() if delta}
+            if updates:
+                Project.objects.filter(id=project_id).update(**updates)
+
+    @staticmethod
+    def _adjust_counters(project_id: int, status: str, delta: int) -> None:
+        """
+        Apply a +1/-1 change to a project's total and per-status task counters.
+        """
+        updates = {'task_count': F('task_count') + delta}
+        status_field = STATUS_COUNTER_FIELDS.get(status)
+        if status_field:
+            updates[status_field] = F(status_field) + delta
+        Project.objects.filter(id=project_id).update(**updates)
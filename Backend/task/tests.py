@@ -1,3 +1,359 @@
-from django.test import TestCase
+import json
+from io import StringIO
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from config.loaders import CountLoader
+from config.query_cost import _client_address
+from organization.models import Organization
+from project.models import Project
+from taskComment.models import TaskComment
+from .models import Task
+from .serializers import TaskSerializer
+from .service import TaskService
+
+
+class GraphQLCountFieldTests(TestCase):
+    """Count fields of a list are resolved with a constant number of queries."""
+
+    def setUp(self):
+        cache.clear()
+        self.organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        self.project = Project.objects.create(organization=self.organization, name='Launch', status='active')
+        for i in range(5):
+            task = TaskService.create_task(project_id=self.project.id, title=f'Task {i}', status='done' if i < 2 else 'todo')
+            for _ in range(i):
+                TaskComment.objects.create(task=task, content='Note', author_email='dev@acme.com')
+
+    def query(self, query, queries):
+        with self.assertNumQueries(queries):
+            response = self.client.post('/graphql/', {'query': query}, content_type='application/json')
+        return response.json()['data']
+
+    def test_comment_counts_are_batched(self):
+        # tasks, then one grouped count for all of them
+        data = self.query('{ tasksByProject(projectId: %d) { title commentCount } }' % self.project.id, 2)
+        counts = {task['title']: task['commentCount'] for task in data['tasksByProject']}
+        self.assertEqual(counts, {f'Task {i}': i for i in range(5)})
+
+    def test_comment_counts_of_nested_tasks_are_batched(self):
+        # search hits, the comments with their tasks, then one grouped count for the tasks
+        data = self.query('{ searchComments(query: "Note") { edges { node { task { title commentCount } } } } }', 3)
+        counts = {edge['node']['task']['title']: edge['node']['task']['commentCount']
+                  for edge in data['searchComments']['edges']}
+        self.assertEqual(counts, {f'Task {i}': i for i in range(1, 5)})
+
+    def test_project_counts_need_no_extra_queries(self):
+        Project.objects.create(organization=self.organization, name='Empty', status='active')
+        # the counts are columns of the project rows
+        data = self.query(
+            '{ projectsByOrganization(organizationId: %d) { name taskCount completedTaskCount completionRate } }'
+            % self.organization.id, 1
+        )
+        self.assertEqual(sorted(data['projectsByOrganization'], key=lambda project: project['name']), [
+            {'name': 'Empty', 'taskCount': 0, 'completedTaskCount': 0, 'completionRate': 0.0},
+            {'name': 'Launch', 'taskCount': 5, 'completedTaskCount': 2, 'completionRate': 40.0},
+        ])
+
+    def test_loader_resolves_registered_keys_in_one_batch(self):
+        calls = []
+
+        def batch(keys):
+            calls.append(sorted(keys))
+            return {key: key * 10 for key in keys if key != 3}
+
+        loader = CountLoader(batch, 0)
+        loader.register([1, 2, 3])
+        self.assertEqual([loader.load(1), loader.load(2), loader.load(3)], [10, 20, 0])
+        self.assertEqual(calls, [[1, 2, 3]])
+
+
+class TaskListQueryCountTests(TestCase):
+    """List serialization must not lazy-load the project of each task."""
+
+    def setUp(self):
+        organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        self.project = Project.objects.create(organization=organization, name='Launch', status='active')
+        for i in range(5):
+            Task.objects.create(project=self.project, title=f'Task {i}', status='todo')
+
+    def test_list_query_count_is_constant(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/tasks/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 5)
+
+    def test_project_list_query_count_is_constant(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/tasks/project/{self.project.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'][0]['project_id'], self.project.id)
+
+
+@override_settings(DEFAULT_PAGE_SIZE=2, EXPORT_CHUNK_SIZE=2)
+class TaskExportTests(TestCase):
+    """?format= streams every matching row instead of one page."""
+
+    def setUp(self):
+        organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        self.project = Project.objects.create(organization=organization, name='Launch', status='active')
+        other = Project.objects.create(organization=organization, name='Other', status='active')
+        for i in range(5):
+            Task.objects.create(project=self.project, title=f'Task {i}', status='todo')
+        Task.objects.create(project=other, title='Elsewhere', status='todo')
+
+    def export(self, export_format):
+        response = self.client.get('/api/tasks/', {'format': export_format, 'project_id': self.project.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    def test_ndjson(self):
+        response, body = self.export('ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(sorted(row['title'] for row in rows), [f'Task {i}' for i in range(5)])
+        self.assertEqual(set(rows[0]), set(TaskSerializer.LIST_FIELDS))
+
+    def test_json_array_matches_ndjson(self):
+        response, body = self.export('json-stream')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        _, ndjson = self.export('ndjson')
+        self.assertEqual(json.loads(body), [json.loads(line) for line in ndjson.splitlines()])
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get('/api/tasks/', {'format': 'csv'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('format', response.json()['errors'])
+
+    def test_invalid_project_id_is_rejected(self):
+        for params in ({'project_id': 'abc'}, {'project_id': 'abc', 'format': 'ndjson'}):
+            with self.subTest(params=params):
+                response = self.client.get('/api/tasks/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('project_id', response.json()['errors'])
+
+
+class TaskCounterTests(TestCase):
+    """TaskService keeps the denormalized Project task counters in sync."""
+
+    def setUp(self):
+        organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        self.project = Project.objects.create(organization=organization, name='Launch', status='active')
+        self.other_project = Project.objects.create(organization=organization, name='Docs', status='active')
+
+    def counters(self, project):
+        project.refresh_from_db()
+        return (project.task_count, project.todo_task_count, project.in_progress_task_count, project.done_task_count)
+
+    def test_create_update_move_and_delete(self):
+        task = TaskService.create_task(project_id=self.project.id, title='Kickoff', status='todo')
+        TaskService.create_task(project_id=self.project.id, title='Ship', status='done')
+        self.assertEqual(self.counters(self.project), (2, 1, 0, 1))
+
+        TaskService.update_task(task.id, status='in_progress')
+        self.assertEqual(self.counters(self.project), (2, 0, 1, 1))
+
+        TaskService.update_task(task.id, project_id=self.other_project.id, status='done')
+        self.assertEqual(self.counters(self.project), (1, 0, 0, 1))
+        self.assertEqual(self.counters(self.other_project), (1, 0, 0, 1))
+
+        TaskService.delete_task(task.id)
+        self.assertEqual(self.counters(self.other_project), (0, 0, 0, 0))
+
+    def test_rebuild_command_repairs_drift(self):
+        Task.objects.create(project=self.project, title='Imported', status='todo')
+        with self.assertRaises(CommandError):
+            call_command('rebuild_task_counters', '--verify', stdout=StringIO())
+
+        call_command('rebuild_task_counters', stdout=StringIO())
+        self.assertEqual(self.counters(self.project), (1, 1, 0, 0))
+        call_command('rebuild_task_counters', '--verify', stdout=StringIO())
+
+    def test_rebuild_counts_after_locking_the_projects(self):
+        with CaptureQueriesContext(connection) as queries:
+            call_command('rebuild_task_counters', '--verify', stdout=StringIO())
+        tables = [query['sql'].split(' FROM ')[1].split()[0].strip('"') for query in queries
+                  if query['sql'].startswith('SELECT')]
+        self.assertEqual(tables, ['project_project', 'task_task'])
+
+
+class GraphQLQueryCostTests(TestCase):
+    """Operations are costed before execution and rejected over budget."""
+
+    QUERY = 'query($id: Int!, $n: Int) { tasksByProjectConnection(projectId: $id, first: $n) { edges { node { id commentCount } } } }'
+
+    def setUp(self):
+        organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        self.project = Project.objects.create(organization=organization, name='Launch', status='active')
+
+    def post(self, first):
+        return self.client.post(
+            '/graphql/',
+            {'query': self.QUERY, 'variables': {'id': self.project.id, 'n': first}},
+            content_type='application/json',
+        )
+
+    def test_cost_is_reported(self):
+        response = self.post(10)
+        self.assertEqual(response.status_code, 200)
+        # connection 1 + 10 x (edges 1 + node 1 + commentCount 1)
+        self.assertEqual(response.json()['extensions']['cost']['requested'], 31)
+
+    def test_over_budget_is_rejected(self):
+        with override_settings(GRAPHQL_COST={**settings.GRAPHQL_COST, 'MAX_COST': 100}):
+            response = self.post(50)
+        self.assertEqual(response.status_code, 400)
+        error = response.json()['errors'][0]
+        self.assertEqual(error['extensions']['code'], 'QUERY_TOO_EXPENSIVE')
+        self.assertNotIn('data', response.json())
+
+    def test_invalid_variable_is_a_request_error(self):
+        response = self.post('abc')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('$n', response.json()['errors'][0]['message'])
+
+    def test_budget_is_charged_to_the_connecting_address(self):
+        cache.clear()
+        with override_settings(GRAPHQL_COST={**settings.GRAPHQL_COST, 'COST_PER_MINUTE': 50}):
+            self.assertEqual(self.post(10).status_code, 200)
+            # A forged X-Forwarded-For does not open a fresh budget
+            response = self.client.post(
+                '/graphql/', {'query': self.QUERY, 'variables': {'id': self.project.id, 'n': 10}},
+                content_type='application/json', HTTP_X_FORWARDED_FOR='203.0.113.9',
+            )
+        self.assertEqual(response.json()['errors'][0]['extensions']['code'], 'COST_RATE_LIMITED')
+
+    def test_trusted_proxy_forwards_the_client_address(self):
+        request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.2', HTTP_X_FORWARDED_FOR='198.51.100.7, 203.0.113.9, 10.0.0.1')
+        with override_settings(GRAPHQL_COST={**settings.GRAPHQL_COST, 'TRUSTED_PROXIES': ['10.0.0.1', '10.0.0.2']}):
+            self.assertEqual(_client_address(request), '203.0.113.9')
+        self.assertEqual(_client_address(request), '10.0.0.2')
+
+
+class GraphQLProjectionTests(TestCase):
+    """List resolvers load only the columns and relations the query selects."""
+
+    def setUp(self):
+        organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        self.project = Project.objects.create(organization=organization, name='Launch', status='active')
+        for i in range(3):
+            TaskService.create_task(project_id=self.project.id, title=f'Task {i}', status='todo',
+                                    description='x' * 4096)
+
+    def query(self, selection):
+        query = 'query($id: Int!) { tasksByProject(projectId: $id) { %s } }' % selection
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                '/graphql/', {'query': query, 'variables': {'id': self.project.id}},
+                content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']['tasksByProject'], [q['sql'] for q in ctx.captured_queries]
+
+    def test_unselected_columns_are_deferred(self):
+        tasks, queries = self.query('id title')
+        self.assertEqual(len(tasks), 3)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('description', queries[0])
+
+    def test_nested_relations_are_joined(self):
+        tasks, queries = self.query('title project { name organization { slug } }')
+        self.assertEqual(tasks[0]['project']['organization']['slug'], 'acme')
+        self.assertEqual(len(queries), 1)
+
+
+class TaskConditionalRequestTests(TestCase):
+    """Unchanged task resources answer If-None-Match with 304."""
+
+    def setUp(self):
+        organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        self.project = Project.objects.create(organization=organization, name='Launch', status='active')
+        self.task = TaskService.create_task(project_id=self.project.id, title='Kickoff', status='todo')
+
+    def test_not_modified_until_a_write(self):
+        url = f'/api/tasks/project/{self.project.id}/'
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        TaskService.update_task(self.task.id, status='done')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['data'][0]['status'], 'done')
+
+    def test_no_etag_without_the_read_cache(self):
+        url = f'/api/tasks/project/{self.project.id}/'
+        etag = self.client.get(url)['ETag']
+        with override_settings(READ_CACHE={**settings.READ_CACHE, 'ENABLED': False}):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_detail_etag_depends_on_the_path(self):
+        detail = self.client.get(f'/api/tasks/{self.task.id}/')
+        listing = self.client.get(f'/api/tasks/project/{self.project.id}/')
+        self.assertNotEqual(detail['ETag'], listing['ETag'])
+
+
+class TaskBulkTests(TestCase):
+    """Bulk endpoints validate per item and keep project counters in sync."""
+
+    def setUp(self):
+        organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        self.project = Project.objects.create(organization=organization, name='Launch', status='active')
+        self.other = Project.objects.create(organization=organization, name='Other', status='active')
+
+    def request(self, method, body):
+        return getattr(self.client, method)('/api/tasks/bulk/', body, content_type='application/json')
+
+    def test_invalid_item_rejects_the_batch(self):
+        items = [
+            {'project_id': self.project.id, 'title': 'Valid', 'status': 'todo'},
+            {'project_id': 999, 'title': 'Orphan', 'status': 'todo'},
+        ]
+        response = self.request('post', {'items': items})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'][0]['index'], 1)
+        self.assertIn('project_id', response.json()['errors'][0]['errors'])
+        self.assertFalse(Task.objects.exists())
+
+    def test_create_update_delete_keep_counters(self):
+        items = [{'project_id': self.project.id, 'title': f'Task {i}', 'status': 'todo'} for i in range(20)]
+        with self.assertNumQueries(5):
+            response = self.request('post', {'items': items})
+        self.assertEqual(response.status_code, 201)
+        ids = [task['id'] for task in response.json()['data']]
+
+        response = self.request('patch', {'items': [
+            {'id': ids[0], 'status': 'done'},
+            {'id': ids[1], 'project_id': self.other.id},
+        ]})
+        self.assertEqual(response.status_code, 200)
+        response = self.request('delete', {'ids': ids[2:5]})
+        self.assertEqual(response.json()['data'], ids[2:5])
+
+        self.project.refresh_from_db()
+        self.other.refresh_from_db()
+        self.assertEqual((self.project.task_count, self.project.done_task_count), (16, 1))
+        self.assertEqual(self.other.task_count, 1)
+        call_command('rebuild_task_counters', verify=True, stdout=StringIO())
+
+    def test_duplicate_ids_are_rejected(self):
+        task = TaskService.create_task(project_id=self.project.id, title='Kickoff', status='todo')
+        response = self.request('patch', {'items': [
+            {'id': task.id, 'project_id': self.other.id},
+            {'id': task.id, 'status': 'done'},
+        ]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'][0]['index'], 1)
+        task.refresh_from_db()
+        self.assertEqual((task.project_id, task.status), (self.project.id, 'todo'))
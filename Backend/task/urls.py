@@ -2,6 +2,7 @@ from django.urls import path
 from .views import (
     TaskListView,
     TaskDetailView,
+    TaskBulkView,
     ProjectTaskListView
 )
 
@@ -11,6 +12,9 @@ urlpatterns = [
     # List all tasks or create a new one
     path('', TaskListView.as_view(), name='list-create'),
     
+    # Create, update, or delete many tasks at once
+    path('bulk/', TaskBulkView.as_view(), name='bulk'),
+    
     # Get, update, or delete a specific task by ID
     path('<int:task_id>/', TaskDetailView.as_view(), name='detail'),
     
@@ -1,37 +1,70 @@
 import json
-from django.http import JsonResponse
+from django.conf import settings
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.core.exceptions import ValidationError
 from .service import TaskService
 from .serializers import TaskSerializer
+from config.pagination import get_int_param, get_page_params
+from config.responses import JsonResponse
+from config.streaming import get_stream_format, stream_rows
+from config.bulk import BulkResult, check_bulk_size, error_dict, merge_errors, read_bulk_body, validate_items
+from config.etags import all_etag, conditional, project_etag, task_etag
 
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(conditional(all_etag), name='get')
 class TaskListView(View):
     """View for listing all tasks and creating new tasks."""
 
     def get(self, request):
         """
         List all tasks.
+        
+        Query parameters:
+            - project_id: Optional filter
+            - limit, after: Keyset pagination (see config.pagination)
+            - format: ndjson or json-stream to stream every row instead of one page
         """
         try:
-            project_id = request.GET.get('project_id', '').strip()
+            project_id = get_int_param(request, 'project_id')
+            export_format = get_stream_format(request)
             
-            if project_id:
-                tasks = TaskService.get_tasks_by_project(int(project_id))
-            else:
-                tasks = TaskService.get_all_tasks()
+            if export_format:
+                rows = TaskService.iter_tasks(
+                    project_id=project_id,
+                    fields=TaskSerializer.LIST_FIELDS,
+                    chunk_size=settings.EXPORT_CHUNK_SIZE
+                )
+                return stream_rows(rows, export_format, TaskSerializer.values_to_list_dict)
+            
+            limit, after = get_page_params(request)
             
-            data = TaskSerializer.to_list_dict(tasks)
+            page = TaskService.get_tasks_page(
+                project_id=project_id,
+                limit=limit,
+                after=after,
+                fields=TaskSerializer.LIST_FIELDS
+            )
+            
+            data = TaskSerializer.values_to_list_dict(page.items)
             
             return JsonResponse({
                 'success': True,
                 'data': data,
-                'count': len(data)
+                'count': len(data),
+                'next_cursor': page.next_cursor,
+                'has_next': page.has_next
             }, status=200)
         
+        except ValidationError as e:
+            return JsonResponse({
+                'success': False,
+                'error': 'Validation failed.',
+                'errors': e.message_dict if hasattr(e, 'message_dict') else {'detail': str(e)}
+            }, status=400)
+        
         except Exception as e:
             return JsonResponse({
                 'success': False,
@@ -74,6 +107,7 @@ class TaskListView(View):
 
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(conditional(task_etag), name='get')
 class TaskDetailView(View):
     """View for retrieving, updating, and deleting a specific task."""
 
@@ -182,6 +216,7 @@ class TaskDetailView(View):
 
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(conditional(project_etag), name='get')
 class ProjectTaskListView(View):
     """View for listing all tasks for a specific project."""
 
@@ -190,16 +225,141 @@ class ProjectTaskListView(View):
         List all tasks for a specific project.
         """
         try:
-            tasks = TaskService.get_tasks_by_project(project_id)
+            limit, after = get_page_params(request)
+            page = TaskService.get_tasks_page(
+                project_id=project_id, limit=limit, after=after, fields=TaskSerializer.LIST_FIELDS
+            )
             
-            data = TaskSerializer.to_list_dict(tasks)
+            data = TaskSerializer.values_to_list_dict(page.items)
             
             return JsonResponse({
                 'success': True,
                 'data': data,
-                'count': len(data)
+                'count': len(data),
+                'next_cursor': page.next_cursor,
+                'has_next': page.has_next
             }, status=200)
         
+        except ValidationError as e:
+            return JsonResponse({
+                'success': False,
+                'error': 'Validation failed.',
+                'errors': e.message_dict if hasattr(e, 'message_dict') else {'detail': str(e)}
+            }, status=400)
+        
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=500)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class TaskBulkView(View):
+    """
+    View for creating, updating and deleting many tasks per request.
+
+    POST/PATCH take {"items": [...], "allow_partial": false}; DELETE takes
+    {"ids": [...]}. Errors are reported per item as {"index", "errors"}.
+    """
+
+    def post(self, request):
+        """Create tasks in bulk."""
+        return self._write(request, self._validate_create, TaskService.bulk_create_tasks, 201, 'created')
+
+    def patch(self, request):
+        """Update tasks in bulk (partial updates, each item identified by "id")."""
+        return self._write(request, self._validate_update, TaskService.bulk_update_tasks, 200, 'updated')
+
+    def delete(self, request):
+        """Delete tasks in bulk."""
+        try:
+            body_data = read_bulk_body(request)
+            task_ids = check_bulk_size(body_data.get('ids') if isinstance(body_data, dict) else None)
+
+            result = TaskService.bulk_delete_tasks(task_ids)
+
+            return JsonResponse({
+                'success': result.ok,
+                'data': result.items,
+                'errors': result.errors,
+                'message': f'{len(result.items)} task(s) deleted.'
+            }, status=200 if result.items or result.ok else 400)
+
+        except json.JSONDecodeError:
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid JSON in request body.'
+            }, status=400)
+
+        except ValidationError as e:
+            return JsonResponse({
+                'success': False,
+                'error': 'Validation failed.',
+                'errors': error_dict(e)
+            }, status=400)
+
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=500)
+
+    @staticmethod
+    def _validate_create(item):
+        return TaskSerializer.validate_create_data(item)
+
+    @staticmethod
+    def _validate_update(item):
+        task_id = item.get('id')
+        if not isinstance(task_id, int):
+            raise ValidationError({'id': 'Task ID is required and must be an integer.'})
+        return {'id': task_id, **TaskSerializer.validate_update_data(item)}
+
+    def _write(self, request, validate, write, success_status, verb):
+        try:
+            try:
+                body_data = read_bulk_body(request)
+            except json.JSONDecodeError:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Invalid JSON in request body.'
+                }, status=400)
+
+            if not isinstance(body_data, dict):
+                body_data = {}
+            items = check_bulk_size(body_data.get('items'))
+            allow_partial = bool(body_data.get('allow_partial', False))
+
+            # Request-level validation per item, then model validation in the service
+            valid_items, positions, errors = validate_items(items, validate)
+
+            result = BulkResult()
+            if valid_items and (allow_partial or not errors):
+                result = write(valid_items, allow_partial=allow_partial)
+            errors = merge_errors(errors, result, positions)
+
+            if not result.items:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Validation failed.',
+                    'errors': errors
+                }, status=400)
+
+            return JsonResponse({
+                'success': not errors,
+                'data': TaskSerializer.to_list_dict(result.items),
+                'errors': errors,
+                'message': f'{len(result.items)} task(s) {verb}.'
+            }, status=success_status)
+
+        except ValidationError as e:
+            return JsonResponse({
+                'success': False,
+                'error': 'Validation failed.',
+                'errors': error_dict(e)
+            }, status=400)
+
         except Exception as e:
             return JsonResponse({
                 'success': False,
@@ -1,15 +1,36 @@
 from django.contrib import admin
+from django.db.models import Q
+from config.search import COMMENT_SEARCH
+from task.models import Task
 from .models import TaskComment
 
 
 @admin.register(TaskComment)
 class TaskCommentAdmin(admin.ModelAdmin):
     list_display = ('author_email', 'task', 'content_preview', 'timestamp')
-    list_filter = ('timestamp', 'task')
+    # A task filter would load and render every task (and its project) on each page
+    list_filter = ('timestamp',)
+    list_select_related = ('task__project',)
     search_fields = ('author_email', 'content', 'task__title')
+    # Skip the unfiltered COUNT(*) over every comment
+    show_full_result_count = False
     readonly_fields = ('timestamp',)
     date_hierarchy = 'timestamp'
     
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Search content and author email through the comment search index, and
+        task titles through a subquery on the task table instead of a join.
+        """
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        matching_tasks = Task.objects.filter(title__icontains=search_term).values('id')
+        queryset = queryset.filter(
+            COMMENT_SEARCH.matches(search_term, queryset.db) | Q(task_id__in=matching_tasks)
+        )
+        return queryset, False
+    
     def content_preview(self, obj):
         """Return a preview of the comment content."""
         return obj.content[:50] + '...' if len(obj.content) > 50 else obj.content
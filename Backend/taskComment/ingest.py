@@ -0,0 +1,225 @@
+import atexit
+import logging
+import math
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connection
+
+from config.responses import json_dumps
+from .models import TaskComment
+from .service import TaskCommentService
+
+logger = logging.getLogger('taskcomment.ingest')
+
+
+class IngestUnavailableError(Exception):
+    """Raised by put() while queued writes are failing and waiting to be retried."""
+
+
+class CommentIngestQueue:
+    """
+    In-process buffer of validated comments, written in batches.
+
+    A background thread flushes the buffer once FLUSH_SIZE comments are
+    pending or FLUSH_INTERVAL seconds after the oldest pending one arrived,
+    whichever comes first. When MAX_PENDING comments are waiting, put()
+    flushes in the caller instead, so a burst cannot grow the buffer without
+    bound. Pending comments live in process memory: they are flushed at
+    interpreter exit but are lost if the process is killed.
+
+    A batch whose write fails is put back and retried after RETRY_BACKOFF
+    seconds, doubling up to RETRY_BACKOFF_MAX, and appended to the
+    DEAD_LETTER_PATH file (JSON lines) after MAX_RETRIES failed retries.
+    put() refuses new comments while a retry is pending.
+    """
+
+    def __init__(
+        self,
+        flush_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_pending: Optional[int] = None,
+        start_worker: bool = True,
+        max_retries: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+        dead_letter_path: Optional[str] = None
+    ):
+        options = settings.COMMENT_INGEST
+        self.flush_size = flush_size or options['QUEUE_FLUSH_SIZE']
+        self.flush_interval = flush_interval if flush_interval is not None else options['QUEUE_FLUSH_INTERVAL']
+        self.max_pending = max_pending or options['QUEUE_MAX_PENDING']
+        self.start_worker = start_worker
+        self.max_retries = max_retries if max_retries is not None else options['MAX_RETRIES']
+        self.retry_backoff = retry_backoff if retry_backoff is not None else options['RETRY_BACKOFF']
+        self.retry_backoff_max = options['RETRY_BACKOFF_MAX']
+        self.dead_letter_path = dead_letter_path or options['DEAD_LETTER_PATH']
+
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._pending: List[TaskComment] = []
+        self._oldest: Optional[float] = None
+        self._attempts = 0
+        self._retry_at: Optional[float] = None
+        self._worker: Optional[threading.Thread] = None
+        self._stopped = False
+        self._counters = {
+            'queued': 0, 'written': 0, 'dropped': 0, 'failed': 0, 'dead_lettered': 0, 'flushes': 0,
+        }
+
+    @property
+    def failing(self) -> bool:
+        """Whether a failed batch is waiting to be retried."""
+        with self._condition:
+            return self._retry_at is not None
+
+    def retry_after(self) -> int:
+        """Seconds until the pending retry (at least 1), for Retry-After headers."""
+        with self._condition:
+            if self._retry_at is None:
+                return 1
+            return max(math.ceil(self._retry_at - time.monotonic()), 1)
+
+    def put(self, comments: List[TaskComment]) -> int:
+        """
+        Queue validated, unsaved comments (see TaskCommentService.build_comments).
+
+        Returns:
+            Number of comments queued
+
+        Raises:
+            IngestUnavailableError: If writes are failing (see failing)
+        """
+        if not comments:
+            return 0
+        with self._condition:
+            if self._retry_at is not None:
+                raise IngestUnavailableError("Queued comment writes are failing; retry later.")
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            self._pending.extend(comments)
+            self._counters['queued'] += len(comments)
+            pending = len(self._pending)
+            # Wakes the worker to flush, or to start timing the first pending comment
+            self._condition.notify()
+
+        if pending >= self.max_pending:
+            self.flush()
+        elif self.start_worker:
+            self._ensure_worker()
+        return len(comments)
+
+    def flush(self) -> int:
+        """
+        Write every pending comment now.
+
+        Returns:
+            Number of comments written
+        """
+        with self._flush_lock:
+            with self._condition:
+                comments, self._pending, self._oldest = self._pending, [], None
+            if not comments:
+                return 0
+            try:
+                written = len(TaskCommentService.write_comments(comments))
+            except Exception:
+                logger.exception("Failed to write %d queued comment(s)", len(comments))
+                self._write_failed(comments)
+                return 0
+            with self._condition:
+                self._attempts = 0
+                self._retry_at = None
+            self._count(written=written, dropped=len(comments) - written, flushes=1)
+            return written
+
+    def stop(self) -> None:
+        """Stop the worker and flush what is left."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {**self._counters, 'pending': len(self._pending)}
+
+    def _write_failed(self, comments: List[TaskComment]) -> None:
+        """Put a failed batch back for a later retry, or dead-letter it once retries are exhausted."""
+        with self._condition:
+            self._counters['failed'] += len(comments)
+            self._attempts += 1
+            if self._attempts <= self.max_retries and not self._stopped:
+                backoff = min(self.retry_backoff * 2 ** (self._attempts - 1), self.retry_backoff_max)
+                self._retry_at = time.monotonic() + backoff
+                self._pending[:0] = comments
+                self._oldest = time.monotonic()
+                self._condition.notify()
+                return
+            self._attempts = 0
+            self._retry_at = None
+        self._dead_letter(comments)
+
+    def _dead_letter(self, comments: List[TaskComment]) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.dead_letter_path) or '.', exist_ok=True)
+            with open(self.dead_letter_path, 'ab') as file:
+                for comment in comments:
+                    file.write(json_dumps({
+                        'task_id': comment.task_id,
+                        'author_email': comment.author_email,
+                        'content': comment.content,
+                    }) + b'\n')
+        except OSError:
+            logger.exception("Lost %d comment(s): cannot write %s", len(comments), self.dead_letter_path)
+            self._count(dropped=len(comments))
+            return
+        logger.error("Wrote %d comment(s) to %s after %d failed retries",
+                     len(comments), self.dead_letter_path, self.max_retries)
+        self._count(dead_lettered=len(comments))
+
+    def _count(self, **counters: int) -> None:
+        with self._condition:
+            for name, value in counters.items():
+                self._counters[name] += value
+
+    def _ensure_worker(self) -> None:
+        with self._condition:
+            if self._worker is not None or self._stopped:
+                return
+            self._worker = threading.Thread(target=self._run, name='comment-ingest', daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopped and not self._due():
+                    timeout = None
+                    if self._oldest is not None:
+                        due_at = max(self._oldest + self.flush_interval, self._retry_at or 0)
+                        timeout = max(due_at - time.monotonic(), 0)
+                    self._condition.wait(timeout)
+                if self._stopped:
+                    return
+            self.flush()
+            # Connections are per thread; don't hold this one open between flushes
+            connection.close()
+
+    def _due(self) -> bool:
+        if not self._pending:
+            return False
+        if self._retry_at is not None:
+            return time.monotonic() >= self._retry_at
+        return (
+            len(self._pending) >= self.flush_size
+            or time.monotonic() - self._oldest >= self.flush_interval
+        )
+
+
+comment_queue = CommentIngestQueue()
+atexit.register(comment_queue.stop)
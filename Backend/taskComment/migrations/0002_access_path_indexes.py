@@ -0,0 +1,21 @@
+# Generated by Django 4.2.27 on 2026-10-16 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("taskComment", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="taskcomment",
+            index=models.Index(fields=["task", "-timestamp", "id"], name="comment_task_timestamp_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="taskcomment",
+            index=models.Index(fields=["-timestamp", "id"], name="comment_timestamp_idx"),
+        ),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations
+
+# The search objects of config.search.COMMENT_SEARCH as of this migration, frozen
+# so that later changes to the model or to config.search cannot alter it.
+# config.search.ensure_search_indexes keeps them current after later migrations.
+POSTGRESQL_CREATE = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS "taskComment_taskcomment_content_trgm" ON "taskComment_taskcomment" USING gin ((UPPER("content"::text)) gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS "taskComment_taskcomment_author_email_trgm" ON "taskComment_taskcomment" USING gin ((UPPER("author_email"::text)) gin_trgm_ops)',
+]
+POSTGRESQL_DROP = [
+    'DROP INDEX IF EXISTS "taskComment_taskcomment_content_trgm"',
+    'DROP INDEX IF EXISTS "taskComment_taskcomment_author_email_trgm"',
+]
+# FTS5 table with the trigram tokenizer (SQLite 3.34+), kept in sync by triggers
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS taskComment_taskcomment_search USING fts5(content, author_email, content='taskComment_taskcomment', content_rowid='id', tokenize='trigram')",
+    'CREATE TRIGGER IF NOT EXISTS taskComment_taskcomment_search_ai AFTER INSERT ON taskComment_taskcomment BEGIN INSERT INTO taskComment_taskcomment_search(rowid, content, author_email) VALUES (new.id, new.content, new.author_email); END',
+    "CREATE TRIGGER IF NOT EXISTS taskComment_taskcomment_search_ad AFTER DELETE ON taskComment_taskcomment BEGIN INSERT INTO taskComment_taskcomment_search(taskComment_taskcomment_search, rowid, content, author_email) VALUES ('delete', old.id, old.content, old.author_email); END",
+    "CREATE TRIGGER IF NOT EXISTS taskComment_taskcomment_search_au AFTER UPDATE OF content, author_email ON taskComment_taskcomment BEGIN INSERT INTO taskComment_taskcomment_search(taskComment_taskcomment_search, rowid, content, author_email) VALUES ('delete', old.id, old.content, old.author_email); INSERT INTO taskComment_taskcomment_search(rowid, content, author_email) VALUES (new.id, new.content, new.author_email); END",
+    "INSERT INTO taskComment_taskcomment_search(taskComment_taskcomment_search) VALUES ('rebuild')",
+]
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS taskComment_taskcomment_search_ai',
+    'DROP TRIGGER IF EXISTS taskComment_taskcomment_search_ad',
+    'DROP TRIGGER IF EXISTS taskComment_taskcomment_search_au',
+    'DROP TABLE IF EXISTS taskComment_taskcomment_search',
+]
+
+
+def run(schema_editor, statements):
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite" and connection.Database.sqlite_version_info < (3, 34, 0):
+        return
+    with connection.cursor() as cursor:
+        for sql in statements.get(connection.vendor, ()):
+            cursor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    run(schema_editor, {"postgresql": POSTGRESQL_CREATE, "sqlite": SQLITE_CREATE})
+
+
+def drop_search_index(apps, schema_editor):
+    run(schema_editor, {"postgresql": POSTGRESQL_DROP, "sqlite": SQLITE_DROP})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("taskComment", "0002_access_path_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
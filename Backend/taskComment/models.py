@@ -12,6 +12,12 @@ class TaskComment(models.Model):
         ordering = ['-timestamp']
         verbose_name = 'Task Comment'
         verbose_name_plural = 'Task Comments'
+        indexes = [
+            # Keyset pages of a task's comments: filter task, order (-timestamp, id)
+            models.Index(fields=['task', '-timestamp', 'id'], name='comment_task_timestamp_idx'),
+            # Keyset pages over all comments
+            models.Index(fields=['-timestamp', 'id'], name='comment_timestamp_idx'),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author_email} on {self.task.title}"
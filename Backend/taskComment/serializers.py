@@ -1,11 +1,16 @@
 from typing import Dict, Any, Optional
 from django.core.exceptions import ValidationError
+from config.serialization import isoformat_fields
 from .models import TaskComment
 
 
 class TaskCommentSerializer:
     """Serializer for TaskComment model."""
 
+    # Columns returned by list endpoints, in to_dict order
+    LIST_FIELDS = ('id', 'task_id', 'content', 'author_email', 'timestamp')
+    DATE_FIELDS = ('timestamp',)
+
     @staticmethod
     def validate_create_data(data: Dict[str, Any]) -> Dict[str, Any]:
         errors = {}
@@ -83,7 +88,7 @@ class TaskCommentSerializer:
         """
         return {
             'id': comment.id,
-            'task_id': comment.task.id,
+            'task_id': comment.task_id,
             'content': comment.content,
             'author_email': comment.author_email,
             'timestamp': comment.timestamp.isoformat() if comment.timestamp else None
@@ -92,3 +97,10 @@ class TaskCommentSerializer:
     @staticmethod
     def to_list_dict(comments: list[TaskComment]) -> list[Dict[str, Any]]:
         return [TaskCommentSerializer.to_dict(comment) for comment in comments]
+
+    @staticmethod
+    def values_to_list_dict(rows: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
+        """
+        Format rows fetched with .values(*LIST_FIELDS) without building model instances.
+        """
+        return isoformat_fields(rows, TaskCommentSerializer.DATE_FIELDS)
@@ -1,8 +1,15 @@
-from typing import Optional
+from typing import Any, Callable, Dict, Iterable, Optional, Iterator
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.db.models import QuerySet
 from .models import TaskComment
 from task.models import Task
+from config.db.routing import replica_reads
+from config.pagination import Page, paginate
+from config.bulk import BulkResult
+from config.read_cache import invalidate_organizations
+from config.search import COMMENT_SEARCH
 
 
 class TaskCommentService:
@@ -34,6 +41,100 @@ class TaskCommentService:
         except ValidationError:
             raise
 
+    @staticmethod
+    def bulk_create_comments(items: list[Dict[str, Any]], allow_partial: bool = False) -> BulkResult:
+        """
+        Validate and create many comments, across any number of tasks.
+
+        Referenced tasks are resolved with one query and comments are inserted
+        with bulk_create in BULK_BATCH_SIZE batches. Invalid items are reported
+        by index. Unless allow_partial is set, nothing is written when any item
+        is invalid.
+
+        Args:
+            items: Dictionaries with task_id, content and author_email
+            allow_partial: Create the valid items even if others are rejected
+
+        Returns:
+            BulkResult with the created comments and per-item errors
+        """
+        result, organizations = TaskCommentService.build_comments(items)
+        if not result.items or (result.errors and not allow_partial):
+            return BulkResult(errors=result.errors)
+
+        result.items = TaskCommentService.write_comments(result.items, organizations)
+        return result
+
+    @staticmethod
+    def build_comments(items: list[Dict[str, Any]]) -> tuple[BulkResult, Dict[int, int]]:
+        """
+        Validate comment items without writing them.
+
+        Returns:
+            (BulkResult with the unsaved valid comments and per-item errors,
+            {task id: organization id} of the referenced tasks)
+        """
+        result = BulkResult()
+        organizations = TaskCommentService._task_organizations(item.get('task_id') for item in items)
+
+        for index, data in enumerate(items):
+            comment = TaskComment(
+                task_id=data.get('task_id'),
+                content=data.get('content', ''),
+                author_email=data.get('author_email', ''),
+            )
+            errors = {}
+            try:
+                comment.full_clean(exclude=['task'], validate_unique=False)
+            except ValidationError as e:
+                errors = e.message_dict
+            if comment.task_id not in organizations:
+                errors['task_id'] = [f"Task with ID {comment.task_id} does not exist."]
+            if errors:
+                result.add_error(index, errors)
+            else:
+                result.items.append(comment)
+        return result, organizations
+
+    @staticmethod
+    def write_comments(
+        comments: list[TaskComment],
+        organizations: Optional[Dict[int, int]] = None
+    ) -> list[TaskComment]:
+        """
+        Insert validated comments with bulk_create in BULK_BATCH_SIZE batches.
+
+        Args:
+            comments: Unsaved comments, e.g. from build_comments
+            organizations: {task id: organization id} from build_comments; when
+                omitted tasks are looked up again and comments whose task has
+                since been deleted are dropped
+
+        Returns:
+            The created comments
+        """
+        if organizations is None:
+            organizations = TaskCommentService._task_organizations(comment.task_id for comment in comments)
+            comments = [comment for comment in comments if comment.task_id in organizations]
+        if not comments:
+            return []
+
+        with transaction.atomic():
+            created = TaskComment.objects.bulk_create(comments, batch_size=settings.BULK_BATCH_SIZE)
+            # bulk_create sends no signals
+            invalidate_organizations(*{organizations[comment.task_id] for comment in comments})
+        return created
+
+    @staticmethod
+    def _task_organizations(task_ids: Iterable[Any]) -> Dict[int, int]:
+        """{task id: organization id} for the existing tasks among task_ids, in one query."""
+        task_ids = {task_id for task_id in task_ids if isinstance(task_id, int)}
+        if not task_ids:
+            return {}
+        return dict(
+            Task.objects.filter(id__in=task_ids).values_list('id', 'project__organization_id')
+        )
+
     @staticmethod
     def get_comment_by_id(comment_id: int) -> Optional[TaskComment]:
         """
@@ -45,6 +146,7 @@ class TaskCommentService:
             return None
 
     @staticmethod
+    @replica_reads()
     def get_all_comments() -> list[TaskComment]:
         """
         Retrieve all comments.
@@ -52,12 +154,89 @@ class TaskCommentService:
         return list(TaskComment.objects.all())
 
     @staticmethod
+    @replica_reads()
     def get_comments_by_task(task_id: int) -> list[TaskComment]:
         """
         Retrieve all comments for a specific task.
         """
         return list(TaskComment.objects.filter(task_id=task_id))
 
+    @staticmethod
+    @replica_reads()
+    def get_comments_page(
+        task_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        fields: Optional[tuple] = None
+    ) -> Page:
+        """
+        Retrieve one page of comments, optionally for a specific task.
+        When fields is given, rows are fetched as dictionaries of those columns.
+        """
+        queryset = TaskComment.objects.all()
+        if task_id:
+            queryset = queryset.filter(task_id=task_id)
+        if fields:
+            queryset = queryset.values(*fields)
+        return paginate(queryset, limit=limit, after=after, ordering_field='timestamp')
+
+    @staticmethod
+    @replica_reads()
+    def search_comments(
+        query: str,
+        organization_id: Optional[int] = None,
+        project_id: Optional[int] = None,
+        task_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        optimize: Optional[Callable[[QuerySet], QuerySet]] = None
+    ) -> Page:
+        """
+        Search comment content and author emails, best match first.
+
+        The search index is kept current by the database on every insert,
+        update and delete, including bulk ingestion. Results can be scoped to
+        one tenant through task -> project -> organization.
+
+        Args:
+            query: Search term, matched as a case-insensitive substring
+            organization_id: Only comments on tasks of this organization's projects
+            project_id: Only comments on tasks of this project
+            task_id: Only comments on this task
+            limit: Page size (see config.search.search_limit)
+            after: Cursor returned as next_cursor by the previous page
+            optimize: Optional callable applied to the queryset (e.g. a GraphQL projection)
+
+        Returns:
+            Page of TaskComment instances
+        """
+        queryset = TaskComment.objects.all()
+        if organization_id:
+            queryset = queryset.filter(task__project__organization_id=organization_id)
+        if project_id:
+            queryset = queryset.filter(task__project_id=project_id)
+        if task_id:
+            queryset = queryset.filter(task_id=task_id)
+        if optimize:
+            queryset = optimize(queryset)
+        return COMMENT_SEARCH.search_page(queryset, query, limit=limit, after=after)
+
+    @staticmethod
+    @replica_reads()
+    def iter_comments(
+        task_id: Optional[int] = None,
+        fields: tuple = (),
+        chunk_size: int = 2000
+    ) -> Iterator[dict]:
+        """
+        Stream comment rows as dictionaries using a server-side cursor.
+        """
+        queryset = TaskComment.objects.order_by('-timestamp', 'id')
+        if task_id:
+            queryset = queryset.filter(task_id=task_id)
+        # Bind the database now: the iterator is consumed after this call returns
+        return queryset.using(queryset.db).values(*fields).iterator(chunk_size=chunk_size)
+
     @staticmethod
     def update_comment(comment_id: int, **kwargs) -> Optional[TaskComment]:
         """
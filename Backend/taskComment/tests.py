@@ -1,3 +1,273 @@
-from django.test import TestCase
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+
+from organization.models import Organization
+from project.models import Project
+from task.models import Task
+from .ingest import CommentIngestQueue, IngestUnavailableError, comment_queue
+from .models import TaskComment
+from .service import TaskCommentService
+
+
+class TaskCommentListQueryCountTests(TestCase):
+    """List serialization must not lazy-load the task of each comment."""
+
+    def setUp(self):
+        organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        project = Project.objects.create(organization=organization, name='Launch', status='active')
+        self.task = Task.objects.create(project=project, title='Kickoff', status='todo')
+        for i in range(5):
+            TaskComment.objects.create(task=self.task, content=f'Comment {i}', author_email='dev@acme.com')
+
+    def test_list_query_count_is_constant(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/task-comments/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 5)
+
+    def test_task_list_query_count_is_constant(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/task-comments/task/{self.task.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'][0]['task_id'], self.task.id)
+
+
+@override_settings(DEFAULT_PAGE_SIZE=2, EXPORT_CHUNK_SIZE=2)
+class TaskCommentExportTests(TestCase):
+    """Comment lists stream every row as NDJSON."""
+
+    def test_ndjson_export(self):
+        organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        project = Project.objects.create(organization=organization, name='Launch', status='active')
+        task = Task.objects.create(project=project, title='Kickoff', status='todo')
+        for i in range(5):
+            TaskComment.objects.create(task=task, content=f'Comment {i}', author_email='dev@acme.com')
+
+        response = self.client.get('/api/task-comments/', {'format': 'ndjson'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(sorted(row['content'] for row in rows), [f'Comment {i}' for i in range(5)])
+
+    def test_invalid_task_id_is_rejected(self):
+        for params in ({'task_id': 'abc'}, {'task_id': 'abc', 'format': 'ndjson'}):
+            with self.subTest(params=params):
+                response = self.client.get('/api/task-comments/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('task_id', response.json()['errors'])
+
+
+class TaskCommentPrefetchTests(TestCase):
+    """Nested GraphQL comments are prefetched once for all tasks of a list."""
+
+    QUERY = '''query($id: Int!) {
+        tasksByProject(projectId: $id) { id recent: comments(latest: 2) { content } comments { id } }
+    }'''
+
+    def setUp(self):
+        organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        self.project = Project.objects.create(organization=organization, name='Launch', status='active')
+        for i in range(4):
+            task = Task.objects.create(project=self.project, title=f'Task {i}', status='todo')
+            for j in range(3):
+                TaskComment.objects.create(task=task, content=f'Comment {j}', author_email='dev@acme.com')
+
+    def test_latest_comments_are_prefetched_per_task(self):
+        # tasks, latest-2 window, all comments
+        with self.assertNumQueries(3):
+            response = self.client.post(
+                '/graphql/', {'query': self.QUERY, 'variables': {'id': self.project.id}},
+                content_type='application/json',
+            )
+        tasks = response.json()['data']['tasksByProject']
+        self.assertEqual(len(tasks), 4)
+        for task in tasks:
+            self.assertEqual([c['content'] for c in task['recent']], ['Comment 2', 'Comment 1'])
+            self.assertEqual(len(task['comments']), 3)
+
+
+class TaskCommentBulkTests(TestCase):
+    """Bulk ingestion checks tasks with one query and inserts in batches."""
+
+    def setUp(self):
+        organization = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        project = Project.objects.create(organization=organization, name='Launch', status='active')
+        self.tasks = [
+            Task.objects.create(project=project, title=f'Task {i}', status='todo') for i in range(3)
+        ]
+
+    def items(self, count):
+        return [
+            {'task_id': self.tasks[i % 3].id, 'content': f'Line {i}', 'author_email': 'voice@acme.com'}
+            for i in range(count)
+        ]
+
+    def post(self, body):
+        return self.client.post('/api/task-comments/bulk/', json.dumps(body), content_type='application/json')
+
+    def test_create_many_comments_across_tasks(self):
+        with self.assertNumQueries(4):
+            response = self.post({'items': self.items(30)})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()['data']), 30)
+        self.assertEqual(TaskComment.objects.filter(task=self.tasks[2]).count(), 10)
+
+    def test_invalid_item_rejects_batch_unless_partial(self):
+        items = self.items(3) + [{'task_id': 999999, 'content': 'Lost', 'author_email': 'voice@acme.com'}]
+        response = self.post({'items': items})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'][0]['index'], 3)
+        self.assertEqual(TaskComment.objects.count(), 0)
+
+        response = self.post({'items': items, 'allow_partial': True})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(TaskComment.objects.count(), 3)
+
+    def test_bulk_create_invalidates_cached_reads(self):
+        url = f'/api/task-comments/task/{self.tasks[0].id}/'
+        etag = self.client.get(url)['ETag']
+        TaskCommentService.bulk_create_comments(self.items(3))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 1)
+
+    def test_queue_flushes_on_size(self):
+        queue = CommentIngestQueue(flush_size=5, max_pending=5, start_worker=False)
+        comments, _ = TaskCommentService.build_comments(self.items(4))
+        queue.put(comments.items)
+        self.assertEqual(TaskComment.objects.count(), 0)
+        self.assertEqual(queue.stats()['pending'], 4)
+
+        comments, _ = TaskCommentService.build_comments(self.items(2))
+        queue.put(comments.items)
+        self.assertEqual(TaskComment.objects.count(), 6)
+        self.assertEqual(queue.stats()['written'], 6)
+
+    def test_queue_drops_comments_of_deleted_tasks(self):
+        queue = CommentIngestQueue(start_worker=False)
+        comments, _ = TaskCommentService.build_comments(self.items(3))
+        queue.put(comments.items)
+        self.tasks[0].delete()
+        self.assertEqual(queue.flush(), 2)
+        self.assertEqual(queue.stats()['dropped'], 1)
+
+    def test_failed_batch_is_retried_then_dead_lettered(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / 'data' / 'dead.jsonl'
+        queue = CommentIngestQueue(start_worker=False, max_retries=1, retry_backoff=60, dead_letter_path=str(path))
+        comments, _ = TaskCommentService.build_comments(self.items(3))
+        queue.put(comments.items)
+
+        with mock.patch.object(TaskCommentService, 'write_comments', side_effect=DatabaseError('down')):
+            with self.assertLogs('taskcomment.ingest', 'ERROR'):
+                self.assertEqual(queue.flush(), 0)
+            self.assertTrue(queue.failing)
+            self.assertEqual(queue.stats()['pending'], 3)
+            with self.assertRaises(IngestUnavailableError):
+                queue.put(comments.items)
+            with self.assertLogs('taskcomment.ingest', 'ERROR'):
+                queue.flush()
+
+        self.assertFalse(queue.failing)
+        self.assertEqual(queue.stats()['dead_lettered'], 3)
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        self.assertEqual([line['content'] for line in lines], ['Line 0', 'Line 1', 'Line 2'])
+
+    def test_retry_succeeds_and_reopens_the_queue(self):
+        queue = CommentIngestQueue(start_worker=False, retry_backoff=60)
+        comments, _ = TaskCommentService.build_comments(self.items(2))
+        queue.put(comments.items)
+        with mock.patch.object(TaskCommentService, 'write_comments', side_effect=DatabaseError('down')):
+            with self.assertLogs('taskcomment.ingest', 'ERROR'):
+                queue.flush()
+
+        with mock.patch.object(comment_queue, 'put', queue.put):
+            response = self.post({'items': self.items(1), 'async': True})
+        self.assertEqual(response.status_code, 503)
+        self.assertTrue(response.has_header('Retry-After'))
+
+        self.assertEqual(queue.flush(), 2)
+        self.assertFalse(queue.failing)
+        self.assertEqual(TaskComment.objects.count(), 2)
+
+
+class TaskCommentSearchTests(TestCase):
+    """Comment search is indexed on every write, ranked, paginated and tenant scoped."""
+
+    def setUp(self):
+        acme = Organization.objects.create(name='Acme', slug='acme', contact_email='ops@acme.com')
+        other = Organization.objects.create(name='Other', slug='other', contact_email='ops@other.com')
+        self.acme = acme
+        self.task = Task.objects.create(
+            project=Project.objects.create(organization=acme, name='Launch', status='active'),
+            title='Kickoff', status='todo'
+        )
+        other_task = Task.objects.create(
+            project=Project.objects.create(organization=other, name='Other', status='active'),
+            title='Other', status='todo'
+        )
+        for i in range(5):
+            TaskCommentService.create_comment(self.task.id, f'Call transcript {i}: refund requested', 'agent@acme.com')
+        TaskCommentService.create_comment(other_task.id, 'Refund transcript', 'agent@other.com')
+
+    def test_scoped_pages(self):
+        hits = []
+        after = None
+        while True:
+            page = TaskCommentService.search_comments('REFUND', organization_id=self.acme.id, limit=2, after=after)
+            hits.extend(comment.id for comment in page.items)
+            if not page.has_next:
+                break
+            after = page.next_cursor
+        self.assertEqual(len(hits), 5)
+        self.assertEqual(len(set(hits)), 5)
+
+    def test_index_follows_service_writes(self):
+        comment = TaskCommentService.create_comment(self.task.id, 'Escalated to billing', 'lead@acme.com')
+        self.assertEqual(TaskCommentService.search_comments('billing').items, [comment])
+
+        TaskCommentService.update_comment(comment.id, content='Escalated to legal')
+        self.assertEqual(TaskCommentService.search_comments('billing').items, [])
+        self.assertEqual(TaskCommentService.search_comments('legal').items, [comment])
+
+        TaskCommentService.delete_comment(comment.id)
+        self.assertEqual(TaskCommentService.search_comments('legal').items, [])
+
+        TaskCommentService.bulk_create_comments(
+            [{'task_id': self.task.id, 'content': 'Voice note: chargeback', 'author_email': 'voice@acme.com'}]
+        )
+        self.assertEqual(len(TaskCommentService.search_comments('chargeback').items), 1)
+
+    def test_rest_and_graphql(self):
+        response = self.client.get('/api/task-comments/search/', {'q': 'refund', 'task_id': self.task.id, 'limit': 3})
+        body = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body['count'], 3)
+        self.assertTrue(body['has_next'])
+
+        response = self.client.get('/api/task-comments/search/', {'q': 'refund', 'after': 'bogus'})
+        self.assertEqual(response.status_code, 400)
+
+        query = '''query($after: String) {
+            searchComments(query: "refund", organizationId: %d, first: 4, after: $after) {
+                edges { cursor node { content task { title } } }
+                pageInfo { hasNextPage endCursor }
+            }
+        }''' % self.acme.id
+        response = self.client.post('/graphql/', {'query': query}, content_type='application/json')
+        result = response.json()['data']['searchComments']
+        self.assertEqual(len(result['edges']), 4)
+        self.assertEqual(result['edges'][0]['node']['task']['title'], 'Kickoff')
+
+        response = self.client.post(
+            '/graphql/',
+            {'query': query, 'variables': {'after': result['pageInfo']['endCursor']}},
+            content_type='application/json'
+        )
+        result = response.json()['data']['searchComments']
+        self.assertEqual(len(result['edges']), 1)
+        self.assertFalse(result['pageInfo']['hasNextPage'])
@@ -2,7 +2,9 @@ from django.urls import path
 from .views import (
     TaskCommentListView,
     TaskCommentDetailView,
-    TaskCommentsListView
+    TaskCommentsListView,
+    TaskCommentBulkView,
+    TaskCommentSearchView
 )
 
 app_name = 'taskcomment'
@@ -11,6 +13,12 @@ urlpatterns = [
     # List all comments or create a new one
     path('', TaskCommentListView.as_view(), name='list-create'),
     
+    # Ranked, paginated search by content or author email
+    path('search/', TaskCommentSearchView.as_view(), name='search'),
+    
+    # Create many comments per request, optionally queued
+    path('bulk/', TaskCommentBulkView.as_view(), name='bulk'),
+    
     # Get, update, or delete a specific comment by ID
     path('<int:comment_id>/', TaskCommentDetailView.as_view(), name='detail'),
     
@@ -1,37 +1,72 @@
 import json
-from django.http import JsonResponse
+from django.conf import settings
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.core.exceptions import ValidationError
+from .ingest import IngestUnavailableError, comment_queue
 from .service import TaskCommentService
 from .serializers import TaskCommentSerializer
+from config.bulk import BulkResult, check_bulk_size, error_dict, merge_errors, read_bulk_body, validate_items
+from config.pagination import get_int_param, get_page_params
+from config.responses import JsonResponse
+from config.search import get_search_params
+from config.streaming import get_stream_format, stream_rows
+from config.etags import all_etag, comment_etag, conditional, task_etag
 
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(conditional(all_etag), name='get')
 class TaskCommentListView(View):
     """View for listing all comments and creating new comments."""
 
     def get(self, request):
         """
         List all comments.
+        
+        Query parameters:
+            - task_id: Optional filter
+            - limit, after: Keyset pagination (see config.pagination)
+            - format: ndjson or json-stream to stream every row instead of one page
         """
         try:
-            task_id = request.GET.get('task_id', '').strip()
+            task_id = get_int_param(request, 'task_id')
+            export_format = get_stream_format(request)
             
-            if task_id:
-                comments = TaskCommentService.get_comments_by_task(int(task_id))
-            else:
-                comments = TaskCommentService.get_all_comments()
+            if export_format:
+                rows = TaskCommentService.iter_comments(
+                    task_id=task_id,
+                    fields=TaskCommentSerializer.LIST_FIELDS,
+                    chunk_size=settings.EXPORT_CHUNK_SIZE
+                )
+                return stream_rows(rows, export_format, TaskCommentSerializer.values_to_list_dict)
+            
+            limit, after = get_page_params(request)
             
-            data = TaskCommentSerializer.to_list_dict(comments)
+            page = TaskCommentService.get_comments_page(
+                task_id=task_id,
+                limit=limit,
+                after=after,
+                fields=TaskCommentSerializer.LIST_FIELDS
+            )
+            
+            data = TaskCommentSerializer.values_to_list_dict(page.items)
             
             return JsonResponse({
                 'success': True,
                 'data': data,
-                'count': len(data)
+                'count': len(data),
+                'next_cursor': page.next_cursor,
+                'has_next': page.has_next
             }, status=200)
         
+        except ValidationError as e:
+            return JsonResponse({
+                'success': False,
+                'error': 'Validation failed.',
+                'errors': e.message_dict if hasattr(e, 'message_dict') else {'detail': str(e)}
+            }, status=400)
+        
         except Exception as e:
             return JsonResponse({
                 'success': False,
@@ -74,6 +109,7 @@ class TaskCommentListView(View):
 
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(conditional(comment_etag), name='get')
 class TaskCommentDetailView(View):
     """View for retrieving, updating, and deleting a specific comment."""
 
@@ -182,6 +218,7 @@ class TaskCommentDetailView(View):
 
 
 @method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(conditional(task_etag), name='get')
 class TaskCommentsListView(View):
     """View for listing all comments for a specific task."""
 
@@ -190,16 +227,167 @@ class TaskCommentsListView(View):
         List all comments for a specific task.
         """
         try:
-            comments = TaskCommentService.get_comments_by_task(task_id)
+            limit, after = get_page_params(request)
+            page = TaskCommentService.get_comments_page(
+                task_id=task_id, limit=limit, after=after, fields=TaskCommentSerializer.LIST_FIELDS
+            )
+            
+            data = TaskCommentSerializer.values_to_list_dict(page.items)
+            
+            return JsonResponse({
+                'success': True,
+                'data': data,
+                'count': len(data),
+                'next_cursor': page.next_cursor,
+                'has_next': page.has_next
+            }, status=200)
+        
+        except ValidationError as e:
+            return JsonResponse({
+                'success': False,
+                'error': 'Validation failed.',
+                'errors': e.message_dict if hasattr(e, 'message_dict') else {'detail': str(e)}
+            }, status=400)
+        
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=500)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+@method_decorator(conditional(all_etag), name='get')
+class TaskCommentSearchView(View):
+    """View for ranked, paginated comment search."""
+
+    def get(self, request):
+        """
+        Search comments by content or author email, best match first.
+        
+        Query parameters:
+            - q: Search term (required)
+            - organization_id, project_id, task_id: Optional scopes
+            - limit: Page size (defaults to SEARCH_DEFAULT_LIMIT)
+            - after: Cursor returned as next_cursor by the previous page
+        """
+        try:
+            query, limit = get_search_params(request)
+            scopes = {}
+            for name in ('organization_id', 'project_id', 'task_id'):
+                value = get_int_param(request, name)
+                if value is not None:
+                    scopes[name] = value
+            
+            page = TaskCommentService.search_comments(
+                query,
+                limit=limit,
+                after=request.GET.get('after', '').strip() or None,
+                **scopes
+            )
             
-            data = TaskCommentSerializer.to_list_dict(comments)
+            data = TaskCommentSerializer.to_list_dict(page.items)
             
             return JsonResponse({
                 'success': True,
                 'data': data,
-                'count': len(data)
+                'count': len(data),
+                'next_cursor': page.next_cursor,
+                'has_next': page.has_next
             }, status=200)
         
+        except ValidationError as e:
+            return JsonResponse({
+                'success': False,
+                'error': 'Validation failed.',
+                'errors': e.message_dict if hasattr(e, 'message_dict') else {'detail': str(e)}
+            }, status=400)
+        
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=500)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class TaskCommentBulkView(View):
+    """
+    View for ingesting many comments per request.
+
+    POST takes {"items": [...], "allow_partial": false, "async": false}.
+    Errors are reported per item as {"index", "errors"}. With "async" the
+    comments are validated, queued for the background writer and answered
+    with 202 before they are written.
+    """
+
+    def post(self, request):
+        """Create comments in bulk."""
+        try:
+            try:
+                body_data = read_bulk_body(request)
+            except json.JSONDecodeError:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Invalid JSON in request body.'
+                }, status=400)
+
+            if not isinstance(body_data, dict):
+                body_data = {}
+            items = check_bulk_size(body_data.get('items'))
+            allow_partial = bool(body_data.get('allow_partial', False))
+            queue = bool(body_data.get('async', False))
+
+            valid_items, positions, errors = validate_items(items, TaskCommentSerializer.validate_create_data)
+
+            result = BulkResult()
+            if valid_items and (allow_partial or not errors):
+                if queue:
+                    result, _ = TaskCommentService.build_comments(valid_items)
+                    if result.errors and not allow_partial:
+                        result.items = []
+                else:
+                    result = TaskCommentService.bulk_create_comments(valid_items, allow_partial=allow_partial)
+            errors = merge_errors(errors, result, positions)
+
+            if not result.items:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Validation failed.',
+                    'errors': errors
+                }, status=400)
+
+            if queue:
+                try:
+                    queued = comment_queue.put(result.items)
+                except IngestUnavailableError as e:
+                    response = JsonResponse({
+                        'success': False,
+                        'error': f'{e} Send the comments without "async" to write them directly.'
+                    }, status=503)
+                    response['Retry-After'] = str(comment_queue.retry_after())
+                    return response
+                return JsonResponse({
+                    'success': not errors,
+                    'data': {'queued': queued},
+                    'errors': errors,
+                    'message': f'{queued} comment(s) queued.'
+                }, status=202)
+
+            return JsonResponse({
+                'success': not errors,
+                'data': TaskCommentSerializer.to_list_dict(result.items),
+                'errors': errors,
+                'message': f'{len(result.items)} comment(s) created.'
+            }, status=201)
+
+        except ValidationError as e:
+            return JsonResponse({
+                'success': False,
+                'error': 'Validation failed.',
+                'errors': error_dict(e)
+            }, status=400)
+
         except Exception as e:
             return JsonResponse({
                 'success': False,